@@ -0,0 +1,83 @@
+"""
+Inserting many rows: edgy's single INSERT against BaseRepository.bulk_create
+batched with executemany and, on postgres, through COPY.
+
+    BENCH_DATABASE_URL=postgresql+asyncpg://... python -m bench.bulk_create [rows]
+
+Without BENCH_DATABASE_URL it runs on a throwaway sqlite database, where
+there is no COPY. The benchmark table is dropped afterwards.
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+import edgy
+from edgy import Database, Registry
+
+from fermerce.core.services.base import BaseRepository
+from fermerce.lib.utils.base_response import BulkReturnEnum
+
+database = Database(
+    os.environ.get("BENCH_DATABASE_URL")
+    or f"sqlite+aiosqlite:///{tempfile.gettempdir()}/bench_bulk_create.db"
+)
+registry = Registry(database=database)
+
+
+class BenchRow(edgy.Model):
+    id = edgy.UUIDField(primary_key=True, default=uuid.uuid4)
+    name = edgy.CharField(max_length=50)
+    quantity = edgy.IntegerField()
+    price = edgy.DecimalField(max_digits=10, decimal_places=2)
+
+    class Meta:
+        registry = registry
+        tablename = "bench_bulk_create"
+
+
+async def measure(label: str, insert) -> None:
+    await database.execute(BenchRow.table.delete())
+    started = time.perf_counter()
+    try:
+        await insert()
+    except Exception as error:
+        print(f"{label:<28} failed: {str(error).splitlines()[0][:70]}")
+        return
+    print(f"{label:<28} {time.perf_counter() - started:8.2f} s")
+
+
+async def main(count: int) -> None:
+    await registry.create_all()
+    try:
+        async with database:
+            rows = [
+                dict(name=f"row {index}", quantity=index % 100, price=f"{index % 97}.50")
+                for index in range(count)
+            ]
+            repository = BaseRepository[BenchRow](model=BenchRow, model_name="BenchRow")
+            print(f"{count} rows on {database.url.dialect}")
+            await measure("edgy bulk_create", lambda: BenchRow.query.bulk_create(rows))
+            for returning in BulkReturnEnum:
+                await measure(
+                    f"batched, returning {returning.value}",
+                    lambda: repository.bulk_create(
+                        rows, returning=returning, use_copy=False
+                    ),
+                )
+            if database.url.dialect == "postgresql":
+                for returning in BulkReturnEnum:
+                    await measure(
+                        f"copy, returning {returning.value}",
+                        lambda: repository.bulk_create(
+                            rows, returning=returning, use_copy=True
+                        ),
+                    )
+    finally:
+        await registry.drop_all()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000))
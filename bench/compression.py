@@ -0,0 +1,87 @@
+"""
+Size saved and time spent by the response compressors at every level, on a
+list response and on a streamed csv export compressed chunk by chunk.
+
+    python -m bench.compression
+
+Without the brotli package only gzip is measured.
+"""
+import time
+import uuid
+
+import orjson
+
+from fermerce.lib.middleware.compression import (
+    BrotliCompressor,
+    GzipCompressor,
+    brotli,
+)
+
+ROUNDS = 5
+CHUNK_SIZE = 64 * 1024
+
+
+def get_list_body(count: int) -> bytes:
+    return orjson.dumps(
+        {
+            "status": 200,
+            "total_count": count,
+            "data": [
+                {
+                    "id": str(uuid.uuid4()),
+                    "name": f"product {index}",
+                    "description": f"fresh produce from farm {index % 7}",
+                    "price": f"{index % 97}.50",
+                    "in_stock": index % 3 != 0,
+                    "vendor": {"id": str(uuid.uuid4()), "business_name": "farm"},
+                }
+                for index in range(count)
+            ],
+        }
+    )
+
+
+def get_csv_chunks(count: int) -> list[bytes]:
+    body = b"".join(
+        b"%d,product %d,%d.50,farm %d\n" % (index, index, index % 97, index % 7)
+        for index in range(count)
+    )
+    return [body[start:start + CHUNK_SIZE] for start in range(0, len(body), CHUNK_SIZE)]
+
+
+def get_compressors() -> list[tuple[str, type, int]]:
+    compressors = [("gzip", GzipCompressor, level) for level in (1, 4, 6, 9)]
+    if brotli is not None:
+        compressors += [("br", BrotliCompressor, quality) for quality in (1, 4, 6, 11)]
+    return compressors
+
+
+def measure(chunks: list[bytes]) -> None:
+    size = sum(len(chunk) for chunk in chunks)
+    for name, compressor_class, level in get_compressors():
+        started = time.perf_counter()
+        for _ in range(ROUNDS):
+            compressor = compressor_class(level)
+            compressed = sum(len(compressor.compress(chunk)) for chunk in chunks[:-1])
+            compressed += len(compressor.finish(chunks[-1]))
+        elapsed = (time.perf_counter() - started) / ROUNDS
+        print(
+            f"  {f'{name}-{level}':<8} {1 - compressed / size:6.1%} saved "
+            f"{elapsed * 1000:8.2f} ms"
+        )
+
+
+def main() -> None:
+    body = get_list_body(50)
+    print(f"50 product rows, {len(body)} bytes of json")
+    measure([body])
+    chunks = get_csv_chunks(20_000)
+    print(
+        f"20000 row csv export, {sum(len(chunk) for chunk in chunks)} bytes "
+        f"in {len(chunks)} chunks"
+    )
+    measure(chunks)
+
+
+if __name__ == "__main__":
+    main()
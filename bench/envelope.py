@@ -0,0 +1,111 @@
+"""
+Per request cost of wrapping list responses in the envelope: the splicing
+ResponseEnvelopeMiddleware against buffering, json.loads, wrapping and
+json.dumps as response_data_transformer did.
+
+    python -m bench.envelope
+
+Both wrap a bare ASGI app returning a prebuilt body, the overhead is the
+time above that app alone.
+"""
+import asyncio
+import datetime
+import json
+import time
+import uuid
+
+import orjson
+
+from fermerce.lib.middleware.response_formatter import ResponseEnvelopeMiddleware
+
+SCOPE = {"type": "http", "method": "GET", "path": "/api/v1/products", "headers": []}
+
+
+def get_body(count: int) -> bytes:
+    return orjson.dumps(
+        {
+            "status": 200,
+            "total_count": count,
+            "data": [
+                {
+                    "id": str(uuid.uuid4()),
+                    "name": f"product {index}",
+                    "created_at": datetime.datetime.now().isoformat(),
+                    "price": "12.50",
+                    "tags": ["fresh", "organic"],
+                }
+                for index in range(count)
+            ],
+        }
+    )
+
+
+def make_app(body: bytes):
+    headers = [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body)).encode()),
+    ]
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    return app
+
+
+def legacy_envelope(app):
+    """Buffer the whole response, decode it and encode it again"""
+
+    async def middleware(scope, receive, send):
+        messages = []
+
+        async def collect(message):
+            messages.append(message)
+
+        await app(scope, receive, collect)
+        start, body = messages[0], b"".join(m.get("body", b"") for m in messages[1:])
+        data = dict(status=start["status"], data=json.loads(body.decode()), error=None)
+        content = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": start["status"],
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(content)).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": content})
+
+    return middleware
+
+
+async def measure(app, rounds: int) -> float:
+    async def receive():
+        return {"type": "http.request"}
+
+    async def send(message):
+        pass
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        await app(SCOPE, receive, send)
+    return (time.perf_counter() - started) / rounds
+
+
+async def main() -> None:
+    print(f"{'rows':>5} {'body':>8} {'legacy':>10} {'splice':>10}")
+    for count in (1, 10, 100, 1000):
+        body = get_body(count)
+        rounds = max(200, 20_000 // count)
+        bare = await measure(make_app(body), rounds)
+        legacy = await measure(legacy_envelope(make_app(body)), rounds) - bare
+        splice = await measure(ResponseEnvelopeMiddleware(make_app(body)), rounds) - bare
+        print(
+            f"{count:>5} {len(body):>7}B {legacy * 1e6:>8.0f}us {splice * 1e6:>8.0f}us"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
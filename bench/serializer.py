@@ -0,0 +1,109 @@
+"""
+Serializing list results: the compiled row serializers against pydantic's
+model_dump and the dict building BaseRepository.to_dict used to do.
+
+    python -m bench.serializer [rows]
+
+Runs on a throwaway sqlite database, the timings only cover serialization.
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+import edgy
+from edgy import Database, Registry
+
+from fermerce.core.model.descriptor import get_descriptor
+from fermerce.core.services.serializer import get_serializer
+
+ROUNDS = 20
+
+database = Database(f"sqlite+aiosqlite:///{tempfile.gettempdir()}/bench_serializer.db")
+registry = Registry(database=database)
+
+
+class Vendor(edgy.Model):
+    id = edgy.UUIDField(primary_key=True, default=uuid.uuid4)
+    business_name = edgy.CharField(max_length=50)
+    is_suspended = edgy.BooleanField(default=False)
+
+    class Meta:
+        registry = registry
+
+
+class Product(edgy.Model):
+    id = edgy.UUIDField(primary_key=True, default=uuid.uuid4)
+    name = edgy.CharField(max_length=50)
+    description = edgy.TextField()
+    price = edgy.DecimalField(max_digits=10, decimal_places=2)
+    in_stock = edgy.BooleanField(default=True)
+    created_at = edgy.DateTimeField(auto_now_add=True)
+    vendor = edgy.ForeignKey(Vendor, related_name="products")
+
+    class Meta:
+        registry = registry
+
+
+def legacy_to_dict(rows: list[Product]) -> list[dict]:
+    """What BaseRepository.to_dict did before the compiled serializers"""
+    descriptor = get_descriptor(Product)
+    columns = (*descriptor.related, *descriptor.related_backward)
+    return [
+        {
+            **{
+                name: dict(getattr(row, name))
+                for name in descriptor.related
+                if hasattr(row, name) and getattr(row, name)
+            },
+            **{
+                name: getattr(row, name)
+                for name in descriptor.fields
+                if name not in columns and not name.startswith("_")
+            },
+        }
+        for row in rows
+    ]
+
+
+def measure(label: str, function, rows: list[Product]) -> None:
+    function(rows)
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        function(rows)
+    elapsed = (time.perf_counter() - started) / ROUNDS
+    print(f"{label:<22} {elapsed * 1000:8.2f} ms")
+
+
+async def main(count: int) -> None:
+    await registry.drop_all()
+    await registry.create_all()
+    async with database:
+        vendors = [Vendor(business_name=f"farm {index}") for index in range(20)]
+        await Vendor.query.bulk_create([dict(vendor) for vendor in vendors])
+        vendors = await Vendor.query.all()
+        await Product.query.bulk_create(
+            [
+                dict(
+                    name=f"product {index}",
+                    description="fresh from the farm " * 5,
+                    price=f"{index % 97}.50",
+                    vendor=vendors[index % len(vendors)],
+                )
+                for index in range(count)
+            ]
+        )
+        rows = await Product.query.select_related("vendor").all()
+    serializer = get_serializer(Product, load_related=True)
+    print(f"{len(rows)} rows with their vendor")
+    measure("legacy to_dict", legacy_to_dict, rows)
+    measure("model_dump", lambda rows: [row.model_dump() for row in rows], rows)
+    measure("serializer", serializer.many, rows)
+    measure("serializer + orjson", serializer.dumps, rows)
+    os.remove(database.url.database)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000))
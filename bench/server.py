@@ -0,0 +1,127 @@
+"""
+Start a server command and measure it: seconds until it answers, memory of
+its process tree, requests per second over keep-alive connections and
+seconds it takes to stop on SIGTERM.
+
+    python -m bench.server --path /api/v1/products -- python bootstrap.py
+
+The load comes from this process, on the same machine: on a box with few
+cpus it competes with the workers, compare runs with each other only.
+"""
+import argparse
+import asyncio
+import os
+import signal
+import subprocess
+import time
+
+REQUEST = "GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n"
+
+
+def get_tree(root: int) -> set[int]:
+    """The process and all its descendants, from /proc"""
+    parents = {}
+    for name in os.listdir("/proc"):
+        if name.isdigit():
+            try:
+                with open(f"/proc/{name}/stat") as file:
+                    # the command name can hold spaces, the fields follow its ")"
+                    parents[int(name)] = int(file.read().rpartition(")")[2].split()[1])
+            except (OSError, ValueError):
+                continue
+    tree, added = {root}, True
+    while added:
+        children = {pid for pid, parent in parents.items() if parent in tree}
+        added = bool(children - tree)
+        tree |= children
+    return tree
+
+
+def get_pss(pids: set[int]) -> int:
+    """Proportional set size in kB, memory shared between workers counts once"""
+    total = 0
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/smaps_rollup") as file:
+                for line in file:
+                    if line.startswith("Pss:"):
+                        total += int(line.split()[1])
+        except OSError:
+            continue
+    return total
+
+
+async def wait_ready(host: str, port: int, path: str, timeout: float) -> float:
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+            writer.write(REQUEST.format(path=path, host=host).encode())
+            await reader.readuntil(b"\r\n\r\n")
+            writer.close()
+            return time.perf_counter() - started
+        except (OSError, asyncio.IncompleteReadError):
+            await asyncio.sleep(0.05)
+    raise TimeoutError(f"nothing answered on {host}:{port} within {timeout}s")
+
+
+async def load(host: str, port: int, path: str, connections: int, seconds: float) -> float:
+    request = REQUEST.format(path=path, host=host).encode()
+    deadline = time.perf_counter() + seconds
+    count = 0
+
+    async def connection() -> None:
+        nonlocal count
+        reader, writer = await asyncio.open_connection(host, port)
+        while time.perf_counter() < deadline:
+            writer.write(request)
+            head = await reader.readuntil(b"\r\n\r\n")
+            for line in head.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    await reader.readexactly(int(line.split(b":")[1]))
+            count += 1
+        writer.close()
+
+    await asyncio.gather(*(connection() for _ in range(connections)))
+    return count / seconds
+
+
+async def main(options: argparse.Namespace) -> None:
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        options.command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        await wait_ready(options.host, options.port, options.path, options.timeout)
+        ready = time.perf_counter() - started
+        # let the other workers finish starting before measuring their memory
+        await asyncio.sleep(options.settle)
+        pids = get_tree(process.pid)
+        pss = get_pss(pids)
+        rate = await load(
+            options.host, options.port, options.path, options.connections, options.seconds
+        )
+        stopping = time.perf_counter()
+        process.send_signal(signal.SIGTERM)
+        process.wait(options.timeout)
+        stop = time.perf_counter() - stopping
+    finally:
+        if process.poll() is None:
+            process.kill()
+    print(
+        f"ready {ready:.2f}s, {len(pids)} processes, pss {pss / 1024:.0f} MB, "
+        f"{rate:.0f} req/s, stop {stop:.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--path", default="/")
+    parser.add_argument("--connections", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=8)
+    parser.add_argument("--settle", type=float, default=1)
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("command", nargs="+")
+    asyncio.run(main(parser.parse_args()))
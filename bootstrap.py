@@ -1,9 +1,115 @@
-from fermerce.core.settings import config
+import asyncio
+import math
+import os
+import typing as t
+
 import uvicorn
+from uvicorn.importer import import_from_string
+
+from fermerce.core.settings import config
+
+try:
+    from gunicorn.app.base import BaseApplication
+    from uvicorn.workers import UvicornWorker
+except ImportError:  # uvicorn spawns the workers, each imports the app itself
+    BaseApplication = None
+
+APP = "main:app"
+# seconds the shutdown hooks of a worker get after its requests drained
+SHUTDOWN_HOOKS_TIMEOUT = 5
+
+
+def get_cpu_count() -> int:
+    """CPUs this process may run on, within the cpu quota of its container"""
+    try:
+        count = len(os.sched_getaffinity(0))
+    except AttributeError:  # not on linux
+        count = os.cpu_count() or 1
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as file:
+            quota, period = file.read().split()
+        if quota != "max":
+            count = min(count, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    return max(1, count)
+
+
+def get_worker_count() -> int:
+    # the app waits on io, one event loop per cpu keeps every cpu busy
+    return config.server_workers or get_cpu_count()
+
+
+if BaseApplication is not None:
+
+    class Worker(UvicornWorker):
+        CONFIG_KWARGS = {
+            "loop": config.server_loop,
+            "http": config.server_http,
+            "timeout_graceful_shutdown": config.server_graceful_timeout,
+        }
+
+        def init_process(self) -> None:
+            # edgy applies nest_asyncio on import, which creates a loop in the
+            # master that asyncio.run then reuses: every worker would share it
+            asyncio.set_event_loop(asyncio.new_event_loop())
+            super().init_process()
+
+    class Server(BaseApplication):
+        """
+        gunicorn running uvicorn workers. With `preload_app` the app is
+        imported once in the master and the workers fork with it, sharing
+        its memory until written to; startup hooks still run in every worker.
+        """
+
+        def __init__(self, options: dict[str, t.Any]) -> None:
+            self.options = options
+            super().__init__()
+
+        def load_config(self) -> None:
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self) -> t.Any:
+            return import_from_string(APP)
 
 
 def run_server():
-    uvicorn.run("main:app", reload=config.debug, workers=8, port=8001)
+    if config.debug:
+        uvicorn.run(
+            APP,
+            reload=True,
+            host=config.server_host,
+            port=config.server_port,
+            loop=config.server_loop,
+            http=config.server_http,
+        )
+        return
+    workers = get_worker_count()
+    if BaseApplication is None:
+        uvicorn.run(
+            APP,
+            host=config.server_host,
+            port=config.server_port,
+            workers=workers,
+            loop=config.server_loop,
+            http=config.server_http,
+            timeout_keep_alive=config.server_keep_alive,
+            backlog=config.server_backlog,
+            timeout_graceful_shutdown=config.server_graceful_timeout,
+        )
+        return
+    Server(
+        dict(
+            bind=f"{config.server_host}:{config.server_port}",
+            workers=workers,
+            worker_class=Worker,
+            preload_app=config.server_preload,
+            keepalive=config.server_keep_alive,
+            backlog=config.server_backlog,
+            graceful_timeout=config.server_graceful_timeout + SHUTDOWN_HOOKS_TIMEOUT,
+        )
+    ).run()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,25 @@
+from esmerald import APIView, Inject, Injects, get
+from fermerce.app.market.catalog import schemas, services
+from fermerce.lib.utils.base_response import IFilterList
+from fermerce.lib.utils.list_endpoint_query_params import QueryType, query_params
+
+
+class ProductCatalogAPIView(APIView):
+    tags = ["Product Catalog"]
+    path = "/catalog"
+    dependencies = {"service": Inject(services.ProductCatalogRepository)}
+
+    @get("/", dependencies={"params": Inject(query_params)})
+    async def get_product_catalog(
+        self,
+        params: QueryType = Injects(),
+        service: services.ProductCatalogRepository = Injects(),
+    ) -> IFilterList:
+        return await service.get_list(params)
+
+    @get("/refresh/stats")
+    async def get_product_catalog_refresh_stats(
+        self,
+        service: services.ProductCatalogRepository = Injects(),
+    ) -> schemas.IListingRefreshStats:
+        return await service.get_refresh_stats()
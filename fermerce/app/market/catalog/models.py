@@ -0,0 +1,28 @@
+from edgy import fields
+from fermerce.core.model.base_model import BaseModel
+
+
+class ProductListing(BaseModel):
+    """
+    Read model of the product catalog, one row per product, `id` being the
+    product id. Rows are rebuilt by `fm_productlisting_refresh` from the
+    product, its selling units, reviews, categories, cover and vendor,
+    `updated_at` being the last refresh.
+    """
+
+    name = fields.CharField(max_length=50)
+    slug = fields.CharField(max_length=150)
+    sku = fields.CharField(max_length=25)
+    in_stock = fields.BooleanField(default=False)
+    is_suspended = fields.BooleanField(default=False)
+    vendor = fields.UUIDField(null=True)
+    vendor_name = fields.CharField(max_length=30, null=True)
+    cover_url = fields.CharField(max_length=300, null=True)
+    min_price = fields.DecimalField(max_digits=12, decimal_places=2, null=True)
+    max_price = fields.DecimalField(max_digits=12, decimal_places=2, null=True)
+    category_ids = fields.JSONField(default=list)
+    rating_average = fields.FloatField(null=True)
+    rating_count = fields.IntegerField(default=0)
+
+    class Meta:
+        tablename = "fm_productlisting"
@@ -0,0 +1,114 @@
+import asyncio
+import datetime
+import logging
+import time
+import typing as t
+from dataclasses import dataclass
+
+import sqlalchemy
+from edgy import Database
+
+logger = logging.getLogger(__name__)
+
+REFRESH_QUERY = sqlalchemy.text(
+    "SELECT refreshed, oldest FROM fm_productlisting_refresh(:batch_size)"
+)
+BACKLOG_QUERY = sqlalchemy.text(
+    "SELECT count(*) AS pending, "
+    "EXTRACT(EPOCH FROM now() - min(dirtied_at)) AS staleness "
+    "FROM fm_productlisting_dirty"
+)
+
+
+@dataclass(slots=True, kw_only=True)
+class ListingRefresher:
+    """
+    Rebuild the listing rows of products changed since the last refresh,
+    `batch_size` at a time. Full batches are followed right away, otherwise
+    the next refresh runs `interval` seconds later.
+
+    `lag` is how long the oldest change of the last batch waited to be
+    listed, every worker keeps its own figures.
+    """
+
+    batch_size: int = 500
+    interval: float = 2
+    runs: int = 0
+    refreshed: int = 0
+    duration: float = 0
+    last_duration: float = 0
+    lag: float = 0
+    max_lag: float = 0
+    _task: asyncio.Task | None = None
+
+    async def refresh(self, database: Database) -> int:
+        started = time.perf_counter()
+        row = await database.fetch_one(REFRESH_QUERY, {"batch_size": self.batch_size})
+        if not row.refreshed:
+            return 0
+        self.last_duration = time.perf_counter() - started
+        self.duration += self.last_duration
+        self.runs += 1
+        self.refreshed += row.refreshed
+        now = datetime.datetime.now(datetime.timezone.utc)
+        self.lag = (now - row.oldest).total_seconds()
+        self.max_lag = max(self.max_lag, self.lag)
+        return row.refreshed
+
+    async def backlog(self, database: Database) -> tuple[int, float]:
+        """Products waiting for a refresh and the age of the oldest change, in seconds"""
+        row = await database.fetch_one(BACKLOG_QUERY)
+        return row.pending, float(row.staleness or 0)
+
+    async def run(self, database: Database) -> None:
+        while True:
+            try:
+                refreshed = await self.refresh(database)
+            except Exception:
+                logger.exception("product listing refresh failed")
+                refreshed = 0
+            if refreshed < self.batch_size:
+                await asyncio.sleep(self.interval)
+
+    def start(self, database: Database) -> None:
+        if database.url.dialect != "postgresql" or self._task is not None:
+            return
+        self._task = asyncio.create_task(self.run(database))
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def stats(self) -> dict[str, t.Any]:
+        return dict(
+            runs=self.runs,
+            refreshed=self.refreshed,
+            last_duration_ms=round(self.last_duration * 1000, 3),
+            average_duration_ms=round(self.duration / self.runs * 1000, 3)
+            if self.runs
+            else 0,
+            lag=round(self.lag, 3),
+            max_lag=round(self.max_lag, 3),
+        )
+
+
+listing_refresher = ListingRefresher()
+
+
+def start_listing_refresher(
+    database: Database, interval: float, batch_size: int
+) -> t.Callable[[], None]:
+    """Startup hook refreshing the product listing read model of this worker"""
+
+    def start() -> None:
+        listing_refresher.interval = interval
+        listing_refresher.batch_size = batch_size
+        listing_refresher.start(database)
+
+    return start
@@ -0,0 +1,38 @@
+import typing as t
+import datetime
+import decimal
+import uuid
+import pydantic as pyd
+
+
+class ProductListingOut(pyd.BaseModel):
+    id: t.Optional[uuid.UUID]
+    name: t.Optional[str]
+    slug: t.Optional[str]
+    sku: t.Optional[str]
+    in_stock: t.Optional[bool]
+    vendor: t.Optional[uuid.UUID]
+    vendor_name: t.Optional[str]
+    cover_url: t.Optional[str]
+    min_price: t.Optional[decimal.Decimal]
+    max_price: t.Optional[decimal.Decimal]
+    category_ids: t.List[uuid.UUID] = []
+    rating_average: t.Optional[float]
+    rating_count: int = 0
+    created_at: t.Optional[datetime.datetime]
+    updated_at: t.Optional[datetime.datetime]
+
+    class Config:
+        from_attributes = True
+
+
+class IListingRefreshStats(pyd.BaseModel):
+    worker: int
+    pending: int
+    staleness: float
+    runs: int
+    refreshed: int
+    last_duration_ms: float
+    average_duration_ms: float
+    lag: float
+    max_lag: float
@@ -0,0 +1,45 @@
+import os
+from fermerce.app.market.catalog.models import ProductListing
+from fermerce.app.market.catalog.refresh import listing_refresher
+from fermerce.app.market.catalog.schemas import IListingRefreshStats
+from fermerce.lib.utils.list_endpoint_query_params import QueryType
+from fermerce.core.services.base import BaseRepository
+from fermerce.lib.utils.base_response import IExportJob, IFilterList
+
+
+class ProductCatalogRepository(object):
+    base_doa = BaseRepository[ProductListing](
+        model=ProductListing,
+        model_name="Product",
+    )
+
+    @classmethod
+    async def get_list(cls, params: QueryType) -> IFilterList | IExportJob:
+        check = dict(is_suspended=False)
+        if params.export_async:
+            # the broker is configured on import, only exports need it
+            from fermerce.taskiq.export.tasks import submit_export
+
+            return await submit_export(cls.base_doa, params, check=check)
+        total_count = await cls.base_doa.check_list_modified(
+            check=check,
+            count_strategy=params.count_strategy,
+            include_total=params.include_total,
+        )
+        return await cls.base_doa.filter_and_list(
+            check=check,
+            total_count=total_count,
+            **params.model_dump(
+                exclude={"filter_string", "load_related", "export_async"}
+            ),
+        )
+
+    @classmethod
+    async def get_refresh_stats(cls) -> IListingRefreshStats:
+        pending, staleness = await listing_refresher.backlog(ProductListing.database)
+        return IListingRefreshStats(
+            worker=os.getpid(),
+            pending=pending,
+            staleness=staleness,
+            **listing_refresher.stats(),
+        )
@@ -8,3 +8,6 @@ class ProductCategory(BaseModel):
     """
 
     name = fields.CharField(max_length=50, null=True)
+
+    class Meta:
+        tablename = "fm_productcategory"
@@ -1,5 +1,4 @@
 import typing as t
-from edgy import Q
 from fastapi import status
 from fermerce.app.market.category.models import ProductCategory
 from fermerce.app.market.category.schemas import ProductCategoryIn
@@ -7,6 +6,7 @@ from fermerce.lib.utils.list_endpoint_query_params import QueryType
 from fermerce.core.services.base import BaseRepository
 from fermerce.lib.utils.base_response import (
     ICount,
+    IExportJob,
     IFilterList,
     get_error_response,
 )
@@ -16,10 +16,12 @@ class ProductCategoryRepository(object):
     base_doa = BaseRepository[ProductCategory](
         model=ProductCategory,
         model_name="Product Category",
+        cache_ttl=300,
     )
 
     @classmethod
     async def get(cls, product_category_id: str) -> ProductCategory:
+        await cls.base_doa.check_modified(product_category_id)
         return await cls.base_doa.get(id=product_category_id, raise_error=True)
 
     @classmethod
@@ -35,13 +37,24 @@ class ProductCategoryRepository(object):
         return await cls.base_doa.get_count()
 
     @classmethod
-    async def get_list(cls, params: QueryType) -> IFilterList:
-        checks_list = []
+    async def get_list(cls, params: QueryType) -> IFilterList | IExportJob:
+        check = {}
         if params.filter_string:
-            checks_list.append(Q(name__icontains=params.filter_string))
+            check["name__icontains"] = params.filter_string
+        if params.export_async:
+            # the broker is configured on import, only exports need it
+            from fermerce.taskiq.export.tasks import submit_export
+
+            return await submit_export(cls.base_doa, params, check=check)
+        total_count = await cls.base_doa.check_list_modified(
+            check=check,
+            count_strategy=params.count_strategy,
+            include_total=params.include_total,
+        )
         return await cls.base_doa.filter_and_list(
-            check_list=checks_list,
-            **params.model_dump(exclude={"filter_string"}),
+            check=check,
+            total_count=total_count,
+            **params.model_dump(exclude={"filter_string", "export_async"}),
         )
 
     @classmethod
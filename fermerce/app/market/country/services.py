@@ -4,6 +4,7 @@ from fastapi import status
 from fermerce.core.enum.sort_type import SortOrder
 from fermerce.core.schemas.response import ITotalCount
 from fermerce.core.services.base_old import filter_and_list
+from fermerce.core.services.reference import reference_data
 from fermerce.lib.exceptions import exceptions
 from fermerce.app.country import schemas, models
 from fastapi import Response
@@ -13,19 +14,20 @@ from fastapi import Response
 async def create(
     data_in: schemas.ICountryIn,
 ) -> models.Country:
-    check_country = await models.Country.get_or_none(name=data_in.name)
+    check_country = await reference_data.get_by_name(models.Country, data_in.name)
     if check_country:
         raise exceptions.DuplicateError("country already exists")
     new_type = await models.Country.create(**data_in.dict())
     if not new_type:
         raise exceptions.ServerError("Internal server error")
+    await reference_data.changed(models.Country, new_type.id)
     return new_type
 
 
 async def get(
     country_id: uuid.UUID,
 ) -> models.Country:
-    perm = await models.Country.get_or_none(id=country_id)
+    perm = await reference_data.get(models.Country, country_id)
     if not perm:
         raise exceptions.NotFoundError("country not found")
     return perm
@@ -68,13 +70,14 @@ async def update(
     check_country = await models.Country.get_or_none(id=country_id)
     if not check_country:
         raise exceptions.NotFoundError("country does not exist")
-    check_name = await models.Country.get_or_none(name=data_in.name)
+    check_name = await reference_data.get_by_name(models.Country, data_in.name)
     if check_name and check_name.id != country_id:
         raise exceptions.DuplicateError("country already exists")
     elif check_name and check_name.id == country_id:
         return check_country
     check_country.update_from_dict(data_in.dict())
     await check_country.save()
+    await reference_data.changed(models.Country, country_id)
     return check_country
 
 
@@ -85,4 +88,5 @@ async def delete(
     deleted_country = await models.Country.filter(id=country_id).delete()
     if not deleted_country:
         raise exceptions.NotFoundError("country does not exist")
+    await reference_data.changed(models.Country, country_id)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -5,6 +5,7 @@ from tortoise.expressions import Q
 from fermerce.core.enum.sort_type import SortOrder
 from fermerce.core.schemas.response import ITotalCount
 from fermerce.core.services.base_old import filter_and_list
+from fermerce.core.services.reference import reference_data
 from fermerce.lib.exceptions import exceptions
 from fermerce.app.delivery_mode import schemas, models
 from fastapi import Response
@@ -21,13 +22,14 @@ async def create(
     new_delivery_mode = await models.DeliveryMode.create(**data_in.dict())
     if not new_delivery_mode:
         raise exceptions.ServerError("Internal server error")
+    await reference_data.changed(models.DeliveryMode, new_delivery_mode.id)
     return new_delivery_mode
 
 
 async def get(
     delivery_mode_id: uuid.UUID,
 ) -> models.DeliveryMode:
-    delivery_mode = await models.DeliveryMode.get_or_none(id=delivery_mode_id)
+    delivery_mode = await reference_data.get(models.DeliveryMode, delivery_mode_id)
     if not delivery_mode:
         raise exceptions.NotFoundError("delivery type not found")
     return delivery_mode
@@ -79,6 +81,7 @@ async def update(
         return check_delivery_mode
     check_delivery_mode.update_from_dict(data_in.dict())
     await check_delivery_mode.save()
+    await reference_data.changed(models.DeliveryMode, delivery_mode_id)
     return check_delivery_mode
 
 
@@ -90,4 +93,5 @@ async def delete(
     ).delete()
     if not deleted_delivery_mode:
         raise exceptions.NotFoundError("delivery type does not exist")
+    await reference_data.changed(models.DeliveryMode, delivery_mode_id)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -8,3 +8,6 @@ class MeasuringUnit(BaseModel):
     """
 
     unit = fields.CharField(max_length=50, null=True)
+
+    class Meta:
+        tablename = "fm_measuringunit"
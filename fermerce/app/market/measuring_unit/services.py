@@ -4,6 +4,7 @@ from fastapi import status
 from fermerce.core.enum.sort_type import SortOrder
 from fermerce.core.schemas.response import ITotalCount
 from fermerce.core.services.base_old import filter_and_list
+from fermerce.core.services.reference import reference_data
 from fermerce.lib.exceptions import exceptions
 from fermerce.app.measuring_unit import schemas, models
 from fastapi import Response
@@ -20,13 +21,14 @@ async def create(
     new_type = await models.MeasuringUnit.create(**data_in.dict())
     if not new_type:
         raise exceptions.ServerError("Internal server error")
+    await reference_data.changed(models.MeasuringUnit, new_type.id)
     return new_type
 
 
 async def get(
     unit_id: uuid.UUID,
 ) -> models.MeasuringUnit:
-    perm = await models.MeasuringUnit.get_or_none(id=unit_id)
+    perm = await reference_data.get(models.MeasuringUnit, unit_id)
     if not perm:
         raise exceptions.NotFoundError("measuring unit not found")
     return perm
@@ -74,6 +76,7 @@ async def update(
         return check_measuring_unit
     check_measuring_unit.update_from_dict(data_in.dict())
     await check_measuring_unit.save()
+    await reference_data.changed(models.MeasuringUnit, unit_id)
     return check_measuring_unit
 
 
@@ -85,4 +88,5 @@ async def delete(
     ).delete()
     if not deleted_measuring_unit:
         raise exceptions.NotFoundError("measuring unit does not exist")
+    await reference_data.changed(models.MeasuringUnit, unit_id)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
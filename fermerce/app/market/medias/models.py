@@ -11,6 +11,9 @@ class Media(BaseModel):
     content_type = fields.CharField(max_length=30)
     alt = fields.CharField(max_length=50, unique=True)
 
+    class Meta:
+        tablename = "fm_media"
+
     @classmethod
     def allowed_image_extensions(cls) -> list[str]:
         return ["jpg", "png", "jpeg", "gif", "webp"]
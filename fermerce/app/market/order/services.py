@@ -4,14 +4,15 @@ import uuid
 from tortoise.expressions import Q
 from fermerce.app.cart.models import Cart
 from fermerce.app.promo_code.models import ProductPromoCode
-from fermerce.app.delivery_mode.models import DeliveryMode
-from fermerce.app.status.models import Status
+from fermerce.app.market.delivery_mode.models import DeliveryMode
+from fermerce.app.market.status.models import Status
 from fermerce.app.address.models import Address
 from fermerce.app.user.models import User
 from fermerce.app.order import models, schemas
 from fermerce.core.enum.sort_type import SortOrder
 from fermerce.core.schemas.response import IResponseMessage
 from fermerce.core.services.base_old import filter_and_list, filter_and_single
+from fermerce.core.services.reference import reference_data
 from fermerce.lib.exceptions import exceptions
 from fermerce.taskiq.warehouse.tasks import add_order_to_warehouse_and_vendor
 
@@ -23,7 +24,7 @@ async def create(
     get_shipping_address = await Address.get_or_none(id=data_in.address_id)
     if not get_shipping_address:
         raise exceptions.NotFoundError("Shipping shipping_address does not exist")
-    get_delivery_mode = await DeliveryMode.get_or_none(id=data_in.delivery_mode)
+    get_delivery_mode = await reference_data.get(DeliveryMode, data_in.delivery_mode)
     if not get_delivery_mode:
         raise exceptions.NotFoundError("Order delivery mode not found")
     get_carts = (
@@ -35,9 +36,7 @@ async def create(
         raise exceptions.NotFoundError(
             "No product in cart, please add product to cart to continue"
         )
-    get_initial_status = await Status.get_or_none(name__icontains="pending")
-    if not get_initial_status:
-        get_initial_status = await Status.create(name="pending")
+    get_initial_status = await reference_data.get_or_create(Status, "pending")
 
     new_order = await models.Order.create(
         user=user,
@@ -77,7 +76,7 @@ async def update_order_status(data_in: schemas.IOrderUpdate) -> dict:
         )
         if not get_user_order_item:
             raise exceptions.NotFoundError("Order item is not found")
-        get_status = await Status.get_or_none(id=data_in.status_id)
+        get_status = await reference_data.get(Status, data_in.status_id)
         if not get_status:
             raise exceptions.NotFoundError("Status is not found")
         get_user_order_item.status = get_status
@@ -40,9 +40,13 @@ async def get_products_list(
         default="id", description="order by attribute, e.g. id"
     ),
     is_suspended: t.Optional[bool] = False,
-    in_stock: t.Optional[bool] = False,
+    in_stock: t.Optional[bool] = None,
     search_type: t.Optional[SearchType] = SearchType._and,
     load_related: t.Optional[bool] = False,
+    include_facets: t.Optional[bool] = Query(
+        default=False,
+        description="result counts per category, vendor, stock and price band",
+    ),
 ):
     return await services.filter(
         filter_string=filter_string,
@@ -55,6 +59,20 @@ async def get_products_list(
         in_stock=in_stock,
         search_type=search_type,
         load_related=load_related,
+        include_facets=include_facets,
+    )
+
+
+@router.get("/facets", response_model=schemas.IProductFacets)
+async def get_product_facets(
+    filter_string: t.Optional[str] = Query(
+        default="", alias="filter", description="filter through all attributes"
+    ),
+    is_suspended: t.Optional[bool] = False,
+    in_stock: t.Optional[bool] = None,
+) -> schemas.IProductFacets:
+    return await services.get_facets(
+        filter_string=filter_string, is_suspended=is_suspended, in_stock=in_stock
     )
 
 
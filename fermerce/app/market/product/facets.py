@@ -0,0 +1,164 @@
+import typing as t
+
+import sqlalchemy
+from sqlalchemy.dialects import postgresql
+
+from fermerce.app.market.product import search
+from fermerce.app.market.product.models import Product
+from fermerce.app.market.selling_units.models import ProductSellingUnit
+from fermerce.lib.cache.local import LRUCache
+
+# upper bounds of the price bands, a product is priced by its cheapest selling unit
+PRICE_BANDS = (1000, 5000, 10000, 50000, 100000)
+FACETS = ("category", "vendor", "in_stock", "price_band")
+
+facet_cache = LRUCache(maxsize=512, ttl=30)
+
+
+def get_facet_key(text: str, check: dict = None) -> tuple:
+    """Queries differing only by case, spacing or argument order share their facets"""
+    return (" ".join(text.lower().split()), tuple(sorted((check or {}).items())))
+
+
+def get_price_band(bucket: int) -> tuple[int | None, int | None]:
+    lower = PRICE_BANDS[bucket - 1] if bucket > 0 else None
+    upper = PRICE_BANDS[bucket] if bucket < len(PRICE_BANDS) else None
+    return lower, upper
+
+
+def get_facet_statement(
+    condition_list: t.Sequence,
+    facet_conditions: dict[str, sqlalchemy.ColumnElement] = None,
+) -> sqlalchemy.Select:
+    """
+    Every facet of the products matching `condition_list` in one scan: one
+    grouping set per facet, told apart by the GROUPING() bitmask, where the
+    bit of every column left out of the set is on.
+
+    `facet_conditions` are the filters on a facet's own column. Each facet
+    is counted under every condition but its own, so picking a vendor still
+    shows the counts of the other vendors.
+    """
+    facet_conditions = facet_conditions or {}
+    product = Product.table
+    categories = Product.meta.fields["categories"]
+    link = categories.through.table
+    unit = ProductSellingUnit.table
+    price = (
+        sqlalchemy.select(sqlalchemy.func.min(unit.c.price))
+        .where(unit.c.product == product.c.id)
+        .scalar_subquery()
+    )
+    filtered = (
+        sqlalchemy.select(
+            product.c.id,
+            product.c.vendor,
+            product.c.in_stock,
+            sqlalchemy.func.width_bucket(
+                price,
+                sqlalchemy.cast(
+                    postgresql.array(PRICE_BANDS), postgresql.ARRAY(sqlalchemy.Numeric)
+                ),
+            ).label("price_band"),
+            *(
+                condition.label(f"match_{name}")
+                for name, condition in facet_conditions.items()
+            ),
+        )
+        .where(*condition_list)
+        .cte("filtered")
+    )
+    columns = (
+        link.c[categories.to_foreign_key].label("category"),
+        filtered.c.vendor,
+        filtered.c.in_stock,
+        filtered.c.price_band,
+    )
+    counts = []
+    for name in (*FACETS, None):
+        # the category join repeats products, count each one once
+        count = sqlalchemy.func.count(filtered.c.id.distinct())
+        matches = [filtered.c[f"match_{other}"] for other in facet_conditions if other != name]
+        if matches:
+            count = count.filter(sqlalchemy.and_(*matches))
+        # the last one, under every condition, counts what the listing shows
+        counts.append(count.label(f"{name}_count" if name else "count"))
+    return (
+        sqlalchemy.select(
+            sqlalchemy.func.grouping(*columns).label("grouping"),
+            *columns,
+            *counts,
+        )
+        .select_from(filtered)
+        .outerjoin(link, link.c[categories.from_foreign_key] == filtered.c.id)
+        .group_by(
+            sqlalchemy.func.grouping_sets(
+                *(sqlalchemy.tuple_(column) for column in columns)
+            )
+        )
+    )
+
+
+def get_facets_from_rows(rows: t.Sequence) -> dict[str, list[dict]]:
+    masks = {
+        (1 << len(FACETS)) - 1 - (1 << (len(FACETS) - 1 - index)): name
+        for index, name in enumerate(FACETS)
+    }
+    facets = {name: [] for name in FACETS}
+    for row in rows:
+        name = masks[row.grouping]
+        value, count = getattr(row, name), getattr(row, f"{name}_count")
+        # a value only rows filtered out by the other facets have
+        if value is None or not count:
+            continue
+        if name == "price_band":
+            lower, upper = get_price_band(value)
+            facets[name].append(dict(min=lower, max=upper, count=count))
+        else:
+            facets[name].append(dict(value=value, count=count))
+    for values in facets.values():
+        values.sort(key=lambda facet: facet["count"], reverse=True)
+    facets["price_band"].sort(key=lambda facet: facet["min"] or 0)
+    return facets
+
+
+async def get_facets(
+    text: str = "",
+    check: dict = None,
+    fuzzy: bool = True,
+    cache_ttl: float = 30,
+) -> dict[str, list[dict]]:
+    """
+    Product counts per category, vendor, stock flag and price band over the
+    products a search for `text` lists, cached for `cache_ttl` seconds.
+    """
+    key = get_facet_key(text, check)
+    if cache_ttl:
+        facets = facet_cache.get(key)
+        if facets is not None:
+            return facets
+    database = search.get_read_database()
+    check = check or {}
+    check_list = search.get_check_list(
+        {name: value for name, value in check.items() if name not in FACETS}
+    )
+    facet_conditions = {
+        name: Product.table.c[name] == value
+        for name, value in check.items()
+        if name in FACETS
+    }
+    conditions = [search.get_match_condition(text)] if text.strip() else []
+    rows = await database.fetch_all(
+        get_facet_statement([*conditions, *check_list], facet_conditions)
+    )
+    if not any(row.count for row in rows) and conditions and fuzzy:
+        # same fallback as the listing, a typo is searched by trigrams
+        rows = await database.fetch_all(
+            get_facet_statement(
+                [search.get_fuzzy_condition(text), *check_list], facet_conditions
+            )
+        )
+    facets = get_facets_from_rows(rows)
+    if cache_ttl:
+        facet_cache.set(key, facets, ttl=cache_ttl)
+    return facets
@@ -5,6 +5,24 @@ from fermerce.core.model.base_model import BaseModel
 from fermerce.lib.utils.random_string import random_str
 
 
+class ProductMediaGallery(BaseModel):
+    product = fields.ForeignKey("Product", related_name=False)
+    media = fields.ForeignKey("Media", related_name=False)
+
+    class Meta:
+        tablename = "fm_product_media_gallery"
+        unique_together = [("product", "media")]
+
+
+class ProductRelCategory(BaseModel):
+    product = fields.ForeignKey("Product", related_name=False)
+    productcategory = fields.ForeignKey("ProductCategory", related_name=False)
+
+    class Meta:
+        tablename = "fm_product_rel_category"
+        unique_together = [("product", "productcategory")]
+
+
 class Product(BaseModel):
     name = fields.CharField(max_length=50, null=False)
     slug = fields.CharField(max_length=150, null=False)
@@ -24,18 +42,25 @@ class Product(BaseModel):
     galleries = fields.ManyToManyField(
         "Media",
         related_name="product_galleries",
-        through="fm_product_media_gallery",
+        through=ProductMediaGallery,
+        from_foreign_key="product",
+        to_foreign_key="media",
     )
     categories = fields.ManyToManyField(
         "ProductCategory",
         related_name="products",
-        through="fm_product_rel_category",
+        through=ProductRelCategory,
+        from_foreign_key="product",
+        to_foreign_key="productcategory",
     )
     vendor: Vendor | None = fields.ForeignKey(
         "Vendor",
         related_name="products",
     )
 
+    class Meta:
+        tablename = "fm_product"
+
     @staticmethod
     def make_slug(name: str, random_length: int = 10) -> str:
         slug = f"{name.replace(' ', '-').replace('_', '-')[:30]}-{random_str(random_length).strip().lower()}"
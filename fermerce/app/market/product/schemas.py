@@ -22,8 +22,27 @@ class IProductOut(pyd.BaseModel):
         orm_mode = True
 
 
+class IFacetCount(pyd.BaseModel):
+    value: t.Any
+    count: int
+
+
+class IPriceBandCount(pyd.BaseModel):
+    min: t.Optional[int] = None
+    max: t.Optional[int] = None
+    count: int
+
+
+class IProductFacets(pyd.BaseModel):
+    category: t.List[IFacetCount] = []
+    vendor: t.List[IFacetCount] = []
+    in_stock: t.List[IFacetCount] = []
+    price_band: t.List[IPriceBandCount] = []
+
+
 class IProductListOut(IResponseFilterOut):
     results: t.Optional[t.List[IProductOut]]
+    facets: t.Optional[IProductFacets] = None
 
     class Config:
         extra = "allow"
@@ -0,0 +1,227 @@
+import typing as t
+
+import sqlalchemy
+from edgy import Database
+from sqlalchemy.dialects import postgresql
+
+from fermerce.app.market.product.models import Product
+from fermerce.core.model.base_model import registry
+from fermerce.core.model.descriptor import get_descriptor
+from fermerce.core.services.loader import get_loader
+from fermerce.core.services.routing import replica_router
+from fermerce.core.services.serializer import get_serializer
+from fermerce.lib.utils.base_response import SortEnum
+
+SEARCH_CONFIG = "english"
+
+# one row per product, kept up to date by the triggers of the product search
+# migration from the product, its details and its category names
+product_search = sqlalchemy.Table(
+    "fm_product_search",
+    registry.metadata,
+    sqlalchemy.Column(
+        "product",
+        sqlalchemy.UUID(),
+        sqlalchemy.ForeignKey("fm_product.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    sqlalchemy.Column("document", postgresql.TSVECTOR(), nullable=False),
+    sqlalchemy.Column("updated_at", sqlalchemy.DateTime(timezone=True), nullable=False),
+    sqlalchemy.Index(
+        "ix_fm_product_search_document", "document", postgresql_using="gin"
+    ),
+)
+
+
+# vendors are still tortoise models, only the columns searches read
+vendor = sqlalchemy.table(
+    "fm_vendor",
+    sqlalchemy.column("id", sqlalchemy.UUID()),
+    sqlalchemy.column("business_name", sqlalchemy.String()),
+    sqlalchemy.column("is_suspended", sqlalchemy.Boolean()),
+)
+
+
+def get_search_query(text: str) -> sqlalchemy.ColumnElement:
+    """Parse user input the way search engines do: quotes, `or` and `-word`"""
+    return sqlalchemy.func.websearch_to_tsquery(SEARCH_CONFIG, text)
+
+
+def get_vendor_condition(text: str) -> sqlalchemy.ColumnElement:
+    """Products of the vendors whose business name contains `text`"""
+    return Product.table.c.vendor.in_(
+        sqlalchemy.select(vendor.c.id).where(
+            vendor.c.business_name.icontains(text, autoescape=True)
+        )
+    )
+
+
+def get_match_condition(text: str) -> sqlalchemy.ColumnElement:
+    """Products whose search document matches `text`, or their vendor's name"""
+    document_matches = product_search.c.document.op("@@")(get_search_query(text))
+    return sqlalchemy.or_(
+        Product.table.c.id.in_(
+            sqlalchemy.select(product_search.c.product).where(document_matches)
+        ),
+        get_vendor_condition(text),
+    )
+
+
+def get_fuzzy_condition(text: str) -> sqlalchemy.ColumnElement:
+    """
+    Products whose name is similar to `text` by trigrams, used when nothing
+    matched, usually a typo. `%` uses pg_trgm.similarity_threshold, 0.3 by default.
+    """
+    return Product.table.c.name.op("%")(text)
+
+
+def get_columns(select: str = None) -> list[sqlalchemy.Column]:
+    """Product columns named in `select`, every column when none is"""
+    table = Product.table
+    names = get_descriptor(Product).get_columns(select)
+    return [table.c[name] for name in names] if names else list(table.columns)
+
+
+def get_ordering(
+    relevance: sqlalchemy.ColumnElement,
+    order_by: str = None,
+    sort_by: SortEnum = SortEnum.DESC,
+) -> list[sqlalchemy.ColumnElement]:
+    """Columns named in `order_by` first when any, then the most relevant"""
+    table = Product.table
+    ordering = [
+        table.c[name].asc() if sort_by == SortEnum.ASC else table.c[name].desc()
+        for name in get_descriptor(Product).get_columns(order_by)
+    ]
+    return [*ordering, relevance.desc(), table.c.id]
+
+
+def get_match_statement(
+    text: str,
+    check_list: t.Sequence = (),
+    select: str = None,
+    order_by: str = None,
+    sort_by: SortEnum = SortEnum.DESC,
+) -> sqlalchemy.Select:
+    """Products whose document or vendor name matches `text`, best ranked first"""
+    table = Product.table
+    search_query = get_search_query(text)
+    # products matched by their vendor's name alone rank last
+    relevance = sqlalchemy.func.coalesce(
+        sqlalchemy.func.ts_rank_cd(product_search.c.document, search_query), 0
+    )
+    return (
+        sqlalchemy.select(
+            *get_columns(select),
+            relevance.label("relevance"),
+            sqlalchemy.func.count().over().label("total_count"),
+        )
+        .select_from(table)
+        .outerjoin(product_search, product_search.c.product == table.c.id)
+        .where(
+            sqlalchemy.or_(
+                product_search.c.document.op("@@")(search_query),
+                get_vendor_condition(text),
+            ),
+            *check_list,
+        )
+        .order_by(*get_ordering(relevance, order_by, sort_by))
+    )
+
+
+def get_fuzzy_statement(
+    text: str,
+    check_list: t.Sequence = (),
+    select: str = None,
+    order_by: str = None,
+    sort_by: SortEnum = SortEnum.DESC,
+) -> sqlalchemy.Select:
+    """Products similar to `text` by name, most similar first"""
+    table = Product.table
+    relevance = sqlalchemy.func.similarity(table.c.name, text)
+    return (
+        sqlalchemy.select(
+            *get_columns(select),
+            relevance.label("relevance"),
+            sqlalchemy.func.count().over().label("total_count"),
+        )
+        .select_from(table)
+        .where(get_fuzzy_condition(text), *check_list)
+        .order_by(*get_ordering(relevance, order_by, sort_by))
+    )
+
+
+def get_check_list(check: dict = None) -> list[sqlalchemy.ColumnElement]:
+    """Column values in `check`, and only the products of active vendors"""
+    table = Product.table
+    return [
+        table.c.vendor.in_(
+            sqlalchemy.select(vendor.c.id).where(vendor.c.is_suspended.is_(False))
+        ),
+        *(table.c[name] == value for name, value in (check or {}).items()),
+    ]
+
+
+def get_read_database() -> Database:
+    replica_name = replica_router.choose()
+    return registry.extra[replica_name] if replica_name else Product.database
+
+
+async def get_related_results(results: list[dict]) -> list[dict]:
+    """Nest the foreign keys of the ranked rows, one batched load per relation"""
+    loader = get_loader()
+    for name in sorted(get_descriptor(Product).related):
+        serializer = get_serializer(Product.meta.fields[name].target)
+        instances = await loader.load_many(
+            Product.meta.fields[name].target,
+            [result[name] for result in results if result[name] is not None],
+        )
+        related = {
+            str(instance.pk): serializer.one(instance)
+            for instance in instances
+            if instance is not None
+        }
+        for result in results:
+            value = result[name]
+            result[name] = related.get(str(value)) if value is not None else None
+    return results
+
+
+async def search_products(
+    text: str,
+    check: dict = None,
+    page: int = 1,
+    per_page: int = 10,
+    fuzzy: bool = True,
+    select: str = None,
+    order_by: str = None,
+    sort_by: SortEnum = SortEnum.DESC,
+    load_related: bool = False,
+) -> tuple[list[dict], int]:
+    """
+    Ranked products matching `text` and the column values in `check`,
+    every row carrying its `relevance`, and the total number of matches.
+    `select` limits the columns, `order_by` sorts before the relevance and
+    `load_related` nests the foreign keys, unless `select` is given.
+    """
+    check_list = get_check_list(check)
+    database = get_read_database()
+    offset = max(page - 1, 0) * per_page
+    options = dict(select=select, order_by=order_by, sort_by=sort_by)
+    statement = get_match_statement(text, check_list, **options)
+    rows = await database.fetch_all(statement.offset(offset).limit(per_page))
+    if not rows and fuzzy:
+        # past the last page of matches is not the same as no match at all
+        matched = offset and await database.fetch_val(
+            sqlalchemy.select(statement.exists())
+        )
+        if not matched:
+            statement = get_fuzzy_statement(text, check_list, **options)
+            rows = await database.fetch_all(statement.offset(offset).limit(per_page))
+    results = [dict(row._mapping) for row in rows]
+    total_count = results[0]["total_count"] if results else 0
+    for result in results:
+        del result["total_count"]
+    if load_related and results and not get_descriptor(Product).get_columns(select):
+        results = await get_related_results(results)
+    return results, total_count
@@ -11,7 +11,9 @@ from fermerce.core.enum.sort_type import SearchType, SortOrder
 from fermerce.core.schemas.response import ITotalCount, IResponseMessage
 from fermerce.core.services.base_old import filter_and_list, filter_and_single
 from fermerce.lib.exceptions import exceptions
+from fermerce.lib.utils.base_response import SortEnum
 from fermerce.app.product import models, schemas
+from fermerce.app.market.product import facets, search
 from fermerce.app.category.models import ProductCategory
 from fermerce.app.medias.models import Media
 
@@ -92,6 +94,14 @@ async def get(slug: str, load_related: bool) -> schemas.IProductOut:
     return result
 
 
+def get_check(is_suspended: bool, in_stock: bool | None) -> dict:
+    """The stock flag only filters when given, without it both kinds are listed"""
+    check = dict(is_suspended=is_suspended)
+    if in_stock is not None:
+        check["in_stock"] = in_stock
+    return check
+
+
 # # get all permissions
 async def filter(
     filter_string: str,
@@ -102,43 +112,35 @@ async def filter(
     sort_by: SortOrder = SortOrder.asc,
     order_by: str = None,
     is_suspended: bool = False,
-    in_stock: bool = False,
+    in_stock: bool | None = None,
     search_type: SearchType = SearchType._or,
+    include_facets: bool = False,
 ) -> t.List[schemas.IProductListOut]:
-    query = None
+    check = get_check(is_suspended, in_stock)
+    if filter_string:
+        results, total_count = await search.search_products(
+            filter_string,
+            check=check,
+            page=page,
+            per_page=per_page,
+            select=select,
+            order_by=order_by,
+            sort_by=SortEnum.ASC if sort_by == SortOrder.asc else SortEnum.DESC,
+            load_related=load_related,
+        )
+        return schemas.IProductListOut(
+            results=results,
+            total_results=total_count,
+            facets=await facets.get_facets(filter_string, check=check)
+            if include_facets
+            else None,
+        )
     if search_type == SearchType._or:
         query = models.Product.filter(
-            Q(in_stock=in_stock) | Q(is_suspended=is_suspended)
+            Q(*(Q(**{name: value}) for name, value in check.items()), join_type="OR")
         )
     else:
-        query = models.Product.filter(
-            Q(in_stock=in_stock),
-            Q(is_suspended=is_suspended),
-            Q(is_suspended=is_suspended),
-            Q(name__icontains=filter_string),
-            Q(slug__icontains=filter_string),
-            Q(details__description__icontains=filter_string),
-            Q(details__title__icontains=filter_string),
-            Q(sku__icontains=filter_string),
-            Q(categories__name__icontains=filter_string),
-        )
-    if filter_string:
-        query = query.filter(
-            Q(in_stock=in_stock)
-            | Q(is_suspended=is_suspended)
-            | Q(is_suspended=is_suspended)
-            | Q(name__icontains=filter_string)
-            | Q(slug__icontains=filter_string)
-            | Q(description__icontains=filter_string)
-            | Q(details__title__icontains=filter_string)
-            | Q(details__description__icontains=filter_string)
-            | Q(sku__icontains=filter_string)
-            | Q(categories__name__icontains=filter_string)
-        )
-        query = query.filter(
-            Q(vendor__business_name__icontains=filter_string),
-            Q(vendor__is_suspended=False),
-        )
+        query = models.Product.filter(**check)
     result = await filter_and_list(
         model=models.Product,
         query=query,
@@ -153,6 +155,18 @@ async def filter(
     return result
 
 
+async def get_facets(
+    filter_string: str = "",
+    is_suspended: bool = False,
+    in_stock: bool | None = None,
+) -> schemas.IProductFacets:
+    return schemas.IProductFacets(
+        **await facets.get_facets(
+            filter_string, check=get_check(is_suspended, in_stock)
+        )
+    )
+
+
 async def get_product_count() -> ITotalCount:
     total = await models.Product.all().count()
     return ITotalCount(count=total)
@@ -5,5 +5,7 @@ from fermerce.core.model.base_model import BaseModel
 class ProductDetail(BaseModel):
     title = fields.CharField(max_length=50, null=False)
     description = fields.TextField(null=False)
-    product = fields.ForeignKey("models.Product", related_name="details")
- 
\ No newline at end of file
+    product = fields.ForeignKey("Product", related_name="details")
+
+    class Meta:
+        tablename = "fm_productdetail"
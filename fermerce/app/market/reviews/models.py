@@ -10,3 +10,6 @@ class Review(BaseModel):
     user = fields.ForeignKey("User", related_name="reviews")
     medias = fields.ManyToManyField("Media", through="fm_media")
     product = fields.ForeignKey("Product", related_name="reviews")
+
+    class Meta:
+        tablename = "fm_review"
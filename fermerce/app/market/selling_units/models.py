@@ -8,3 +8,6 @@ class ProductSellingUnit(BaseModel):
     size = fields.IntegerField(null=False, default=5)
     price = fields.DecimalField(null=False, max_digits=12, decimal_places=2)
     product = fields.ForeignKey("Product", related_name="measurement_units")
+
+    class Meta:
+        tablename = "fm_productsellingunit"
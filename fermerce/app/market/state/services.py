@@ -5,6 +5,7 @@ from tortoise.expressions import Q
 from fermerce.core.enum.sort_type import SortOrder
 from fermerce.core.schemas.response import ITotalCount
 from fermerce.core.services.base_old import filter_and_list
+from fermerce.core.services.reference import reference_data
 from fermerce.lib.exceptions import exceptions
 from fermerce.app.state import schemas, models
 from fastapi import Response
@@ -14,19 +15,20 @@ from fastapi import Response
 async def create(
     data_in: schemas.IStateIn,
 ) -> models.State:
-    check_state = await models.State.get_or_none(name=data_in.name)
+    check_state = await reference_data.get_by_name(models.State, data_in.name)
     if check_state:
         raise exceptions.DuplicateError("state already exists")
     new_type = await models.State.create(**data_in.dict())
     if not new_type:
         raise exceptions.ServerError("Internal server error")
+    await reference_data.changed(models.State, new_type.id)
     return new_type
 
 
 async def get(
     state_id: uuid.UUID,
 ) -> models.State:
-    perm = await models.State.get_or_none(id=state_id)
+    perm = await reference_data.get(models.State, state_id)
     if not perm:
         raise exceptions.NotFoundError("state not found")
     return perm
@@ -69,13 +71,14 @@ async def update(
     check_state = await models.State.get_or_none(id=state_id)
     if not check_state:
         raise exceptions.NotFoundError("state does not exist")
-    check_name = await models.State.get_or_none(name=data_in.name)
+    check_name = await reference_data.get_by_name(models.State, data_in.name)
     if check_name and check_name.id != state_id:
         raise exceptions.DuplicateError("state already exists")
     elif check_name and check_name.id == state_id:
         return check_state
     check_state.update_from_dict(data_in.dict())
     await check_state.save()
+    await reference_data.changed(models.State, state_id)
 
     return check_state
 
@@ -87,4 +90,5 @@ async def delete(
     deleted_state = await models.State.filter(id=state_id).delete()
     if not deleted_state:
         raise exceptions.NotFoundError("state does not exist")
+    await reference_data.changed(models.State, state_id)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -9,4 +9,7 @@ class Status(BaseModel):
     The Available state
     """
 
-    name = fields.CharField(max_length=50, null=True)
+    name = fields.CharField(max_length=50, null=True, unique=True)
+
+    class Meta:
+        tablename = "fm_status"
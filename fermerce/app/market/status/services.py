@@ -5,6 +5,7 @@ from tortoise.expressions import Q
 from fermerce.core.enum.sort_type import SortOrder
 from fermerce.core.schemas.response import ITotalCount
 from fermerce.core.services.base_old import filter_and_list
+from fermerce.core.services.reference import reference_data
 from fermerce.lib.exceptions import exceptions
 from fermerce.app.status import schemas, models
 from fastapi import Response
@@ -20,13 +21,14 @@ async def create(
     new_type = await models.Status.create(**data_in.dict())
     if not new_type:
         raise exceptions.ServerError("Internal server error")
+    await reference_data.changed(models.Status, new_type.id)
     return new_type
 
 
 async def get(
     status_id: uuid.UUID,
 ) -> models.Status:
-    perm = await models.Status.get_or_none(id=status_id)
+    perm = await reference_data.get(models.Status, status_id)
     if not perm:
         raise exceptions.NotFoundError("status not found")
     return perm
@@ -74,6 +76,7 @@ async def update(
         return check_status
     check_status.update_from_dict(data_in.dict())
     await check_status.save()
+    await reference_data.changed(models.Status, status_id)
     return check_status
 
 
@@ -84,4 +87,5 @@ async def delete(
     deleted_status = await models.Status.filter(id=status_id).delete()
     if not deleted_status:
         raise exceptions.NotFoundError("status does not exist")
+    await reference_data.changed(models.Status, status_id)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -3,13 +3,14 @@ import typing as t
 import uuid
 from tortoise.expressions import Q
 from fermerce.app.cards.models import SaveCard
-from fermerce.app.status.models import Status
+from fermerce.app.market.status.models import Status
 from fermerce.app.order.models import Order, OrderItem
 from fermerce.app.user.models import User
 from fermerce.core.enum.frequent_duration import Frequent
 from fermerce.core.enum.sort_type import SortOrder
 from fermerce.core.schemas.response import IResponseMessage
 from fermerce.core.services.base_old import filter_and_list, filter_and_single
+from fermerce.core.services.reference import reference_data
 from fermerce.lib.exceptions import exceptions
 from fermerce.app.charge import schemas, models
 from fermerce.app.charge import utils
@@ -37,7 +38,7 @@ async def create_order_charge(
         raise exceptions.BadDataError("This order has already been paid for")
     total_price = utils.get_product_total_price(order_items)
     if total_price > 0:
-        get_status, _ = await Status.get_or_create(name="processing")
+        get_status = await reference_data.get_or_create(Status, "processing")
         new_payment = await models.Charge.create(
             order=get_order,
             total=total_price,
@@ -94,7 +95,7 @@ async def create_charges_url(
             return generate_url.data
         raise exceptions.BadDataError(generate_url.message)
 
-    get_status, _ = await Status.get_or_create(name="processing")
+    get_status = await reference_data.get_or_create(Status, "processing")
     new_payment = await models.Charge.create(
         order=get_order,
         total=total_price,
@@ -124,7 +125,7 @@ async def verify_charges(
     if get_unfinished_payment:
         response = await services.charge_verification(get_unfinished_payment.reference)
         if response.status:
-            get_status, _ = await Status.get_or_create(name="completed")
+            get_status = await reference_data.get_or_create(Status, "completed")
             get_unfinished_payment.update_from_dict(
                 {"status": get_status, "is_verified": response.status}
             )
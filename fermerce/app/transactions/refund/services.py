@@ -1,10 +1,11 @@
 import uuid
 import typing as t
 from tortoise.expressions import Q
-from fermerce.app.status.models import Status
+from fermerce.app.market.status.models import Status
 from fermerce.core.enum.sort_type import SortOrder
 from fermerce.core.schemas.response import IResponseMessage
 from fermerce.core.services.base_old import filter_and_list, filter_and_single
+from fermerce.core.services.reference import reference_data
 from fermerce.lib.exceptions import exceptions
 from fermerce.app.charge import models as charge_models
 from fermerce.app.refund import models, schemas
@@ -29,7 +30,7 @@ async def refund_charges(
                 payment=get_payment
             )
             if new_refund:
-                get_status = await Status.get_or_create(name="refunded")
+                get_status = await reference_data.get_or_create(Status, "refunded")
                 get_payment.update_from_dict({"status": get_status})
                 await get_payment.save()
                 return IResponseMessage(
@@ -2,10 +2,11 @@ import uuid
 import typing as t
 from esmerald import status, Response, AsyncDAOProtocol
 from edgy import Q
-from fermerce.app.state.models import State
+from fermerce.app.market.state.models import State
 from fermerce.app.user.models import User
 from fermerce.app.vendor.models import Vendor
 from fermerce.core.enum.sort_type import SortOrder
+from fermerce.core.services.reference import reference_data
 from fermerce.core.services.base_old import (
     BaseRepository,
     filter_and_list,
@@ -19,7 +20,7 @@ class AddressDAO(AsyncDAOProtocol):
     async def user_create(
         self, payload: schemas.IAddressIn, user: User
     ) -> models.Address:
-        get_state = await State.query.get_or_none(id=payload.state)
+        get_state = await reference_data.get(State, payload.state)
         if not get_state:
             raise exceptions.NotFoundError("shipping state not found")
 
@@ -45,7 +46,7 @@ class AddressDAO(AsyncDAOProtocol):
 
 
 async def vendor_create(payload: schemas.IAddressIn, vendor: Vendor):
-    get_state = await State.get_or_none(id=payload.state)
+    get_state = await reference_data.get(State, payload.state)
     if not get_state:
         raise exceptions.NotFoundError("state not found")
     check_address = await models.Address.query.filter(
@@ -113,7 +114,7 @@ async def user_update(
         raise exceptions.NotFoundError("Address not found")
     state = get_address.state
     if state.id != payload.state:
-        state = await State.get_or_none(id=payload.state)
+        state = await reference_data.get(State, payload.state)
     if not state:
         raise exceptions.NotFoundError("shipping state not found")
 
@@ -160,7 +161,7 @@ async def vendor_update(
         raise exceptions.NotFoundError("Address not found")
     state = get_address.state
     if state.id != payload.state:
-        state = await State.get_or_none(id=payload.state)
+        state = await reference_data.get(State, payload.state)
     if not state:
         raise exceptions.NotFoundError("state not found")
 
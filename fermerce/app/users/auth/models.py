@@ -12,7 +12,12 @@ class Auth(BaseModel):
     refresh_token = fields.CharField(max_length=300, null=True)
     access_token = fields.CharField(max_length=300, null=True)
     owner_id = fields.UUIDField(null=True)
-    ip_address = fields.CharField(max_length=20, unique=True, null=False, index=True)
+    ip_address = fields.CharField(max_length=20, null=False, index=True)
+
+    class Meta:
+        tablename = "fm_auth"
+        # one row per user and address, users behind one NAT share the address
+        unique_together = [("owner_id", "ip_address")]
 
     @staticmethod
     def get_user_ip(request: Request) -> str:
@@ -1,5 +1,6 @@
 import os
 import datetime
+from functools import cached_property
 from typing import List, Optional
 from edgy import Registry, Database
 from esmerald import CORSConfig, EsmeraldAPISettings, OpenAPIConfig, StaticFilesConfig
@@ -7,6 +8,8 @@ from esmerald.config.jwt import JWTConfig
 from esmerald.config.template import TemplateConfig
 from esmerald.template.jinja import JinjaTemplateEngine
 import pydantic as pyd
+from fermerce.core.services.pool import MeasuredQueuePool
+from fermerce.core.services.routing import get_replica_name
 from fermerce.lib.utils import get_path
 from esmerald.openapi.models import Contact
 from esmerald.conf.enums import EnvironmentType
@@ -43,6 +46,55 @@ class ProductionSettings(EsmeraldAPISettings):
     db_port: int
     db_host: str
     db_driver: str
+    # connection pool of every worker: connections open on demand, up to
+    # min_size of them stay in the pool once returned, bursts may open up to
+    # max_size and the extra ones are closed when returned
+    db_pool_min_size: int = 5
+    db_pool_max_size: int = 10
+    db_pool_acquire_timeout: float = 10
+    # maximum age in seconds of a connection, an older one is replaced when
+    # next checked out, whether it was idle or not
+    db_pool_recycle: float = 300
+    # prepared statements cached per connection, 0 behind pgbouncer
+    db_statement_cache_size: int = 100
+    # read replicas, reads are routed to them while their lag stays under the limit
+    db_replica_urls: List[str] = []
+    db_replica_max_lag: float = 5
+    db_replica_check_interval: float = 10
+    # a statement shape run more times than this in one request is logged as N+1
+    query_repeated_threshold: int = 10
+    # product listing read model, refreshed in batches from the changed products
+    product_listing_refresh_interval: float = 2
+    product_listing_refresh_batch_size: int = 500
+    # background exports, files are deleted `export_ttl` seconds after completion
+    export_dir: str = get_path.get_export_dir()
+    export_ttl: float = 24 * 60 * 60
+    # seconds between reloads of the in-process reference tables, e.g. states
+    reference_data_refresh_interval: float = 300
+    # file the workers of a host share the reference tables through, e.g. under
+    # /dev/shm, unset every worker keeps its own copy
+    reference_data_snapshot_path: Optional[str] = None
+    # response compression, brotli when installed otherwise gzip
+    compression_minimum_size: int = 500
+    compression_gzip_level: int = 4
+    compression_brotli_quality: int = 4
+    # server, unset workers default to one per cpu available to the process
+    server_host: str = "127.0.0.1"
+    server_port: int = 8001
+    server_workers: Optional[int] = None
+    # import the app once before forking the workers, needs gunicorn
+    server_preload: bool = True
+    # event loop and http parser, "auto" uses httptools when installed. uvloop
+    # stays off while edgy applies nest_asyncio on import, which can't patch it
+    server_loop: str = "asyncio"
+    server_http: str = "auto"
+    # seconds an idle connection is kept open, above the load balancer's idle
+    # timeout so it never sends a request on a connection being closed
+    server_keep_alive: int = 75
+    # pending connections queued by the kernel, capped by net.core.somaxconn
+    server_backlog: int = 2048
+    # seconds in-flight requests get to finish on shutdown
+    server_graceful_timeout: int = 30
 
     # background task broker settings e.g rabbit mq, redis etc.
     broker_type: str
@@ -123,10 +175,28 @@ class ProductionSettings(EsmeraldAPISettings):
             directory=get_path.get_static_file_dir(),
         )
 
-    @property
+    @cached_property
     def database_config(self) -> tuple[Database, Registry]:
-        database = Database(self.get_database_url())
-        return database, Registry(database=database)
+        options = self.get_database_options()
+        database = Database(self.get_database_url(), **options)
+        extra = {
+            get_replica_name(index): Database(url, **options)
+            for index, url in enumerate(self.db_replica_urls)
+        }
+        return database, Registry(database=database, extra=extra)
+
+    def get_database_options(self) -> dict:
+        """create_async_engine options of every database"""
+        return dict(
+            poolclass=MeasuredQueuePool,
+            pool_size=self.db_pool_min_size,
+            max_overflow=max(self.db_pool_max_size - self.db_pool_min_size, 0),
+            pool_timeout=self.db_pool_acquire_timeout,
+            pool_recycle=self.db_pool_recycle,
+            connect_args={
+                "prepared_statement_cache_size": self.db_statement_cache_size
+            },
+        )
 
     def get_database_url(self) -> str:
         return f"{self.db_driver}://{self.db_user}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}"
@@ -17,5 +17,7 @@ class BaseModel(edgy.Model):
     @classmethod
     def __init_subclass__(cls, **kwargs):
         super().__init_subclass__(**kwargs)
-        if not cls.Meta.abstract:
-            cls.Meta.tablename = f"fm_{cls.__name__.lower()}"
+        # edgy reads the name from `meta`, built from the class Meta before
+        # this hook runs, and only defaults it to `<name>s` afterwards
+        if not cls.meta.abstract and not cls.meta.tablename:
+            cls.meta.tablename = f"fm_{cls.__name__.lower()}"
@@ -0,0 +1,107 @@
+import typing as t
+from dataclasses import dataclass
+
+from edgy import Model, Prefetch, Registry
+from edgy.core.db.fields.base import PKField
+from edgy.core.db.fields.foreign_keys import BaseForeignKeyField
+from edgy.core.db.fields.many_to_many import BaseManyToManyForeignKeyField
+from edgy.core.db.relationships.related_field import RelatedField
+
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class ModelDescriptor:
+    """
+    Field metadata of an edgy model, computed once and shared by every repository
+    """
+
+    model: type[Model]
+    tablename: str
+    fields: frozenset[str]
+    foreign_keys: frozenset[str]
+    reverse_foreign_keys: frozenset[str]
+    many_to_many: frozenset[str]
+    columns: frozenset[str]
+    prefetch: tuple[Prefetch, ...]
+
+    @property
+    def related(self) -> frozenset[str]:
+        return self.foreign_keys
+
+    @property
+    def related_backward(self) -> frozenset[str]:
+        return self.reverse_foreign_keys
+
+    @property
+    def writable(self) -> frozenset[str]:
+        """Fields stored in the model's own table"""
+        return self.columns | self.foreign_keys
+
+    @property
+    def relations(self) -> frozenset[str]:
+        return self.foreign_keys | self.reverse_foreign_keys | self.many_to_many
+
+    def get_columns(self, value: str | None) -> list[str]:
+        """Parse a comma separated list of columns, dropping the ones not in the whitelist"""
+        if not value:
+            return []
+        columns = []
+        for column in value.split(","):
+            column = column.strip()
+            if column in self.columns and column not in columns:
+                columns.append(column)
+        return columns
+
+
+def get_prefetch_attribute(name: str) -> str:
+    return f"{name}_prefetched"
+
+
+def build_descriptor(model: type[Model]) -> ModelDescriptor:
+    meta = model.meta
+    foreign_keys, reverse_foreign_keys, many_to_many, fields = set(), set(), set(), set()
+    for name, field in meta.fields.items():
+        if isinstance(field, BaseManyToManyForeignKeyField):
+            many_to_many.add(name)
+        elif isinstance(field, BaseForeignKeyField):
+            foreign_keys.add(name)
+        elif isinstance(field, RelatedField):
+            reverse_foreign_keys.add(name)
+        elif not isinstance(field, PKField) and name not in meta.model_references:
+            fields.add(name)
+    prefetch = tuple(
+        Prefetch(related_name=name, to_attr=get_prefetch_attribute(name))
+        for name in sorted(reverse_foreign_keys)
+    )
+    reverse_foreign_keys.update(meta.model_references.keys())
+    table_columns = set(model.table.columns.keys())
+    return ModelDescriptor(
+        model=model,
+        tablename=meta.tablename,
+        fields=frozenset(fields),
+        foreign_keys=frozenset(foreign_keys),
+        reverse_foreign_keys=frozenset(reverse_foreign_keys),
+        many_to_many=frozenset(many_to_many),
+        columns=frozenset(name for name in fields if name in table_columns),
+        prefetch=prefetch,
+    )
+
+
+descriptors: dict[type[Model], ModelDescriptor] = {}
+
+
+def get_descriptor(model: type[Model]) -> ModelDescriptor:
+    descriptor = descriptors.get(model)
+    if descriptor is None:
+        descriptor = descriptors[model] = build_descriptor(model)
+    return descriptor
+
+
+def build_descriptors(registry: Registry) -> t.Callable[[], None]:
+    """Startup hook that builds the descriptors of every model in the registry"""
+
+    def build() -> None:
+        descriptors.clear()
+        for model in registry.models.values():
+            get_descriptor(model)
+
+    return build
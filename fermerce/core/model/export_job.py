@@ -0,0 +1,39 @@
+import datetime
+
+from edgy import fields
+from fermerce.core.model.base_model import BaseModel
+from fermerce.core.model.fields import UTCDateTimeField
+from fermerce.lib.utils.base_response import ExportFormatEnum, ExportStatusEnum
+
+
+def get_utc_now() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+class ExportJob(BaseModel):
+    """
+    An export running in the task worker: the model, the filters to replay
+    and the progress of the file being written. Its times are in UTC.
+    """
+
+    source_model = fields.CharField(max_length=100)
+    title = fields.CharField(max_length=100)
+    export_format = fields.CharField(
+        max_length=10, default=ExportFormatEnum.EXCEL.value
+    )
+    filters = fields.JSONField(default=dict)
+    status = fields.CharField(max_length=10, default=ExportStatusEnum.PENDING.value)
+    total_rows = fields.IntegerField(null=True)
+    exported_rows = fields.IntegerField(default=0)
+    size = fields.BigIntegerField(null=True)
+    path = fields.CharField(max_length=300, null=True)
+    error = fields.TextField(null=True)
+    completed_at = UTCDateTimeField(null=True)
+    expires_at = UTCDateTimeField(null=True)
+    # auto_now would take the local time, every update sets updated_at
+    # through export_jobs.update_export_job
+    created_at = UTCDateTimeField(default=get_utc_now)
+    updated_at = UTCDateTimeField(default=get_utc_now)
+
+    class Meta:
+        tablename = "fm_exportjob"
@@ -0,0 +1,17 @@
+import datetime
+import typing as t
+
+import sqlalchemy
+from edgy import fields
+
+
+class UTCDateTimeField(fields.DateTimeField):
+    """DateTimeField stored as timestamptz, its values converted to UTC"""
+
+    def __new__(cls, **kwargs: t.Any):  # type: ignore
+        kwargs.setdefault("force_timezone", datetime.timezone.utc)
+        return super().__new__(cls, **kwargs)
+
+    @classmethod
+    def get_column_type(cls, **kwargs: t.Any) -> t.Any:
+        return sqlalchemy.DateTime(timezone=True)
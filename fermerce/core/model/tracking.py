@@ -0,0 +1,59 @@
+import copy
+import typing as t
+import weakref
+from dataclasses import dataclass, field
+
+from edgy import Model
+
+MISSING = object()
+
+
+def get_tracked_values(instance: Model, fields: t.Iterable[str]) -> dict[str, t.Any]:
+    """Comparable copy of the field values, foreign keys are reduced to their pk"""
+    values = instance.__dict__
+    snapshot = {}
+    for name in fields:
+        value = values.get(name, MISSING)
+        if isinstance(value, Model):
+            value = value.pk
+        elif isinstance(value, (dict, list)):
+            value = copy.deepcopy(value)
+        snapshot[name] = value
+    return snapshot
+
+
+@dataclass(slots=True)
+class ChangeTracker:
+    """
+    Snapshots of loaded instances keyed by `id(instance)`. A snapshot is
+    dropped together with its instance, so tracking never keeps rows alive.
+    """
+
+    snapshots: dict[int, dict[str, t.Any]] = field(default_factory=dict)
+
+    def track(self, instance: Model, fields: t.Iterable[str]) -> None:
+        key = id(instance)
+        if key not in self.snapshots:
+            weakref.finalize(instance, self.snapshots.pop, key, None)
+        self.snapshots[key] = get_tracked_values(instance, fields)
+
+    def forget(self, instance: Model) -> None:
+        self.snapshots.pop(id(instance), None)
+
+    def is_tracked(self, instance: Model) -> bool:
+        return id(instance) in self.snapshots
+
+    def get_changes(self, instance: Model) -> frozenset[str] | None:
+        """Names of the fields changed since the snapshot, None for untracked instances"""
+        snapshot = self.snapshots.get(id(instance))
+        if snapshot is None:
+            return None
+        current = get_tracked_values(instance, snapshot.keys())
+        return frozenset(
+            name
+            for name, value in current.items()
+            if value is not MISSING and value != snapshot[name]
+        )
+
+
+change_tracker = ChangeTracker()
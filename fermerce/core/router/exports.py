@@ -0,0 +1,23 @@
+import uuid
+
+from esmerald import APIView, get
+from esmerald.responses import StreamingResponse
+
+from fermerce.core.services import export_jobs
+from fermerce.lib.shared.permissions import IsAuthenticated
+from fermerce.lib.utils.base_response import IExportJob
+
+
+class ExportJobAPIView(APIView):
+    tags = ["Export"]
+    path = "/exports"
+    permissions = [IsAuthenticated]
+
+    @get("/{job_id}")
+    async def get_export_job(self, job_id: uuid.UUID) -> IExportJob:
+        """Status and progress of a background export"""
+        return IExportJob.model_validate(await export_jobs.get_export_job(job_id))
+
+    @get("/{job_id}/download")
+    async def download_export(self, job_id: uuid.UUID) -> StreamingResponse:
+        return await export_jobs.download_export(job_id)
@@ -0,0 +1,18 @@
+import os
+
+from esmerald import get
+
+from fermerce.core.services.pool import get_pool_metrics
+from fermerce.core.settings import config
+from fermerce.lib.shared.permissions import IsAuthenticated
+from fermerce.lib.utils.base_response import IDatabaseHealth
+
+
+@get("/health/db", tags=["Health"], permissions=[IsAuthenticated])
+async def database_health() -> IDatabaseHealth:
+    """Pool usage of the worker serving the request, one entry per database"""
+    database, registry = config.database_config
+    databases = {"primary": get_pool_metrics(database)}
+    for name, extra in registry.extra.items():
+        databases[name] = get_pool_metrics(extra)
+    return IDatabaseHealth(worker=os.getpid(), databases=databases)
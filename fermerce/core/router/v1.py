@@ -1,6 +1,14 @@
 from esmerald import Gateway
 
+from fermerce.app.market.catalog.api.v1 import ProductCatalogAPIView
 from fermerce.app.market.category.api.v1 import ProductCategoryAPIView
+from fermerce.core.router.exports import ExportJobAPIView
+from fermerce.core.router.health import database_health
 
 
-route_patterns = [Gateway("/", handler=ProductCategoryAPIView)]
+route_patterns = [
+    Gateway("/", handler=ProductCategoryAPIView),
+    Gateway("/", handler=ProductCatalogAPIView),
+    Gateway("/", handler=ExportJobAPIView),
+    Gateway("/", handler=database_health),
+]
@@ -1,21 +1,58 @@
-import io
 from dataclasses import dataclass
 import orjson
 from typing import List, TypeVar, Generic
+import typing as t
 import uuid
+import sqlalchemy
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import CompileError
 from edgy import Model
 from edgy import QuerySet
 from esmerald.responses import StreamingResponse
 from esmerald import status
 from pydantic import BaseModel
-import openpyxl
+from fermerce.core.model.descriptor import ModelDescriptor, get_descriptor
+from fermerce.core.model.tracking import change_tracker
+from fermerce.core.services.bulk import (
+    BULK_BATCH_SIZE,
+    COPY_BATCH_SIZE,
+    COPY_THRESHOLD,
+    copy_rows,
+    get_row_columns,
+    get_update_batch_size,
+    get_update_expression,
+    iterate_chunks,
+)
+from fermerce.core.services.cache import count_cache, get_variant_key, object_cache
+from fermerce.core.services.conditional import check_modified, is_conditional
+from fermerce.core.services.invalidation import invalidation_bus
+from fermerce.core.services.loader import get_loader
+from fermerce.core.services.routing import pin_primary, replica_router
+from fermerce.core.services.export import (
+    excel_response,
+    export_response,
+    generate_excel,
+    generate_export,
+    iterate_batches,
+)
+from fermerce.core.services.serializer import RowSerializer, get_serializer
 from fermerce.lib.utils.base_response import (
+    BulkReturnEnum,
+    CountStrategyEnum,
+    ExportFormatEnum,
     ICount,
     IFilterList,
     IFilterSingle,
+    PaginationEnum,
     SortEnum,
     get_error_response,
 )
+from fermerce.lib.utils.cursor import (
+    coerce_cursor_value,
+    decode_cursor,
+    encode_cursor,
+    get_keyset_condition,
+)
 
 from typing import List, Optional
 
@@ -26,34 +63,64 @@ ModelType = TypeVar("ModelType", bound=Model)
 class BaseRepository(Generic[ModelType]):
     model: ModelType | None = None
     model_name: str = "Object"
+    count_cache_ttl: float = 30
+    conflict_columns: tuple[str, ...] = ()
+    # seconds get_single results stay cached, 0 disables the cache
+    cache_ttl: float = 0
 
     def make_slug(self, name: str, random_length: int = 10) -> str:
         return f"{name.replace(' ', '-').replace('_', '-')[:30]}-{uuid.uuid4().hex[:random_length if random_length < 16 else 7].lower()}"
 
     @property
-    def get_related(self) -> set[str]:
-        return set(
-            self.model.meta.foreign_key_fields.keys(),
-        )
+    def descriptor(self) -> ModelDescriptor:
+        return get_descriptor(self.model)
 
     @property
-    def get_related_backward(self) -> set[str]:
-        return set(
-            self.model.meta.model_references.keys(),
-        )
+    def get_related(self) -> frozenset[str]:
+        return self.descriptor.related
 
     @property
-    def fields(self) -> set[str]:
-        return set(
-            column
-            for column in self.model.meta.fields.keys()
-            if column not in set.union(self.get_related_backward, self.get_related)
-        )
+    def get_related_backward(self) -> frozenset[str]:
+        return self.descriptor.related_backward
+
+    @property
+    def fields(self) -> frozenset[str]:
+        return self.descriptor.fields
+
+    def track(self, instances: ModelType | List[ModelType] | None):
+        """
+        Snapshot loaded instances so bulk_update only writes what changed. Reads
+        only snapshot when asked with `track=True`, the copy costs every row.
+        """
+        if instances:
+            fields = self.descriptor.writable
+            for instance in instances if isinstance(instances, list) else [instances]:
+                change_tracker.track(instance, fields)
+        return instances
+
+    def load_related(self, query: QuerySet, backward: bool = True) -> QuerySet:
+        descriptor = self.descriptor
+        if descriptor.related:
+            query = query.select_related(list(descriptor.related))
+        if backward and descriptor.prefetch:
+            query = query.prefetch_related(*descriptor.prefetch)
+        return query
 
     @property
     def query(self) -> QuerySet:
         return self.model.query
 
+    def get_query_on(self, replica: str | None) -> QuerySet:
+        """Query served by the named replica, by the primary for None"""
+        if replica is None:
+            return self.model.query
+        return self.model.query.using_with_db(replica)
+
+    @property
+    def read_query(self) -> QuerySet:
+        """Query for reads, served by a replica unless the request already wrote"""
+        return self.get_query_on(replica_router.choose())
+
     async def get_single(
         self,
         object_id: str,
@@ -67,15 +134,23 @@ class BaseRepository(Generic[ModelType]):
             check = {}
         if not check_list:
             check_list = []
-        query = self.query.filter(id=object_id)
+        # arbitrary clauses in check_list have no stable cache key
+        cached = self.cache_ttl > 0 and not object_only and not check_list
+        if cached:
+            variant = get_variant_key(check, load_related)
+            data = await object_cache.get(self.descriptor.tablename, object_id, variant)
+            if data is not None:
+                return IFilterSingle.model_construct(data=data, status=200)
+        # a lagging replica can return the row as it was before a write whose
+        # invalidation already ran, a miss is filled from the primary
+        replica = None if cached else replica_router.choose()
+        query = self.get_query_on(replica).filter(id=object_id)
         if check_list:
             query = query.filter(*check_list)
         if check:
             query = query.filter(**check)
         if load_related:
-            query = query.prefetch_related(
-                *self.get_related, *self.get_related_backward
-            )
+            query = self.load_related(query)
 
         query = query.order_by("-id")
         raw_result = await query.first()
@@ -89,38 +164,126 @@ class BaseRepository(Generic[ModelType]):
             return raw_result
         if object_only:
             return raw_result
-        if load_related:
-            results = await self.to_dict(raw_result=[raw_result])
-            if len(results) > 0:
-                raw_result = results.pop(0)
-        else:
-            raw_result = dict(raw_result)
-        return IFilterSingle(data=raw_result, status=200)
+        raw_result = self.get_serializer(
+            load_related=load_related, load_backward=load_related
+        ).one(raw_result)
+        if cached:
+            await object_cache.set(
+                self.descriptor.tablename,
+                object_id,
+                variant,
+                raw_result,
+                ttl=self.cache_ttl,
+            )
+        return IFilterSingle.model_construct(data=raw_result, status=200)
 
-    async def to_dict(self, raw_result: list[Model]) -> list[dict]:
-        columns = (*self.get_related, *self.get_related_backward)
-        return [
-            {
-                **{
-                    field_name: [
-                        dict(data) for data in list(getattr(result, field_name))
-                    ]
-                    for field_name in self.get_related_backward
-                    if hasattr(result, field_name)
-                },
-                **{
-                    field_name: dict(getattr(result, field_name))
-                    for field_name in self.get_related
-                    if hasattr(result, field_name) and getattr(result, field_name)
-                },
-                **{
-                    attr: getattr(result, attr)
-                    for attr in self.fields
-                    if not attr in columns and not attr.startswith("_")
-                },
-            }
-            for result in raw_result
-        ]
+    def cache_stats(self) -> dict[str, int]:
+        return object_cache.stats()
+
+    def get_serializer(
+        self,
+        select: str = None,
+        load_related: bool = False,
+        load_backward: bool = False,
+    ) -> RowSerializer:
+        return get_serializer(
+            self.model,
+            select=tuple(self.descriptor.get_columns(select)) or None,
+            load_related=load_related,
+            load_backward=load_backward,
+        )
+
+    async def to_dict(
+        self, raw_result: list[Model], load_backward: bool = True
+    ) -> list[dict]:
+        return self.get_serializer(
+            load_related=True, load_backward=load_backward
+        ).many(raw_result)
+
+    def get_cursor_columns(self, order_by: str) -> list[str]:
+        columns = []
+        for col in (order_by or "").split(","):
+            col = col.strip().lstrip("-")
+            if col in self.descriptor.columns and col != "id" and col not in columns:
+                columns.append(col)
+        # id is a uuid7, so it is unique and follows insertion order
+        return [*columns, "id"]
+
+    def get_cursor_values(self, row: ModelType | dict, columns: list[str]) -> list:
+        if isinstance(row, dict):
+            return [row.get(col) for col in columns]
+        return [getattr(row, col, None) for col in columns]
+
+    def paginate_by_cursor(
+        self,
+        query: QuerySet,
+        columns: list[str],
+        sort_by: SortEnum = SortEnum.DESC,
+        cursor: str = None,
+    ) -> tuple[QuerySet, bool]:
+        descending = sort_by != SortEnum.ASC
+        backward = False
+        if cursor:
+            values, backward = decode_cursor(cursor)
+            table_columns = [self.model.table.c[col] for col in columns]
+            if len(values) != len(table_columns):
+                raise get_error_response(
+                    detail="pagination cursor does not match the order_by columns",
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                )
+            try:
+                values = [
+                    coerce_cursor_value(value, column.type.python_type)
+                    for value, column in zip(values, table_columns)
+                ]
+            except (TypeError, ValueError, NotImplementedError):
+                raise get_error_response(
+                    detail="invalid pagination cursor",
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                )
+            greater = descending == backward
+            if any(column.nullable for column in table_columns):
+                query = query.filter(
+                    get_keyset_condition(
+                        table_columns,
+                        [
+                            sqlalchemy.literal(value, type_=column.type)
+                            if value is not None
+                            else None
+                            for value, column in zip(values, table_columns)
+                        ],
+                        greater=greater,
+                        nulls_largest=query.database.url.dialect == "postgresql",
+                    )
+                )
+            else:
+                # one row comparison, which an index on the columns can serve
+                row_key = sqlalchemy.tuple_(*table_columns)
+                cursor_key = sqlalchemy.tuple_(
+                    *(
+                        sqlalchemy.literal(value, type_=column.type)
+                        for value, column in zip(values, table_columns)
+                    )
+                )
+                query = query.filter(
+                    row_key > cursor_key if greater else row_key < cursor_key
+                )
+        # a backward page is read in reverse order and flipped after fetching
+        prefix = "-" if descending != backward else ""
+        return query.order_by(*[f"{prefix}{col}" for col in columns]), backward
+
+    def order_query(
+        self,
+        query: QuerySet,
+        order_by: str = "id",
+        sort_by: SortEnum = SortEnum.DESC,
+    ) -> QuerySet:
+        order_columns = self.descriptor.get_columns((order_by or "").replace("-", ""))
+        if sort_by == SortEnum.ASC and order_columns:
+            return query.order_by(*order_columns)
+        elif sort_by == SortEnum.DESC and order_columns:
+            return query.order_by(*[f"-{col}" for col in order_columns])
+        return query.order_by("-id")
 
     async def filter_and_list(
         self,
@@ -136,10 +299,15 @@ class BaseRepository(Generic[ModelType]):
         object_only: bool = False,
         export_to_excel: bool = False,
         fetch_distinct: bool = False,
+        pagination: PaginationEnum = PaginationEnum.OFFSET,
+        cursor: str = None,
+        count_strategy: CountStrategyEnum = CountStrategyEnum.EXACT,
+        include_total: bool = True,
+        export_format: ExportFormatEnum = None,
     ) -> IFilterList | list[ModelType] | StreamingResponse:
         if not check:
             check = {}
-        query = self.query
+        query = self.read_query
         if check_list:
             query = query.filter(*check_list)
         if check:
@@ -148,63 +316,142 @@ class BaseRepository(Generic[ModelType]):
             query = query.distinct("id")
         if not check or check_list:
             query = query.all()
-
-        if load_related and self.get_related:
-            query = query.prefetch_related(*self.get_related)
-        if sort_by == SortEnum.ASC and order_by:
-            query = query.order_by(
-                *[f"{col.strip()}" for col in order_by.split(",") if col in self.fields]
+        count_query = query
+        if not include_total:
+            count_strategy = CountStrategyEnum.NONE
+        if export_to_excel and not export_format:
+            export_format = ExportFormatEnum.EXCEL
+        if export_format:
+            return self.export_query(
+                self.order_query(query, order_by=order_by, sort_by=sort_by),
+                select=select,
+                export_format=export_format,
             )
-        elif sort_by == SortEnum.DESC:
-            query = query.order_by(
-                *[
-                    f"-{col.strip()}"
-                    for col in order_by.split(",")
-                    if col in self.fields
-                ]
+
+        if load_related:
+            query = self.load_related(query, backward=False)
+        if cursor or pagination == PaginationEnum.CURSOR:
+            return await self.filter_and_list_by_cursor(
+                query=query,
+                per_page=per_page,
+                order_by=order_by,
+                sort_by=sort_by,
+                cursor=cursor,
+                load_related=load_related,
+                total_count=total_count,
+                select=select,
+                object_only=object_only,
+                count_query=count_query,
+                count_strategy=count_strategy,
             )
-        else:
-            query = query.order_by("-id")
+        query = self.order_query(query, order_by=order_by, sort_by=sort_by)
         query = query.offset((page - 1) * per_page).limit(per_page)
-        if select:
-            query = query.values(
-                *[
-                    col.strip()
-                    for col in select.split(",")
-                    if col.strip() in self.fields
-                ]
-            )
         raw_result = await query
         if object_only:
             return raw_result
-        if load_related and raw_result and not select and not export_to_excel:
-            raw_result = await self.to_dict(raw_result=raw_result)
-        else:
-            raw_result = [dict(data) for data in raw_result]
-        if export_to_excel:
-            return self.write_to_excel(models=raw_result, filename=self.model_name)
-        if not total_count:
-            get_count = await self.get_count()
-            total_count = get_count.count if get_count else 0
-        return IFilterList(
+        raw_result = self.get_serializer(
+            select=select, load_related=load_related
+        ).many(raw_result)
+        total_count, count_strategy = await self.get_total_count(
+            query=count_query,
+            total_count=total_count,
+            count_strategy=count_strategy,
+        )
+        # the rows are already plain dicts, validating them again is wasted work
+        return IFilterList.model_construct(
+            data=raw_result,
+            status=200,
+            total_count=total_count,
+            count_strategy=count_strategy,
+        )
+
+    async def filter_and_list_by_cursor(
+        self,
+        query: QuerySet,
+        per_page: int = 10,
+        order_by: str = "id",
+        sort_by: SortEnum = SortEnum.DESC,
+        cursor: str = None,
+        load_related: bool = False,
+        total_count: int = None,
+        select: str = None,
+        object_only: bool = False,
+        count_query: QuerySet = None,
+        count_strategy: CountStrategyEnum = CountStrategyEnum.EXACT,
+    ) -> IFilterList | list[ModelType]:
+        columns = self.get_cursor_columns(order_by)
+        if count_query is None:
+            count_query = query
+        query, backward = self.paginate_by_cursor(
+            query=query,
+            columns=columns,
+            sort_by=sort_by,
+            cursor=cursor,
+        )
+        # one extra row tells us whether there is a page after this one
+        raw_result = list(await query.limit(per_page + 1))
+        has_more = len(raw_result) > per_page
+        raw_result = raw_result[:per_page]
+        if backward:
+            raw_result.reverse()
+        next_cursor = previous_cursor = None
+        if raw_result:
+            if has_more or backward:
+                next_cursor = encode_cursor(
+                    self.get_cursor_values(raw_result[-1], columns)
+                )
+            if (has_more and backward) or (cursor and not backward):
+                previous_cursor = encode_cursor(
+                    self.get_cursor_values(raw_result[0], columns),
+                    backward=True,
+                )
+        if object_only:
+            return raw_result
+        raw_result = self.get_serializer(
+            select=select, load_related=load_related
+        ).many(raw_result)
+        total_count, count_strategy = await self.get_total_count(
+            query=count_query,
+            total_count=total_count,
+            count_strategy=count_strategy,
+        )
+        # the rows are already plain dicts, validating them again is wasted work
+        return IFilterList.model_construct(
             data=raw_result,
             status=200,
             total_count=total_count,
+            count_strategy=count_strategy,
+            next=next_cursor,
+            previous=previous_cursor,
         )
 
+    async def delete_where(self, query: QuerySet) -> int:
+        """Delete the rows matching the filters of `query`, returns their count"""
+        # edgy's QuerySet.delete does not report the deleted row count
+        expression = self.model.table.delete()
+        for clause in query.filter_clauses:
+            expression = expression.where(clause)
+        return await self.model.database.execute(expression)
+
     async def delete_by_ids(self, object_ids: List[int], check: dict = None) -> int:
         if not check:
             check = {}
         query = self.query
         if check:
-            query.filter(**check)
+            query = query.filter(**check)
         query = query.filter(id__in=object_ids)
-        return await query.delete()
+        result = await self.delete_where(query)
+        await self.invalidate(*object_ids)
+        return result
 
     async def delete_by_id(
         self, object_id: int, raise_error: bool = False
     ) -> ModelType:
-        result = await self.query.filter(id=object_id).delete()
+        table = self.model.table
+        result = await self.model.database.execute(
+            table.delete().where(table.c.id == object_id)
+        )
+        await self.invalidate(object_id)
         if result <= 0:
             if raise_error:
                 raise get_error_response(
@@ -215,14 +462,19 @@ class BaseRepository(Generic[ModelType]):
                 return result
         return result
 
-    async def get_by_ids(self, object_ids: List[uuid.UUID]) -> list[ModelType]:
-        return await self.query.filter(id__in=object_ids).all()
+    async def get_by_ids(
+        self, object_ids: List[uuid.UUID], track: bool = False
+    ) -> list[ModelType]:
+        instances = await self.query.filter(id__in=object_ids).all()
+        return self.track(instances) if track else instances
 
-    async def get(self, id: str, raise_error: bool = False) -> Optional[ModelType]:
+    async def get(
+        self, id: str, raise_error: bool = False, track: bool = False
+    ) -> Optional[ModelType]:
         query = self.query.filter(id=id)
         obj = await query.first()
         if obj is not None:
-            return obj
+            return self.track(obj) if track else obj
         if raise_error and not obj:
             raise get_error_response(
                 detail=f"{self.model_name} is not found",
@@ -230,8 +482,52 @@ class BaseRepository(Generic[ModelType]):
             )
         return obj
 
-    async def get_all(self, limit: int = 10, offset: int = 0) -> List[ModelType]:
-        return await self.query.all().offset(offset).limit(limit)
+    async def load(
+        self, id: uuid.UUID | str, track: bool = False
+    ) -> Optional[ModelType]:
+        """
+        Get a row through the request's identity map, concurrent loads are
+        batched into one query
+        """
+        instance = await get_loader().load(self.model, id)
+        if track and instance is not None and not change_tracker.is_tracked(instance):
+            self.track(instance)
+        return instance
+
+    async def load_many(
+        self, object_ids: List[uuid.UUID | str], track: bool = False
+    ) -> list[Optional[ModelType]]:
+        instances = await get_loader().load_many(self.model, object_ids)
+        if not track:
+            return instances
+        self.track(
+            [
+                instance
+                for instance in instances
+                if instance is not None and not change_tracker.is_tracked(instance)
+            ]
+        )
+        return instances
+
+    async def invalidate(self, *object_ids: uuid.UUID | str) -> None:
+        """
+        Drop written rows from the request's identity map and the object cache,
+        and the cached counts of their table, and tell the other workers to do
+        the same
+        """
+        pin_primary()
+        loader = get_loader()
+        for object_id in object_ids:
+            loader.forget(self.model, object_id)
+        count_cache.invalidate(self.descriptor.tablename)
+        await object_cache.invalidate(self.descriptor.tablename, *object_ids)
+        await invalidation_bus.publish(self.descriptor.tablename, *object_ids)
+
+    async def get_all(
+        self, limit: int = 10, offset: int = 0, track: bool = False
+    ) -> List[ModelType]:
+        instances = await self.query.all().offset(offset).limit(limit)
+        return self.track(instances) if track else instances
 
     async def filter_obj(
         self,
@@ -240,15 +536,13 @@ class BaseRepository(Generic[ModelType]):
         check_list: tuple | set | list = (),
         load_related: bool = False,
         raise_error: bool = False,
+        track: bool = False,
     ) -> List[ModelType] | ModelType:
         if not check:
             check = {}
         query = self.query
         if load_related:
-            query = query.prefetch_related(
-                *self.get_related_backward,
-                *self.get_related,
-            )
+            query = self.load_related(query)
         if get_first:
             result = await query.filter(*check_list, **check).first()
         else:
@@ -258,14 +552,14 @@ class BaseRepository(Generic[ModelType]):
                 f"{self.model_name} does not exist",
                 status_code=status.HTTP_404_NOT_FOUND,
             )
-        return result
+        return self.track(result) if track else result
 
     async def get_count(
         self, check: dict = None, check_list: tuple | list | set = ()
     ) -> ICount:
         if not check:
             check = {}
-        query = self.query
+        query = self.read_query
         if check_list:
             query = query.filter(*check_list)
         if check:
@@ -273,6 +567,137 @@ class BaseRepository(Generic[ModelType]):
         result = await query.all().count()
         return ICount(count=result)
 
+    def get_query_signature(self, query: QuerySet) -> tuple:
+        compiled = query._build_select().compile(dialect=postgresql.dialect())
+        return (
+            self.model.meta.tablename,
+            str(compiled),
+            repr(sorted(compiled.params.items())),
+        )
+
+    async def estimate_count(self, query: QuerySet) -> int | None:
+        database = self.model.meta.registry.database
+        if not query.filter_clauses and not query.or_clauses:
+            estimate = await database.fetch_val(
+                sqlalchemy.text(
+                    "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"
+                ).bindparams(table=self.model.meta.tablename)
+            )
+        else:
+            try:
+                statement = str(
+                    query._build_select().compile(
+                        dialect=postgresql.dialect(),
+                        compile_kwargs={"literal_binds": True},
+                    )
+                )
+            except (CompileError, NotImplementedError):
+                return None
+            # text() treats ":name" as a bind parameter, literals may contain colons
+            plan = await database.fetch_val(
+                sqlalchemy.text(
+                    "EXPLAIN (FORMAT JSON) " + statement.replace(":", "\\:")
+                )
+            )
+            if isinstance(plan, (str, bytes)):
+                plan = orjson.loads(plan)
+            estimate = plan[0]["Plan"]["Plan Rows"] if plan else None
+        # reltuples is -1 for tables that were never vacuumed or analyzed
+        if estimate is None or estimate < 0:
+            return None
+        return int(estimate)
+
+    async def get_total_count(
+        self,
+        query: QuerySet,
+        total_count: int = None,
+        count_strategy: CountStrategyEnum = CountStrategyEnum.EXACT,
+    ) -> tuple[int | None, CountStrategyEnum | None]:
+        if total_count is not None:
+            return total_count, None
+        if count_strategy == CountStrategyEnum.NONE:
+            return None, count_strategy
+        if count_strategy == CountStrategyEnum.ESTIMATED:
+            estimate = await self.estimate_count(query)
+            if estimate is not None:
+                return estimate, count_strategy
+            count_strategy = CountStrategyEnum.EXACT
+        if count_strategy == CountStrategyEnum.CACHED:
+            tablename = self.descriptor.tablename
+            key = self.get_query_signature(query)
+            cached = count_cache.get(tablename, key)
+            if cached is not None:
+                return cached, count_strategy
+            total_count = await query.count()
+            count_cache.set(tablename, key, total_count, ttl=self.count_cache_ttl)
+            return total_count, count_strategy
+        return await query.count(), CountStrategyEnum.EXACT
+
+    async def get_version(
+        self, check: dict = None, check_list: tuple | list | set = ()
+    ) -> tuple:
+        """
+        Latest updated_at and count of the rows matching, an insert, update or
+        delete among them changes one or the other
+        """
+        query = self.read_query.all()
+        if check_list:
+            query = query.filter(*check_list)
+        if check:
+            query = query.filter(**check)
+        rows = query._build_select().subquery()
+        version = await query.database.fetch_one(
+            sqlalchemy.select(
+                sqlalchemy.func.max(rows.c.updated_at), sqlalchemy.func.count()
+            ).select_from(rows)
+        )
+        return tuple(version)
+
+    async def check_modified(self, object_id: uuid.UUID | str) -> None:
+        """
+        Answer a conditional GET of one row from its updated_at, raises
+        NotModified when the client's copy is current. Related rows are not
+        part of the version.
+        """
+        if not is_conditional():
+            return
+        if not isinstance(object_id, uuid.UUID):
+            try:
+                object_id = uuid.UUID(object_id)
+            except ValueError:
+                return
+        table = self.model.table
+        updated_at = await self.read_query.database.fetch_val(
+            sqlalchemy.select(table.c.updated_at).where(table.c.id == object_id)
+        )
+        # a missing row is left to the handler to report
+        if updated_at is not None:
+            check_modified(self.descriptor.tablename, updated_at)
+
+    async def check_list_modified(
+        self,
+        check: dict = None,
+        check_list: tuple | list | set = (),
+        count_strategy: CountStrategyEnum = CountStrategyEnum.EXACT,
+        include_total: bool = True,
+    ) -> int | None:
+        """
+        Answer a conditional GET of a list from get_version, see check_modified.
+        Returns the count of matching rows the version holds, pass it on as
+        `total_count` and the version query stands in for the count query.
+        A list without an exact count is not tagged, its version would cost
+        the count the client opted out of.
+        """
+        if (
+            not is_conditional()
+            or not include_total
+            or count_strategy != CountStrategyEnum.EXACT
+        ):
+            return None
+        updated_at, count = await self.get_version(check=check, check_list=check_list)
+        check_modified(self.descriptor.tablename, updated_at, count)
+        return count
+
     async def create(
         self,
         payload: dict | BaseModel,
@@ -284,50 +709,73 @@ class BaseRepository(Generic[ModelType]):
             else payload
         )
 
-        instance = await self.model.create(**data_dict)
+        pin_primary()
+        instance = await self.query.create(**data_dict)
+        count_cache.invalidate(self.descriptor.tablename)
         return dict(instance) if to_dict else instance
 
-    def generate_excel_content(self, payload: List[ModelType | dict | BaseModel]):
-        data: list[dict] = []
-        for model in payload:
-            if isinstance(model, BaseModel) and model:
-                data.append(model.model_dump())
-            elif isinstance(model, Model) and model:
-                data.append(dict(model))
-            else:
-                data.append(model)
-        wb = openpyxl.Workbook()
-        ws = wb.active
-
-        data = orjson.dumps(data)
-        data = orjson.loads(data)
-        ws.title = self.model_name
-        if len(data) > 0:
-            ws.append(tuple(data[0].keys()))
-        for model in data:
-            ws.append(tuple(model.values()))
-        output = io.BytesIO()
-        wb.save(output)
-        output.seek(0)
-
-        yield from output
+    def get_export_columns(self, select: str = None) -> list[str]:
+        # quoted_name is a str subclass, orjson only takes plain str keys
+        return self.descriptor.get_columns(select) or [
+            str(column.name) for column in self.model.table.columns
+        ]
+
+    def get_export_expression(
+        self, query: QuerySet, columns: list[str]
+    ) -> sqlalchemy.Select:
+        table = self.model.table
+        return query._build_select().with_only_columns(
+            *[table.c[column] for column in columns]
+        )
+
+    def export_query(
+        self,
+        query: QuerySet,
+        select: str = None,
+        filename: str = None,
+        export_format: ExportFormatEnum = ExportFormatEnum.EXCEL,
+    ) -> StreamingResponse:
+        """Export every row matching the query, not only the current page"""
+        columns = self.get_export_columns(select)
+        batches = iterate_batches(
+            query.database, self.get_export_expression(query, columns)
+        )
+        return export_response(
+            generate_export(
+                batches,
+                columns=columns,
+                title=self.model_name,
+                export_format=export_format,
+            ),
+            filename=filename or self.model_name,
+            export_format=export_format,
+        )
 
     def write_to_excel(
         self, models: List[ModelType | dict | BaseModel], filename: str
     ) -> StreamingResponse:
-        filename = f"{filename or self.model_name}.xlsx"
-        return StreamingResponse(
-            self.generate_excel_content(models),
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={
-                "Content-Disposition": f"attachment; filename={filename}",
-            },
+        rows = [
+            model.model_dump() if isinstance(model, BaseModel) else model
+            for model in models
+            if model
+        ]
+
+        async def batches():
+            yield rows
+
+        return excel_response(
+            generate_excel(
+                batches(),
+                columns=list(rows[0].keys()) if rows else [],
+                title=self.model_name,
+            ),
+            filename=filename or self.model_name,
         )
 
     async def update(
         self, id: str, payload: BaseModel | dict, check: dict = None
     ) -> ModelType:
-        query = self.get_query.filter(id=id)
+        query = self.query.filter(id=id)
         if check:
             query = query.filter(**check)
         instance = await query.first()
@@ -340,6 +788,7 @@ class BaseRepository(Generic[ModelType]):
         for key, value in item.items():
             setattr(instance, key, value)
         await instance.save()
+        await self.invalidate(id)
         return instance
 
     async def delete(self, id: str, check: dict = None) -> ModelType:
@@ -351,57 +800,234 @@ class BaseRepository(Generic[ModelType]):
             raise_error=True,
         )
         await instance.delete()
+        await self.invalidate(id)
         return instance
 
+    def get_column_names(self, fields: t.Iterable[str]) -> list[str]:
+        field_to_column_names = self.model.meta.field_to_column_names
+        return [
+            column for field in fields for column in field_to_column_names[field]
+        ]
+
+    def get_upsert_expression(
+        self,
+        values: dict,
+        conflict_columns: t.Sequence[str],
+        update_fields: t.Sequence[str] | None = None,
+    ) -> sqlalchemy.Insert:
+        """
+        INSERT ... ON CONFLICT (conflict_columns) DO UPDATE ... RETURNING the row
+        and `created`, true when postgres inserted it: a new row has no xmax.
+
+        `update_fields=None` overwrites every given column of an existing row,
+        an empty `update_fields` keeps it unchanged.
+        """
+        table = self.model.table
+        statement = postgresql.insert(table).values(values)
+        if update_fields is None:
+            update_columns = [
+                column
+                for column in values
+                if column not in conflict_columns and column not in ("id", "created_at")
+            ]
+        else:
+            update_columns = self.get_column_names(update_fields)
+            if update_columns and "updated_at" in values:
+                update_columns.append("updated_at")
+        # a no-op update still locks and returns the existing row, unlike DO NOTHING
+        set_ = {
+            column: statement.excluded[column]
+            for column in update_columns or conflict_columns[:1]
+        }
+        return statement.on_conflict_do_update(
+            index_elements=[table.c[column] for column in conflict_columns],
+            set_=set_,
+        ).returning(
+            *table.columns, sqlalchemy.literal_column("(xmax = 0)").label("created")
+        )
+
+    async def upsert(
+        self,
+        payload: BaseModel | dict,
+        conflict_columns: t.Sequence[str] = None,
+        update_fields: t.Sequence[str] | None = None,
+    ) -> tuple[ModelType, bool]:
+        """
+        Insert the payload or update the row it conflicts with, in one round trip.
+        Returns the row and whether it was created.
+        """
+        data_dict = (
+            payload.model_dump(exclude_unset=True)
+            if isinstance(payload, BaseModel)
+            else payload
+        )
+        conflict_columns = self.get_column_names(
+            conflict_columns or self.conflict_columns
+        )
+        if not conflict_columns:
+            raise ValueError(f"{self.model_name} has no conflict columns to upsert on")
+        pin_primary()
+        query = self.query.all()
+        row = await query.database.fetch_one(
+            self.get_upsert_expression(
+                query._validate_kwargs(**data_dict), conflict_columns, update_fields
+            )
+        )
+        instance, created = self.model.from_sqla_row(row), bool(row._mapping["created"])
+        if created:
+            count_cache.invalidate(self.descriptor.tablename)
+        else:
+            await self.invalidate(instance.pk)
+        return self.track(instance), created
+
     async def get_or_create(
         self,
         payload: BaseModel | dict,
         raise_error: bool = False,
         check: dict = None,
-    ) -> ModelType:
+        conflict_columns: t.Sequence[str] = None,
+    ) -> tuple[ModelType, bool]:
+        """
+        Return the row matching the conflict columns of the payload, creating it
+        when missing, and whether it was created. The conflict columns, given or
+        declared on the repository, must be backed by a unique constraint.
+        """
+        conflict_columns = conflict_columns or self.conflict_columns
+        if not conflict_columns:
+            raise ValueError(
+                f"{self.model_name} declares no conflict_columns, get_or_create "
+                "needs the columns of a unique constraint"
+            )
         data_dict = (
             payload.model_dump(exclude_unset=True)
             if isinstance(payload, BaseModel)
             else payload
         )
-        check = check or {}
-        check_item = await self.get_query.filter(**check).first()
-        if check_item and raise_error:
+        instance, created = await self.upsert(
+            {**data_dict, **(check or {})},
+            conflict_columns=conflict_columns,
+            update_fields=(),
+        )
+        if not created and raise_error:
             raise get_error_response(
                 f"{self.model_name} already exists",
                 status_code=status.HTTP_409_CONFLICT,
             )
-        elif not raise_error and check_item:
-            return check_item
-        check_item = await self.model.create(**data_dict)
-        return check_item
+        return instance, created
 
     async def bulk_create(
         self,
-        instances: List[dict],
-        batch_size: int = 10,
+        instances: List[dict | BaseModel],
+        batch_size: int = BULK_BATCH_SIZE,
+        returning: BulkReturnEnum = BulkReturnEnum.ROWS,
+        use_copy: bool | None = None,
+    ) -> list[ModelType] | list[uuid.UUID] | int:
+        """
+        Insert the instances in batches of `batch_size` rows inside one transaction.
+
+        `use_copy` switches to postgres COPY, by default once there are
+        COPY_THRESHOLD rows or more. `returning` picks what comes back: the
+        created rows, their ids or only the number of rows.
+        """
+        query = self.query.all()
+        table = self.model.table
+        rows = [
+            query._validate_kwargs(
+                **(
+                    instance.model_dump(exclude_unset=True)
+                    if isinstance(instance, BaseModel)
+                    else instance
+                )
+            )
+            for instance in instances
+        ]
+        if not rows:
+            return 0 if returning == BulkReturnEnum.COUNT else []
+        pin_primary()
+        database = query.database
+        if use_copy is None:
+            use_copy = (
+                len(rows) >= COPY_THRESHOLD and database.url.dialect == "postgresql"
+            )
+        columns = get_row_columns(table, rows)
+        rows = [{column: row.get(column) for column in columns} for row in rows]
+        created = []
+        async with database.connection() as connection:
+            async with connection.transaction():
+                if use_copy:
+                    await copy_rows(connection, table, rows)
+                else:
+                    for chunk in iterate_chunks(rows, batch_size):
+                        await connection.execute_many(table.insert(), list(chunk))
+                if returning == BulkReturnEnum.ROWS:
+                    # ids are generated client side, read the rows back by id in
+                    # the same transaction to pick up the server side defaults
+                    for chunk in iterate_chunks(rows, COPY_BATCH_SIZE):
+                        expression = table.select().where(
+                            table.c.id.in_([row["id"] for row in chunk])
+                        )
+                        created.extend(
+                            self.model.from_sqla_row(row)
+                            for row in await connection.fetch_all(expression)
+                        )
+        count_cache.invalidate(self.descriptor.tablename)
+        self.track(created)
+        if returning == BulkReturnEnum.COUNT:
+            return len(rows)
+        if returning == BulkReturnEnum.IDS:
+            return [row["id"] for row in rows]
+        return created
+
+    async def bulk_update(
+        self,
+        instances: List[ModelType],
+        fields: List[str] = None,
+        batch_size: int = BULK_BATCH_SIZE,
     ) -> list[ModelType]:
-        return await self.query.bulk_create(instances)
-
-    async def bulk_update(self, instances: List[ModelType]) -> list[ModelType]:
-        fields = self.fields
-        current_columns = set()
-        if self.get_related:
-            current_columns.update(self.get_related)
-        if self.get_related_backward:
-            current_columns.update(self.get_related_backward)
-        if current_columns:
-            for column in current_columns:
-                if column in fields:
-                    fields.remove(column)
-
-        return await self.query.bulk_update(
-            instances,
-            fields=fields,
-            #     batch_size=10,
-        )
+        """
+        Write the changed columns of the instances with one UPDATE ... FROM (VALUES ...)
+        per set of changed columns. `fields` forces the columns to write, instances
+        not read with `track=True` write every column.
+        """
+        writable = self.descriptor.writable
+        groups: dict[frozenset[str], list[ModelType]] = {}
+        for instance in instances:
+            if fields:
+                changes = writable.intersection(fields)
+            else:
+                changes = change_tracker.get_changes(instance)
+                if changes is None:
+                    changes = writable
+            if changes:
+                groups.setdefault(changes, []).append(instance)
+        if not groups:
+            return []
+        query = self.query.all()
+        table = self.model.table
+        updated = []
+        async with query.database.connection() as connection:
+            async with connection.transaction():
+                for changes, group in groups.items():
+                    # partial update values, with updated_at injected
+                    rows = [
+                        query.extract_column_values(
+                            instance.extract_db_fields({"id", *changes}),
+                            self.model,
+                            is_update=True,
+                            is_partial=True,
+                        )
+                        for instance in group
+                    ]
+                    for chunk in iterate_chunks(
+                        rows, get_update_batch_size(len(rows[0]), batch_size)
+                    ):
+                        await connection.execute(get_update_expression(table, chunk))
+                    updated.extend(group)
+        await self.invalidate(*[instance.pk for instance in updated])
+        return self.track(updated)
 
-    async def bulk_delete(self, objs: List[ModelType]) -> list[ModelType]:
+    async def bulk_delete(self, objs: List[ModelType]) -> int:
         ids = [obj.id for obj in objs]
-        result = await self.get_query.filter(id__in=ids).delete()
-        return objs if result else None
+        result = await self.delete_where(self.query.filter(id__in=ids))
+        await self.invalidate(*ids)
+        return result
@@ -0,0 +1,100 @@
+import enum
+import typing as t
+
+import orjson
+import sqlalchemy
+from databasez.core.connection import Connection
+
+# postgres refuses statements with more bind parameters than this
+POSTGRES_MAX_PARAMETERS = 32767
+BULK_BATCH_SIZE = 1000
+COPY_BATCH_SIZE = 10000
+# below this many rows a batched INSERT is about as fast as COPY
+COPY_THRESHOLD = 5000
+
+
+def iterate_chunks(items: t.Sequence, size: int) -> t.Iterator[t.Sequence]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def get_update_batch_size(columns: int, batch_size: int) -> int:
+    return max(1, min(batch_size, POSTGRES_MAX_PARAMETERS // columns))
+
+
+def get_update_expression(
+    table: sqlalchemy.Table, rows: t.Sequence[dict]
+) -> sqlalchemy.Update:
+    """
+    `UPDATE table SET ... FROM (VALUES ...) AS changes WHERE table.id = changes.id`
+    for rows that all carry the same columns, the id included
+    """
+    columns = list(rows[0])
+    changes = sqlalchemy.values(
+        *[sqlalchemy.column(column, table.c[column].type) for column in columns],
+        name="changes",
+    ).data([tuple(row[column] for column in columns) for row in rows])
+    return (
+        table.update()
+        .where(table.c.id == changes.c.id)
+        .values({column: changes.c[column] for column in columns if column != "id"})
+    )
+
+
+def get_copy_converter(column: sqlalchemy.Column) -> t.Callable[[t.Any], t.Any] | None:
+    """
+    asyncpg encodes COPY records with the binary protocol and has no codec for
+    python objects sqlalchemy would normally adapt, so do that here
+    """
+    if isinstance(column.type, sqlalchemy.JSON):
+        return lambda value: (
+            value if value is None or isinstance(value, str) else orjson.dumps(value).decode()
+        )
+    if isinstance(column.type, sqlalchemy.Enum):
+        # sqlalchemy stores the member name unless told otherwise
+        return lambda value: value.name if isinstance(value, enum.Enum) else value
+    return None
+
+
+def get_copy_records(
+    table: sqlalchemy.Table, columns: t.Sequence[str], rows: t.Sequence[dict]
+) -> list[tuple]:
+    converters = [get_copy_converter(table.c[column]) for column in columns]
+    if not any(converters):
+        return [tuple(row.get(column) for column in columns) for row in rows]
+    return [
+        tuple(
+            convert(row.get(column)) if convert else row.get(column)
+            for column, convert in zip(columns, converters)
+        )
+        for row in rows
+    ]
+
+
+def get_row_columns(table: sqlalchemy.Table, rows: t.Sequence[dict]) -> list[str]:
+    """Table columns present in at least one row, in table order"""
+    present = set().union(*rows) if rows else set()
+    return [column.key for column in table.columns if column.key in present]
+
+
+async def copy_rows(
+    connection: Connection,
+    table: sqlalchemy.Table,
+    rows: t.Sequence[dict],
+    batch_size: int = COPY_BATCH_SIZE,
+) -> int:
+    """
+    Insert the rows with `COPY ... FROM STDIN (FORMAT binary)` on the asyncpg
+    connection behind `connection`. The caller owns the transaction.
+    """
+    columns = get_row_columns(table, rows)
+    raw_connection = await connection.get_raw_connection()
+    driver_connection = raw_connection.driver_connection
+    for chunk in iterate_chunks(rows, batch_size):
+        await driver_connection.copy_records_to_table(
+            table.name,
+            records=get_copy_records(table, columns, chunk),
+            columns=columns,
+            schema_name=table.schema,
+        )
+    return len(rows)
@@ -0,0 +1,127 @@
+import typing as t
+import uuid
+from dataclasses import dataclass, field
+
+import orjson
+
+from fermerce.core.services.serializer import orjson_default
+from fermerce.lib.cache.local import LRUCache
+from fermerce.lib.cache.shared import SharedCache
+
+
+def normalize_id(object_id: t.Any) -> str:
+    """A UUID and its string forms, in either case or without dashes, name one row"""
+    if isinstance(object_id, uuid.UUID):
+        return str(object_id)
+    try:
+        return str(uuid.UUID(str(object_id)))
+    except ValueError:
+        return str(object_id)
+
+
+def get_object_key(tablename: str, object_id: t.Any) -> str:
+    return f"object:{tablename}:{normalize_id(object_id)}"
+
+
+def get_variant_key(check: dict | None, load_related: bool) -> str:
+    """Identify one read of a row: the extra filters and whether relations are loaded"""
+    return orjson.dumps(
+        [sorted((check or {}).items()), load_related], default=str
+    ).decode()
+
+
+@dataclass(slots=True, kw_only=True)
+class ObjectCache:
+    """
+    Read-through cache of serialized rows, an in-process LRU in front of an
+    optional shared backend.
+
+    All the variants of one row live under a single key, so a write drops
+    every cached read of that row at once. They are kept serialized, every
+    hit decodes a copy of its own the caller is free to change.
+    """
+
+    local: LRUCache = field(default_factory=lambda: LRUCache(maxsize=4096, ttl=60))
+    shared: SharedCache | None = None
+    hits: int = 0
+    misses: int = 0
+
+    async def get(self, tablename: str, object_id: t.Any, variant: str) -> dict | None:
+        key = get_object_key(tablename, object_id)
+        variants = self.local.get(key)
+        if variants is None and self.shared is not None:
+            raw = await self.shared.get(key)
+            if raw is not None:
+                variants = {
+                    name: orjson.dumps(data) for name, data in orjson.loads(raw).items()
+                }
+                self.local.set(key, variants)
+        if variants is not None and variant in variants:
+            self.hits += 1
+            return orjson.loads(variants[variant])
+        self.misses += 1
+        return None
+
+    async def set(
+        self,
+        tablename: str,
+        object_id: t.Any,
+        variant: str,
+        data: dict,
+        ttl: float,
+    ) -> None:
+        key = get_object_key(tablename, object_id)
+        variants = {
+            **(self.local.get(key) or {}),
+            variant: orjson.dumps(data, default=orjson_default),
+        }
+        self.local.set(key, variants, ttl=ttl)
+        if self.shared is not None:
+            await self.shared.set(
+                key,
+                orjson.dumps(
+                    {name: orjson.Fragment(value) for name, value in variants.items()}
+                ),
+                ttl,
+            )
+
+    async def invalidate(self, tablename: str, *object_ids: t.Any) -> None:
+        keys = [get_object_key(tablename, object_id) for object_id in object_ids]
+        for key in keys:
+            self.local.delete(key)
+        if keys and self.shared is not None:
+            await self.shared.delete(*keys)
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.local)}
+
+
+@dataclass(slots=True, kw_only=True)
+class CountCache:
+    """
+    Short lived total counts of list queries. Every count is keyed with the
+    generation of its table, a write bumps it so the counts taken before it
+    are never read again and age out of the LRU.
+    """
+
+    local: LRUCache = field(default_factory=lambda: LRUCache(maxsize=2048, ttl=30))
+    generations: dict[str, int] = field(default_factory=dict)
+
+    def get_key(self, tablename: str, signature: t.Hashable) -> tuple:
+        return tablename, self.generations.get(tablename, 0), signature
+
+    def get(self, tablename: str, signature: t.Hashable) -> int | None:
+        return self.local.get(self.get_key(tablename, signature))
+
+    def set(self, tablename: str, signature: t.Hashable, count: int, ttl: float) -> None:
+        self.local.set(self.get_key(tablename, signature), count, ttl=ttl)
+
+    def invalidate(self, tablename: str) -> None:
+        self.generations[tablename] = self.generations.get(tablename, 0) + 1
+
+    def clear(self) -> None:
+        self.local.clear()
+
+
+object_cache = ObjectCache()
+count_cache = CountCache()
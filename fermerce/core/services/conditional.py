@@ -0,0 +1,66 @@
+import hashlib
+import typing as t
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+
+class NotModified(Exception):
+    """The client holds the current representation, answered with a 304"""
+
+    def __init__(self, etag: str) -> None:
+        super().__init__(etag)
+        self.etag = etag
+
+
+def make_etag(variant: bytes, *version: t.Any) -> str:
+    """
+    A weak tag: the version stands for the data, not for the bytes sent,
+    which differ once compressed or when related rows change
+    """
+    digest = hashlib.blake2b(variant, digest_size=16)
+    digest.update(repr(version).encode())
+    return f'W/"{digest.hexdigest()}"'
+
+
+def parse_if_none_match(value: str | None) -> frozenset[str]:
+    # If-None-Match compares weakly, W/"x" matches "x"
+    if not value:
+        return frozenset()
+    return frozenset(tag.strip().removeprefix("W/") for tag in value.split(","))
+
+
+@dataclass(slots=True, kw_only=True)
+class ConditionalRequest:
+    """
+    Validators of a GET request. `variant` tells apart the representations
+    sharing a version, e.g. two pages of the same list.
+    """
+
+    variant: bytes
+    if_none_match: frozenset[str] = frozenset()
+    etag: str | None = None
+
+    def check(self, *version: t.Any) -> None:
+        self.etag = make_etag(self.variant, *version)
+        if "*" in self.if_none_match or self.etag[2:] in self.if_none_match:
+            raise NotModified(self.etag)
+
+
+request_conditional: ContextVar[ConditionalRequest | None] = ContextVar(
+    "request_conditional", default=None
+)
+
+
+def is_conditional() -> bool:
+    """True inside a GET request that can be tagged with an ETag"""
+    return request_conditional.get() is not None
+
+
+def check_modified(*version: t.Any) -> None:
+    """
+    Tag the response of the current request with an ETag derived from
+    `version`, raise NotModified when the client already has it
+    """
+    conditional = request_conditional.get()
+    if conditional is not None:
+        conditional.check(*version)
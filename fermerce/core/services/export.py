@@ -0,0 +1,209 @@
+import asyncio
+import contextlib
+import csv
+import datetime
+import io
+import decimal
+import os
+import tempfile
+import typing as t
+import uuid
+
+import anyio
+import openpyxl
+import orjson
+import sqlalchemy
+from edgy import Database
+from esmerald.responses import StreamingResponse
+from lilya.types import Send
+
+from fermerce.lib.utils.base_response import ExportFormatEnum
+
+EXCEL_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+EXPORT_MEDIA_TYPES = {
+    ExportFormatEnum.EXCEL: (EXCEL_MEDIA_TYPE, "xlsx"),
+    ExportFormatEnum.CSV: ("text/csv; charset=utf-8", "csv"),
+    ExportFormatEnum.NDJSON: ("application/x-ndjson", "ndjson"),
+}
+EXPORT_BATCH_SIZE = 2000
+EXPORT_CHUNK_SIZE = 1024 * 1024
+
+
+async def iterate_batches(
+    database: Database,
+    expression: sqlalchemy.Select,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> t.AsyncIterator[list[t.Mapping[str, t.Any]]]:
+    """Fetch the result of `expression` in batches through a server side cursor"""
+    async with database.connection() as connection:
+        # postgres only keeps a server side cursor open inside a transaction
+        async with connection.transaction():
+            async for batch in connection.batched_iterate(
+                expression, batch_size=batch_size
+            ):
+                yield [row._mapping for row in batch]
+
+
+def excel_value(value: t.Any) -> t.Any:
+    if value is None or isinstance(value, (str, int, float, bool, decimal.Decimal)):
+        return value
+    if isinstance(value, datetime.datetime):
+        # excel does not store timezones
+        if value.tzinfo is not None:
+            value = value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+        return value
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, (dict, list, tuple)):
+        return orjson.dumps(value, default=str).decode()
+    return str(value)
+
+
+def append_excel_rows(
+    sheet: t.Any, columns: t.Sequence[str], batch: t.Sequence[t.Mapping]
+) -> None:
+    for row in batch:
+        sheet.append([excel_value(row.get(column)) for column in columns])
+
+
+async def read_file_chunks(
+    path: str, chunk_size: int = EXPORT_CHUNK_SIZE
+) -> t.AsyncIterator[bytes]:
+    with open(path, "rb") as file:
+        while chunk := await asyncio.to_thread(file.read, chunk_size):
+            yield chunk
+
+
+async def generate_excel(
+    batches: t.AsyncIterator[t.Sequence[t.Mapping]],
+    columns: t.Sequence[str],
+    title: str,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> t.AsyncIterator[bytes]:
+    """
+    Build the workbook with openpyxl's write-only mode, which spools rows to
+    disk as they are appended, then stream the saved file. Memory stays flat
+    whatever the row count.
+    """
+    file_descriptor, path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(file_descriptor)
+    try:
+        workbook = openpyxl.Workbook(write_only=True)
+        sheet = workbook.create_sheet(title=title[:31])
+        sheet.append(list(columns))
+        async for batch in batches:
+            await asyncio.to_thread(append_excel_rows, sheet, columns, batch)
+        await asyncio.to_thread(workbook.save, path)
+        async for chunk in read_file_chunks(path, chunk_size):
+            yield chunk
+    finally:
+        os.remove(path)
+
+
+def json_default(value: t.Any) -> t.Any:
+    # asyncpg returns its own uuid subclass, which orjson does not serialize
+    if isinstance(value, (decimal.Decimal, uuid.UUID)):
+        return str(value)
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    raise TypeError
+
+
+async def generate_ndjson(
+    batches: t.AsyncIterator[t.Sequence[t.Mapping]],
+    columns: t.Sequence[str],
+) -> t.AsyncIterator[bytes]:
+    """One json document per line, encoded by orjson and flushed once per batch"""
+    async for batch in batches:
+        yield b"".join(
+            orjson.dumps(
+                {column: row.get(column) for column in columns},
+                default=json_default,
+                option=orjson.OPT_APPEND_NEWLINE,
+            )
+            for row in batch
+        )
+
+
+def csv_value(value: t.Any) -> t.Any:
+    if value is None:
+        return ""
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (dict, list, tuple)):
+        return orjson.dumps(value, default=str).decode()
+    return value
+
+
+async def generate_csv(
+    batches: t.AsyncIterator[t.Sequence[t.Mapping]],
+    columns: t.Sequence[str],
+) -> t.AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    async for batch in batches:
+        writer.writerows(
+            [csv_value(row.get(column)) for column in columns] for row in batch
+        )
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+async def generate_export(
+    batches: t.AsyncIterator[t.Sequence[t.Mapping]],
+    columns: t.Sequence[str],
+    title: str,
+    export_format: ExportFormatEnum = ExportFormatEnum.EXCEL,
+) -> t.AsyncIterator[bytes]:
+    """
+    Stream the export in `export_format`. When the stream fails or is
+    abandoned by a client that went away, `batches` is closed right here, in
+    the task that opened it, so its cursor and transaction end and the
+    connection goes back to the pool instead of waiting for the garbage
+    collector.
+    """
+    if export_format == ExportFormatEnum.CSV:
+        content = generate_csv(batches, columns)
+    elif export_format == ExportFormatEnum.NDJSON:
+        content = generate_ndjson(batches, columns)
+    else:
+        content = generate_excel(batches, columns, title=title)
+    async with contextlib.aclosing(batches), contextlib.aclosing(content):
+        async for chunk in content:
+            yield chunk
+
+
+class ExportResponse(StreamingResponse):
+    async def stream(self, send: Send) -> None:
+        try:
+            await super().stream(send)
+        finally:
+            # a client going away cancels this task mid stream, shielded the
+            # export still ends its transaction and releases its connection
+            with anyio.CancelScope(shield=True):
+                await self.body_iterator.aclose()
+
+
+def export_response(
+    content: t.AsyncIterator[bytes],
+    filename: str,
+    export_format: ExportFormatEnum = ExportFormatEnum.EXCEL,
+) -> StreamingResponse:
+    media_type, extension = EXPORT_MEDIA_TYPES[export_format]
+    return ExportResponse(
+        content,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}.{extension}",
+        },
+    )
+
+
+def excel_response(content: t.AsyncIterator[bytes], filename: str) -> StreamingResponse:
+    return export_response(content, filename, ExportFormatEnum.EXCEL)
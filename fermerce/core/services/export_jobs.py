@@ -0,0 +1,208 @@
+import asyncio
+import contextlib
+import datetime
+import logging
+import os
+import typing as t
+import uuid
+
+import orjson
+from esmerald import status
+from esmerald.responses import StreamingResponse
+
+from fermerce.core.model.export_job import ExportJob, get_utc_now
+from fermerce.core.services.base import BaseRepository
+from fermerce.core.services.export import (
+    EXPORT_MEDIA_TYPES,
+    export_response,
+    generate_export,
+    iterate_batches,
+    read_file_chunks,
+)
+from fermerce.core.settings import config
+from fermerce.lib.utils.base_response import (
+    ExportFormatEnum,
+    ExportStatusEnum,
+    SortEnum,
+    get_error_response,
+)
+from fermerce.lib.utils.list_endpoint_query_params import QueryTypeWithoutLoadRelated
+
+logger = logging.getLogger(__name__)
+
+
+def get_export_path(job: ExportJob) -> str:
+    _, extension = EXPORT_MEDIA_TYPES[ExportFormatEnum(job.export_format)]
+    return os.path.join(config.export_dir, f"{job.id}.{extension}")
+
+
+async def create_export_job(
+    repository: BaseRepository,
+    params: QueryTypeWithoutLoadRelated,
+    check: dict = None,
+) -> ExportJob:
+    """
+    Record an export of every row of `repository` matching `check`. The
+    filters are stored as json, to be replayed by the task worker.
+    """
+    export_format = params.export_format or ExportFormatEnum.EXCEL
+    filters = dict(
+        check=check or {},
+        select=params.select,
+        order_by=params.order_by,
+        sort_by=params.sort_by.value,
+    )
+    return await ExportJob.query.create(
+        source_model=repository.model.__name__,
+        title=repository.model_name,
+        export_format=export_format.value,
+        filters=orjson.loads(orjson.dumps(filters, default=str)),
+    )
+
+
+async def write_file(path: str, content: t.AsyncIterator[bytes]) -> int:
+    """Write to a temporary name first, a file at `path` is always complete"""
+    partial_path = f"{path}.part"
+    size = 0
+    try:
+        with open(partial_path, "wb") as file:
+            async for chunk in content:
+                size += await asyncio.to_thread(file.write, chunk)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(partial_path)
+        raise
+    os.replace(partial_path, path)
+    return size
+
+
+async def update_export_job(job_id: uuid.UUID, *conditions, **values) -> int:
+    # edgy's QuerySet.update also writes the defaults of the columns left out
+    table = ExportJob.table
+    return await ExportJob.database.execute(
+        table.update()
+        .where(table.c.id == job_id, *conditions)
+        .values(**values, updated_at=get_utc_now())
+    )
+
+
+async def claim_export_job(job_id: uuid.UUID) -> bool:
+    """Move a pending job to running, False when a worker already took it"""
+    claimed = await update_export_job(
+        job_id,
+        ExportJob.table.c.status == ExportStatusEnum.PENDING.value,
+        status=ExportStatusEnum.RUNNING.value,
+    )
+    return claimed > 0
+
+
+async def finish_export_job(
+    job_id: uuid.UUID, status: ExportStatusEnum, **values
+) -> int:
+    """Record the outcome of a job, its file expires `export_ttl` seconds later"""
+    completed_at = get_utc_now()
+    return await update_export_job(
+        job_id,
+        status=status.value,
+        completed_at=completed_at,
+        expires_at=completed_at + datetime.timedelta(seconds=config.export_ttl),
+        **values,
+    )
+
+
+async def write_export(job: ExportJob) -> tuple[str, int]:
+    """Write the rows of a job to its file, the path and size of the file"""
+    model = ExportJob.meta.registry.models[job.source_model]
+    repository = BaseRepository(model=model, model_name=job.title)
+    query = repository.query.filter(**job.filters["check"])
+    columns = repository.get_export_columns(job.filters["select"])
+    await update_export_job(job.id, total_rows=await query.count())
+    expression = repository.get_export_expression(
+        repository.order_query(
+            query,
+            order_by=job.filters["order_by"],
+            sort_by=SortEnum(job.filters["sort_by"]),
+        ),
+        columns,
+    )
+
+    async def batches_with_progress():
+        exported_rows = 0
+        async with contextlib.aclosing(
+            iterate_batches(model.database, expression)
+        ) as batches:
+            async for batch in batches:
+                yield batch
+                exported_rows += len(batch)
+                # connections are per task, a task of its own commits the progress
+                # outside the transaction holding the export cursor open
+                await asyncio.create_task(
+                    update_export_job(job.id, exported_rows=exported_rows)
+                )
+
+    path = get_export_path(job)
+    os.makedirs(config.export_dir, exist_ok=True)
+    size = await write_file(
+        path,
+        generate_export(
+            batches_with_progress(),
+            columns=columns,
+            title=job.title,
+            export_format=ExportFormatEnum(job.export_format),
+        ),
+    )
+    return path, size
+
+
+async def run_export(job_id: str) -> None:
+    job_id = uuid.UUID(job_id)
+    if not await claim_export_job(job_id):
+        return
+    # a claimed job always ends completed or failed, never left running
+    try:
+        path, size = await write_export(await ExportJob.query.get(id=job_id))
+    except Exception as e:
+        logger.exception("export %s failed", job_id)
+        await finish_export_job(job_id, ExportStatusEnum.FAILED, error=str(e))
+        return
+    await finish_export_job(
+        job_id, ExportStatusEnum.COMPLETED, path=path, size=size
+    )
+
+
+async def cleanup_exports() -> int:
+    """Delete the jobs past their expiry along with their files"""
+    expired = await ExportJob.query.filter(expires_at__lt=get_utc_now())
+    for job in expired:
+        if job.path:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(job.path)
+    if expired:
+        await ExportJob.query.filter(id__in=[job.id for job in expired]).delete()
+    return len(expired)
+
+
+async def get_export_job(job_id: str) -> ExportJob:
+    job = await ExportJob.query.get_or_none(id=job_id)
+    if job is None:
+        raise get_error_response(
+            "Export does not exist", status_code=status.HTTP_404_NOT_FOUND
+        )
+    return job
+
+
+async def download_export(job_id: str) -> StreamingResponse:
+    job = await get_export_job(job_id)
+    if job.status != ExportStatusEnum.COMPLETED.value:
+        raise get_error_response(
+            f"Export is {job.status}", status_code=status.HTTP_409_CONFLICT
+        )
+    if not os.path.exists(job.path):
+        raise get_error_response(
+            "Export has expired", status_code=status.HTTP_410_GONE
+        )
+    return export_response(
+        read_file_chunks(job.path),
+        filename=job.title,
+        export_format=ExportFormatEnum(job.export_format),
+    )
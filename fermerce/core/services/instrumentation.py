@@ -0,0 +1,125 @@
+import contextlib
+import re
+import time
+import typing as t
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+import sqlalchemy
+from edgy import Database
+
+_PLACEHOLDER = re.compile(r"\$\d+|%\(\w+\)s|%s|(?<![:\w]):\w+|\?")
+_PLACEHOLDER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(statement: str) -> str:
+    """Shape of a statement: bind parameters and IN lists collapsed, whitespace squeezed"""
+    statement = _PLACEHOLDER.sub("?", statement)
+    statement = _PLACEHOLDER_LIST.sub("?", statement)
+    return _WHITESPACE.sub(" ", statement).strip()
+
+
+@dataclass(slots=True, kw_only=True)
+class QueryStats:
+    """Statements run in one scope, usually a request"""
+
+    count: int = 0
+    duration: float = 0
+    shapes: Counter = field(default_factory=Counter)
+    parent: t.Optional["QueryStats"] = None
+
+    def record(self, statement: str, duration: float) -> None:
+        shape = normalize_sql(statement)
+        stats = self
+        while stats is not None:
+            stats.count += 1
+            stats.duration += duration
+            stats.shapes[shape] += 1
+            stats = stats.parent
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statement shapes run more than `threshold` times, a likely N+1"""
+        return [
+            (shape, count)
+            for shape, count in self.shapes.most_common()
+            if count > threshold
+        ]
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.duration * 1000:.1f};desc="{self.count} queries"'
+
+    def report(self) -> str:
+        lines = [f"{self.count} queries in {self.duration * 1000:.1f}ms"]
+        lines += [f"{count:>5} x {shape}" for shape, count in self.shapes.most_common()]
+        return "\n".join(lines)
+
+
+query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+    if context is not None:
+        context.query_timed = True
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_start"].pop()
+    stats = query_stats.get()
+    if stats is not None:
+        stats.record(statement, time.perf_counter() - started)
+
+
+def handle_error(context: sqlalchemy.engine.ExceptionContext) -> None:
+    # a failed statement never reaches after_cursor_execute, drop its start so
+    # the stack of the connection doesn't grow with every error
+    if getattr(context.execution_context, "query_timed", False):
+        context.connection.info["query_start"].pop()
+
+
+def instrument_database(*databases: Database) -> t.Callable[[], None]:
+    """
+    Startup hook, to run once the databases are connected, recording every
+    statement of their engines into the QueryStats of the current context
+    """
+
+    def instrument() -> None:
+        for database in databases:
+            if database.engine is None:
+                continue
+            engine = database.engine.sync_engine
+            for name, listener in (
+                ("before_cursor_execute", before_cursor_execute),
+                ("after_cursor_execute", after_cursor_execute),
+                ("handle_error", handle_error),
+            ):
+                if not sqlalchemy.event.contains(engine, name, listener):
+                    sqlalchemy.event.listen(engine, name, listener)
+
+    return instrument
+
+
+@contextlib.contextmanager
+def query_budget(max_queries: int, max_repeated: int | None = None):
+    """
+    Test helper failing when the block runs more than `max_queries` statements,
+    or one statement shape more than `max_repeated` times. Requests served in
+    the block by an in-process client are counted too.
+
+        with query_budget(5):
+            await client.get("/api/v1/categories")
+    """
+    stats = QueryStats()
+    token = query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        query_stats.reset(token)
+    if stats.count > max_queries:
+        raise AssertionError(f"query budget of {max_queries} exceeded: {stats.report()}")
+    if max_repeated is not None and stats.repeated(max_repeated):
+        raise AssertionError(
+            f"statements repeated more than {max_repeated} times: {stats.report()}"
+        )
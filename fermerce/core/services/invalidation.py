@@ -0,0 +1,143 @@
+import asyncio
+import logging
+import typing as t
+import uuid
+from dataclasses import dataclass, field
+
+import asyncpg
+import orjson
+import sqlalchemy
+from edgy import Database
+
+from fermerce.core.services.bulk import iterate_chunks
+from fermerce.core.services.cache import count_cache, get_object_key, object_cache
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "fermerce_invalidation"
+# NOTIFY payloads are limited to 8000 bytes, a uuid takes 39 once quoted
+NOTIFY_IDS_PER_MESSAGE = 150
+RECONNECT_DELAY = 5
+# a dead connection raises nothing while idle, e.g. dropped by a NAT or a
+# failover, it is pinged so events are not silently lost
+PING_INTERVAL = 30
+PING_TIMEOUT = 10
+
+InvalidationHandler = t.Callable[[str, list[str]], None]
+
+
+def evict_objects(tablename: str, object_ids: list[str]) -> None:
+    count_cache.invalidate(tablename)
+    for object_id in object_ids:
+        object_cache.local.delete(get_object_key(tablename, object_id))
+
+
+@dataclass(slots=True, kw_only=True)
+class InvalidationBus:
+    """
+    Broadcast `(table, ids)` write events between workers with postgres
+    LISTEN/NOTIFY, so every worker can drop its in-process copies.
+
+    Notifications sent inside a transaction are delivered on commit and
+    dropped on rollback. A worker ignores its own events, it already
+    evicted locally when it wrote.
+    """
+
+    channel: str = INVALIDATION_CHANNEL
+    worker_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    handlers: list[InvalidationHandler] = field(default_factory=lambda: [evict_objects])
+    database: Database | None = None
+    received: int = 0
+    _task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def subscribe(self, handler: InvalidationHandler) -> None:
+        self.handlers.append(handler)
+
+    async def publish(self, tablename: str, *object_ids: t.Any) -> None:
+        if not self.running or not object_ids:
+            return
+        object_ids = [str(object_id) for object_id in object_ids]
+        for chunk in iterate_chunks(object_ids, NOTIFY_IDS_PER_MESSAGE):
+            payload = orjson.dumps({"w": self.worker_id, "t": tablename, "i": chunk})
+            await self.database.execute(
+                sqlalchemy.select(
+                    sqlalchemy.func.pg_notify(self.channel, payload.decode())
+                )
+            )
+
+    def dispatch(self, payload: str) -> None:
+        message = orjson.loads(payload)
+        if message["w"] == self.worker_id:
+            return
+        self.received += 1
+        for handler in self.handlers:
+            try:
+                handler(message["t"], message["i"])
+            except Exception:
+                logger.exception("invalidation handler failed")
+
+    async def listen(self) -> None:
+        dsn = (
+            sqlalchemy.make_url(str(self.database.url))
+            .set(drivername="postgresql")
+            .render_as_string(hide_password=False)
+        )
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(dsn)
+                closed = asyncio.Event()
+                connection.add_termination_listener(lambda _: closed.set())
+                await connection.add_listener(
+                    self.channel, lambda *args: self.dispatch(args[-1])
+                )
+                # events sent while disconnected are lost, start from a clean slate
+                object_cache.local.clear()
+                count_cache.clear()
+                while not closed.is_set():
+                    try:
+                        await asyncio.wait_for(closed.wait(), PING_INTERVAL)
+                    except TimeoutError:
+                        await asyncio.wait_for(
+                            connection.fetchval("SELECT 1"), PING_TIMEOUT
+                        )
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("invalidation listener disconnected")
+            finally:
+                # a graceful close can hang on a dead connection
+                if connection is not None and not connection.is_closed():
+                    connection.terminate()
+            await asyncio.sleep(RECONNECT_DELAY)
+
+    async def start(self, database: Database) -> None:
+        if database.url.dialect != "postgresql" or self.running:
+            return
+        self.database = database
+        self._task = asyncio.create_task(self.listen())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+invalidation_bus = InvalidationBus()
+
+
+def start_invalidation_listener(database: Database) -> t.Callable[[], t.Awaitable[None]]:
+    """Startup hook running this worker's invalidation listener"""
+
+    async def start() -> None:
+        await invalidation_bus.start(database)
+
+    return start
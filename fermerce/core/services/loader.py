@@ -0,0 +1,112 @@
+import asyncio
+import typing as t
+import uuid
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+import sqlalchemy
+from edgy import Model
+
+from fermerce.core.services.cache import normalize_id
+
+ModelType = t.TypeVar("ModelType", bound=Model)
+
+
+def is_valid_id(model: type[Model], object_id: str) -> bool:
+    """False for an id no row can have, a uuid key given something else"""
+    if not isinstance(model.table.c.id.type, sqlalchemy.Uuid):
+        return True
+    try:
+        uuid.UUID(object_id)
+    except ValueError:
+        return False
+    return True
+
+
+@dataclass(slots=True)
+class DataLoader:
+    """
+    Request scoped identity map with batched primary key loading.
+
+    Every `load` issued in the same event loop tick is coalesced into one
+    `id__in` query per model, and a row loaded once is returned from the
+    identity map for the rest of the request.
+    """
+
+    identity_map: dict[tuple[type[Model], str], Model | None] = field(
+        default_factory=dict
+    )
+    pending: dict[type[Model], dict[str, asyncio.Future]] = field(
+        default_factory=dict
+    )
+    # the loop only keeps weak references to tasks, a running fetch is held here
+    tasks: set[asyncio.Task] = field(default_factory=set)
+    queries: int = 0
+
+    def get_cached(self, model: type[ModelType], pk: t.Any) -> ModelType | None:
+        return self.identity_map.get((model, normalize_id(pk)))
+
+    def add(self, instance: Model) -> None:
+        self.identity_map[(type(instance), normalize_id(instance.pk))] = instance
+
+    def forget(self, model: type[Model], pk: t.Any) -> None:
+        self.identity_map.pop((model, normalize_id(pk)), None)
+
+    def clear(self) -> None:
+        self.identity_map.clear()
+
+    async def load(self, model: type[ModelType], pk: t.Any) -> ModelType | None:
+        key = (model, normalize_id(pk))
+        if key in self.identity_map:
+            return self.identity_map[key]
+        # a malformed id would fail the query of the whole batch, it names no row
+        if not is_valid_id(model, key[1]):
+            return None
+        pending = self.pending.get(model)
+        if pending is None:
+            pending = self.pending[model] = {}
+            asyncio.get_running_loop().call_soon(self.dispatch, model)
+        if key[1] not in pending:
+            pending[key[1]] = asyncio.get_running_loop().create_future()
+        return await pending[key[1]]
+
+    async def load_many(
+        self, model: type[ModelType], pks: t.Iterable[t.Any]
+    ) -> list[ModelType | None]:
+        return list(await asyncio.gather(*(self.load(model, pk) for pk in pks)))
+
+    def dispatch(self, model: type[Model]) -> None:
+        pending = self.pending.pop(model, {})
+        if pending:
+            task = asyncio.get_running_loop().create_task(self.fetch(model, pending))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    async def fetch(
+        self, model: type[Model], pending: dict[str, asyncio.Future]
+    ) -> None:
+        self.queries += 1
+        try:
+            rows = await model.query.filter(id__in=list(pending)).all()
+        except Exception as error:
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(error)
+            return
+        found = {normalize_id(row.pk): row for row in rows}
+        for key, future in pending.items():
+            instance = found.get(key)
+            self.identity_map[(model, key)] = instance
+            if not future.done():
+                future.set_result(instance)
+
+
+request_loader: ContextVar[DataLoader | None] = ContextVar(
+    "request_loader", default=None
+)
+
+
+def get_loader() -> DataLoader:
+    """Loader of the current request, outside a request a new one that caches nothing shared"""
+    loader = request_loader.get()
+    return loader if loader is not None else DataLoader()
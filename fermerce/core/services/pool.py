@@ -0,0 +1,65 @@
+import time
+from dataclasses import dataclass
+
+from edgy import Database
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+@dataclass(slots=True)
+class PoolStats:
+    checkouts: int = 0
+    timeouts: int = 0
+    wait_total: float = 0
+    wait_max: float = 0
+
+    def record(self, wait: float) -> None:
+        self.checkouts += 1
+        self.wait_total += wait
+        self.wait_max = max(self.wait_max, wait)
+
+
+class MeasuredQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool timing how long every checkout waited for a connection"""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.stats.timeouts += 1
+            raise
+        finally:
+            self.stats.record(time.perf_counter() - started)
+
+
+def get_pool_metrics(database: Database) -> dict:
+    engine = database.engine
+    if engine is None:
+        return {"connected": False}
+    pool = engine.sync_engine.pool
+    metrics = {"connected": True, "pool": type(pool).__name__}
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        metrics.update(
+            size=pool.size(),
+            max_overflow=pool._max_overflow,
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+            timeout=pool.timeout(),
+        )
+    stats = getattr(pool, "stats", None)
+    if stats is not None:
+        metrics.update(
+            checkouts=stats.checkouts,
+            acquire_timeouts=stats.timeouts,
+            wait_avg_ms=round(stats.wait_total / stats.checkouts * 1000, 3)
+            if stats.checkouts
+            else 0,
+            wait_max_ms=round(stats.wait_max * 1000, 3),
+        )
+    return metrics
@@ -0,0 +1,283 @@
+import asyncio
+import fcntl
+import logging
+import os
+import time
+import typing as t
+from dataclasses import dataclass, field
+
+import sqlalchemy
+from edgy import Model
+
+from fermerce.app.market.country.models import Country
+from fermerce.app.market.delivery_mode.models import DeliveryMode
+from fermerce.app.market.measuring_unit.models import MeasuringUnit
+from fermerce.app.market.state.models import State
+from fermerce.app.market.status.models import Status
+from fermerce.core.services.invalidation import invalidation_bus
+from fermerce.lib.cache.snapshot import (
+    MappedSnapshot,
+    MappedTable,
+    SnapshotTable,
+    get_value_kind,
+    write_snapshot,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_name(name: str | None) -> str:
+    return " ".join((name or "").split()).casefold()
+
+
+def get_python_type(column: sqlalchemy.Column) -> type | None:
+    try:
+        return column.type.python_type
+    except NotImplementedError:
+        return None
+
+
+@dataclass(slots=True, frozen=True)
+class ReferenceSnapshot:
+    version: int
+    loaded_at: float
+    by_id: dict[str, Model]
+    by_name: dict[str, Model]
+
+
+@dataclass(slots=True, kw_only=True)
+class ReferenceData:
+    """
+    In-process copies of small tables that rarely change, looked up by id or
+    by normalized name without a database round trip.
+
+    A table is replaced by a new snapshot, with a new version, after a write
+    through `changed`, on another worker's write event and every `interval`
+    seconds. Tables are loaded on first use outside the app, e.g. in a task
+    worker. Rows are shared between requests, treat them as read only.
+
+    With a `snapshot_path` the workers of a host share one snapshot file
+    instead of a copy each. The worker holding the file's lock reloads it on
+    the timer, any worker rewrites it after its own writes; the others map
+    the new file on their next lookup, at most `check_interval` seconds later
+    or right away on a write event.
+    """
+
+    interval: float = 300
+    version: int = 0
+    # tablename -> model and the field indexed as its name
+    models: dict[str, tuple[type[Model], str]] = field(default_factory=dict)
+    snapshots: dict[str, ReferenceSnapshot] = field(default_factory=dict)
+    stale: set[str] = field(default_factory=set)
+    snapshot_path: str | None = None
+    check_interval: float = 1
+    mapped: MappedSnapshot | None = None
+    # models built from rows of the mapped snapshot, by row and by id looked
+    # up, dropped with it
+    decoded: dict[tuple[str, int], Model] = field(default_factory=dict)
+    decoded_ids: dict[tuple[str, str], Model] = field(default_factory=dict)
+    _checked_at: float = 0
+    _lock: t.IO | None = None
+    _task: asyncio.Task | None = None
+
+    def register(self, model: type[Model], name_field: str = "name") -> None:
+        self.models[model.meta.tablename] = (model, name_field)
+
+    async def load(self, tablename: str) -> ReferenceSnapshot:
+        model, name_field = self.models[tablename]
+        rows = await model.query.order_by("id").all()
+        by_name = {}
+        # names are not unique everywhere, the oldest row wins
+        for row in rows:
+            by_name.setdefault(normalize_name(getattr(row, name_field)), row)
+        self.version += 1
+        snapshot = ReferenceSnapshot(
+            version=self.version,
+            loaded_at=time.monotonic(),
+            by_id={str(row.id): row for row in rows},
+            by_name=by_name,
+        )
+        self.snapshots[tablename] = snapshot
+        self.stale.discard(tablename)
+        return snapshot
+
+    async def get_snapshot(self, model: type[Model]) -> ReferenceSnapshot:
+        tablename = model.meta.tablename
+        snapshot = self.snapshots.get(tablename)
+        if snapshot is None or tablename in self.stale:
+            snapshot = await self.load(tablename)
+        return snapshot
+
+    async def read_table(self, tablename: str) -> SnapshotTable:
+        model, name_field = self.models[tablename]
+        table = model.table
+        rows = await model.database.fetch_all(
+            sqlalchemy.select(table).order_by(table.c.id)
+        )
+        return SnapshotTable(
+            columns=tuple(table.columns.keys()),
+            kinds=tuple(
+                get_value_kind(get_python_type(column)) for column in table.columns
+            ),
+            rows=[tuple(row) for row in rows],
+            names=[normalize_name(row._mapping[name_field]) for row in rows],
+        )
+
+    async def publish(self) -> MappedSnapshot:
+        """Reload every table into a new shared snapshot"""
+        tables = {
+            tablename: await self.read_table(tablename) for tablename in self.models
+        }
+        await asyncio.to_thread(
+            write_snapshot, self.snapshot_path, time.time_ns(), tables
+        )
+        return self.remap()
+
+    def remap(self) -> MappedSnapshot:
+        """Map the current snapshot file if it was replaced since the last check"""
+        self._checked_at = time.monotonic()
+        self.stale.clear()
+        inode = os.stat(self.snapshot_path).st_ino
+        if self.mapped is None or self.mapped.inode != inode:
+            self.mapped = MappedSnapshot.open(self.snapshot_path)
+            self.version = self.mapped.version
+            self.decoded = {}
+            self.decoded_ids = {}
+        return self.mapped
+
+    async def get_mapped(self, model: type[Model]) -> MappedTable:
+        if self.mapped is None and not os.path.exists(self.snapshot_path):
+            await self.publish()
+        elif (
+            self.mapped is None
+            or self.stale
+            or time.monotonic() - self._checked_at > self.check_interval
+        ):
+            self.remap()
+        return self.mapped.tables[model.meta.tablename]
+
+    def is_publisher(self) -> bool:
+        """Whether this worker holds the lock of the shared snapshot"""
+        if self._lock is None:
+            lock = open(f"{self.snapshot_path}.lock", "a")
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                lock.close()
+                return False
+            self._lock = lock
+        return True
+
+    def to_model(
+        self, model: type[Model], table: MappedTable, index: int | None
+    ) -> Model | None:
+        if index is None:
+            return None
+        key = (model.meta.tablename, index)
+        instance = self.decoded.get(key)
+        if instance is None:
+            instance = self.decoded[key] = model(**table.row(index).as_dict())
+        return instance
+
+    async def get(self, model: type[Model], object_id: t.Any) -> Model | None:
+        if self.snapshot_path is not None:
+            table = await self.get_mapped(model)
+            key = (model.meta.tablename, str(object_id))
+            instance = self.decoded_ids.get(key)
+            if instance is None:
+                instance = self.to_model(model, table, table.find(object_id))
+                if instance is not None:
+                    self.decoded_ids[key] = instance
+            return instance
+        return (await self.get_snapshot(model)).by_id.get(str(object_id))
+
+    async def get_by_name(self, model: type[Model], name: str) -> Model | None:
+        if self.snapshot_path is not None:
+            table = await self.get_mapped(model)
+            return self.to_model(model, table, table.find_name(normalize_name(name)))
+        return (await self.get_snapshot(model)).by_name.get(normalize_name(name))
+
+    async def get_or_create(self, model: type[Model], name: str) -> Model:
+        instance = await self.get_by_name(model, name)
+        if instance is None:
+            _, name_field = self.models[model.meta.tablename]
+            instance, _ = await model.query.get_or_create(
+                defaults={}, **{name_field: name}
+            )
+            await self.changed(model, instance.id)
+        return instance
+
+    async def changed(self, model: type[Model], *object_ids: t.Any) -> None:
+        """Reload `model` after a write, the other workers reload it on the event"""
+        if self.snapshot_path is not None:
+            await self.publish()
+        else:
+            await self.load(model.meta.tablename)
+        await invalidation_bus.publish(model.meta.tablename, *object_ids)
+
+    def invalidate(self, tablename: str, object_ids: list[str]) -> None:
+        if tablename in self.models:
+            self.stale.add(tablename)
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            if self.snapshot_path is not None:
+                try:
+                    if self.is_publisher():
+                        await self.publish()
+                except Exception:
+                    logger.exception("reference data snapshot refresh failed")
+                continue
+            for tablename in list(self.models):
+                try:
+                    await self.load(tablename)
+                except Exception:
+                    logger.exception("reference data refresh of %s failed", tablename)
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        if self.snapshot_path is None:
+            for tablename in self.models:
+                await self.load(tablename)
+        elif self.is_publisher() or not os.path.exists(self.snapshot_path):
+            await self.publish()
+        else:
+            self.remap()
+        invalidation_bus.subscribe(self.invalidate)
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        if self._lock is not None:
+            self._lock.close()
+            self._lock = None
+
+
+reference_data = ReferenceData()
+reference_data.register(Country)
+reference_data.register(State)
+reference_data.register(Status)
+reference_data.register(DeliveryMode)
+reference_data.register(MeasuringUnit, name_field="unit")
+
+
+def load_reference_data(
+    interval: float, snapshot_path: str | None = None
+) -> t.Callable[[], t.Awaitable[None]]:
+    """Startup hook loading the reference tables of this worker and refreshing them"""
+
+    async def start() -> None:
+        reference_data.interval = interval
+        reference_data.snapshot_path = snapshot_path
+        await reference_data.start()
+
+    return start
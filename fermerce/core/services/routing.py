@@ -0,0 +1,154 @@
+import asyncio
+import contextlib
+import itertools
+import logging
+import time
+import typing as t
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+
+import sqlalchemy
+from edgy import Registry
+
+logger = logging.getLogger(__name__)
+
+REPLICA_PREFIX = "replica"
+# seconds behind the primary, NULL when the replica is not streaming from it:
+# replayed everything received counts as 0 only while the wal receiver is up,
+# a stalled receiver has nothing left to replay either
+REPLICA_LAG_QUERY = sqlalchemy.text(
+    "SELECT CASE "
+    "WHEN NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') "
+    "THEN NULL "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+# set once the current request wrote, its later reads must see the write
+primary_pinned: ContextVar[bool] = ContextVar("primary_pinned", default=False)
+
+
+def pin_primary() -> Token[bool]:
+    """Send the reads to the primary until the enclosing primary_scope ends"""
+    return primary_pinned.set(True)
+
+
+@contextlib.contextmanager
+def primary_scope(pinned: bool = False) -> t.Iterator[None]:
+    """Scope of the pins set inside, e.g. a request, reads start from `pinned`"""
+    token = primary_pinned.set(pinned)
+    try:
+        yield
+    finally:
+        primary_pinned.reset(token)
+
+
+def get_replica_name(index: int) -> str:
+    return f"{REPLICA_PREFIX}{index}"
+
+
+@dataclass(slots=True, kw_only=True)
+class ReplicaRouter:
+    """
+    Pick the registry connection serving a read: a replica, round robin, as
+    long as its lag is within `max_lag` seconds, otherwise the primary.
+
+    Lag is measured by a background task every `check_interval` seconds, a
+    replica that cannot be reached counts as lagging.
+    """
+
+    max_lag: float = 5
+    check_interval: float = 10
+    lag: dict[str, float] = field(default_factory=dict)
+    checked_at: float = 0
+    _healthy: tuple[str, ...] = ()
+    _cycle: t.Iterator[str] = field(default_factory=lambda: iter(()))
+    _task: asyncio.Task | None = None
+
+    def choose(self) -> str | None:
+        """Name of the extra connection to read from, None for the primary"""
+        if primary_pinned.get() or not self._healthy:
+            return None
+        if time.monotonic() - self.checked_at > self.check_interval * 3:
+            # the monitor stopped reporting, do not trust old measurements
+            return None
+        return next(self._cycle)
+
+    def update(self, lag: dict[str, float]) -> None:
+        self.lag = lag
+        self.checked_at = time.monotonic()
+        healthy = tuple(name for name, value in lag.items() if value <= self.max_lag)
+        if healthy != self._healthy:
+            self._healthy = healthy
+            self._cycle = itertools.cycle(healthy)
+
+    async def measure(self, registry: Registry) -> dict[str, float]:
+        async def measure_one(name: str) -> float:
+            try:
+                lag = await registry.extra[name].fetch_val(REPLICA_LAG_QUERY)
+            except Exception:
+                logger.exception("could not measure the lag of %s", name)
+                return float("inf")
+            if lag is None:
+                logger.warning("%s is not streaming from the primary", name)
+                return float("inf")
+            return float(lag)
+
+        names = [name for name in registry.extra if name.startswith(REPLICA_PREFIX)]
+        values = await asyncio.gather(*(measure_one(name) for name in names))
+        return dict(zip(names, values))
+
+    async def monitor(self, registry: Registry) -> None:
+        while True:
+            self.update(await self.measure(registry))
+            await asyncio.sleep(self.check_interval)
+
+    async def start(self, registry: Registry) -> None:
+        replicas = [
+            database
+            for name, database in registry.extra.items()
+            if name.startswith(REPLICA_PREFIX)
+        ]
+        if not replicas or self._task is not None:
+            return
+        for database in replicas:
+            await database.connect()
+        self.update(await self.measure(registry))
+        self._task = asyncio.create_task(self.monitor(registry))
+
+    async def stop(self, registry: Registry) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self.update({})
+        for name, database in registry.extra.items():
+            if name.startswith(REPLICA_PREFIX):
+                await database.disconnect()
+
+
+replica_router = ReplicaRouter()
+
+
+def start_replica_router(
+    registry: Registry, max_lag: float, check_interval: float
+) -> t.Callable[[], t.Awaitable[None]]:
+    """Startup hook connecting the replicas of the registry and monitoring their lag"""
+
+    async def start() -> None:
+        replica_router.max_lag = max_lag
+        replica_router.check_interval = check_interval
+        await replica_router.start(registry)
+
+    return start
+
+
+def stop_replica_router(registry: Registry) -> t.Callable[[], t.Awaitable[None]]:
+    async def stop() -> None:
+        await replica_router.stop(registry)
+
+    return stop
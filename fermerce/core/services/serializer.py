@@ -0,0 +1,106 @@
+import datetime
+import decimal
+import typing as t
+import uuid
+from dataclasses import dataclass
+from functools import lru_cache
+
+import orjson
+from edgy import Model
+
+from fermerce.core.model.descriptor import get_descriptor, get_prefetch_attribute
+
+
+def orjson_default(value: t.Any) -> t.Any:
+    # orjson only takes the exact UUID and datetime types, asyncpg returns ids
+    # as a subclass of UUID
+    if isinstance(value, (decimal.Decimal, uuid.UUID)):
+        return str(value)
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, Model):
+        return get_serializer(type(value)).one(value)
+    raise TypeError
+
+
+@dataclass(slots=True, frozen=True)
+class RowSerializer:
+    """
+    Serializer generated for one model and one projection.
+
+    The row function is compiled from source once, so serializing a row is a
+    single dict display with direct attribute reads, no per field checks.
+    """
+
+    model: type[Model]
+    fields: tuple[str, ...]
+    serialize: t.Callable[[Model], dict]
+
+    def one(self, row: Model) -> dict:
+        return self.serialize(row)
+
+    def many(self, rows: t.Iterable[Model]) -> list[dict]:
+        serialize = self.serialize
+        return [serialize(row) for row in rows]
+
+    def dumps(self, rows: Model | t.Iterable[Model]) -> bytes:
+        data = self.serialize(rows) if isinstance(rows, Model) else self.many(rows)
+        return orjson.dumps(data, default=orjson_default)
+
+
+def _related_model(model: type[Model], name: str) -> type[Model]:
+    field = model.meta.fields[name]
+    return getattr(field, "related_from", None) or field.target
+
+
+def compile_serializer(
+    model: type[Model],
+    fields: tuple[str, ...],
+    related: tuple[str, ...] = (),
+    related_ids: tuple[str, ...] = (),
+    backward: tuple[str, ...] = (),
+) -> RowSerializer:
+    namespace: dict[str, t.Any] = {}
+    lines = ["def serialize(row):", "    values = row.__dict__", "    data = {"]
+    lines += [f"        {name!r}: values.get({name!r})," for name in fields]
+    lines.append("    }")
+    for name in related_ids:
+        lines.append(f"    value = values.get({name!r})")
+        lines.append(f"    data[{name!r}] = value.pk if value is not None else None")
+    for name in related:
+        namespace[f"related_{name}"] = get_serializer(_related_model(model, name)).serialize
+        lines.append(f"    value = values.get({name!r})")
+        lines.append(f"    data[{name!r}] = related_{name}(value) if value is not None else None")
+    for name in backward:
+        namespace[f"backward_{name}"] = get_serializer(_related_model(model, name)).serialize
+        lines.append(f"    value = getattr(row, {get_prefetch_attribute(name)!r}, None)")
+        lines.append("    if value is not None:")
+        lines.append(f"        data[{name!r}] = [backward_{name}(item) for item in value]")
+    lines.append("    return data")
+    exec(compile("\n".join(lines), f"<serializer {model.__name__}>", "exec"), namespace)
+    return RowSerializer(model, fields, namespace["serialize"])
+
+
+@lru_cache(maxsize=512)
+def get_serializer(
+    model: type[Model],
+    select: tuple[str, ...] | None = None,
+    load_related: bool = False,
+    load_backward: bool = False,
+) -> RowSerializer:
+    """
+    Cached serializer for a model projection: `select` limits the plain columns,
+    `load_related` nests the foreign keys instead of returning their ids and
+    `load_backward` adds the prefetched reverse relations.
+    """
+    descriptor = get_descriptor(model)
+    if select:
+        return compile_serializer(model, fields=tuple(select))
+    related = tuple(sorted(descriptor.related))
+    return compile_serializer(
+        model,
+        fields=tuple(sorted(descriptor.fields)),
+        related=related if load_related else (),
+        related_ids=() if load_related else related,
+        backward=tuple(sorted(descriptor.related_backward)) if load_backward else (),
+    )
@@ -0,0 +1,47 @@
+import time
+import typing as t
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+
+_MISSING = object()
+
+
+@dataclass(slots=True, kw_only=True)
+class LRUCache:
+    """In-process LRU cache where every entry also expires after `ttl` seconds"""
+
+    maxsize: int = 1024
+    ttl: float = 30
+    hits: int = 0
+    misses: int = 0
+    _entries: OrderedDict = field(default_factory=OrderedDict)
+
+    def get(self, key: t.Hashable, default: t.Any = None) -> t.Any:
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: t.Hashable, value: t.Any, ttl: float = None) -> None:
+        self._entries[key] = (time.monotonic() + (ttl or self.ttl), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: t.Hashable) -> bool:
+        return self._entries.pop(key, _MISSING) is not _MISSING
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
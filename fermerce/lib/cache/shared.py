@@ -0,0 +1,43 @@
+import time
+import typing as t
+from dataclasses import dataclass, field
+
+
+class SharedCache(t.Protocol):
+    """Cache shared by every worker, values are stored serialized"""
+
+    async def get(self, key: str) -> bytes | None:
+        ...
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        ...
+
+    async def delete(self, *keys: str) -> None:
+        ...
+
+
+@dataclass(slots=True, kw_only=True)
+class LocalSharedCache:
+    """
+    In-process stand-in for a shared backend such as redis, for development and
+    single worker deployments. Values go through the same bytes round trip.
+    """
+
+    _entries: dict[str, tuple[float, bytes]] = field(default_factory=dict)
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
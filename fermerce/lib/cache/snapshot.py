@@ -0,0 +1,282 @@
+import bisect
+import datetime
+import decimal
+import mmap
+import os
+import struct
+import typing as t
+import uuid
+from dataclasses import dataclass
+
+import orjson
+
+MAGIC = b"FMSNAP01"
+# magic, version, length of the json directory that follows. Offsets are
+# native unsigned ints, a snapshot is only shared between processes of a host
+HEADER = struct.Struct("<8sQI")
+ALIGNMENT = 8
+# values json does not keep the type of, stored as strings and decoded by kind
+VALUE_KINDS = {
+    uuid.UUID: "uuid",
+    decimal.Decimal: "decimal",
+    datetime.datetime: "datetime",
+    datetime.date: "date",
+}
+DECODERS = {
+    "uuid": uuid.UUID,
+    "decimal": decimal.Decimal,
+    "datetime": datetime.datetime.fromisoformat,
+    "date": datetime.date.fromisoformat,
+}
+
+
+class Record:
+    """Base of the read-only row types of a snapshot table, one slot per column"""
+
+    __slots__ = ()
+
+    def as_dict(self) -> dict[str, t.Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.as_dict()!r})"
+
+
+def get_value_kind(python_type: type) -> str | None:
+    return VALUE_KINDS.get(python_type)
+
+
+def make_record_type(
+    name: str, columns: t.Sequence[str], kinds: t.Sequence[str | None]
+) -> type[Record]:
+    arguments = ", ".join(columns)
+    body = "".join(
+        f"\n    self.{column} = {column}"
+        if kind is None
+        else f"\n    self.{column} = None if {column} is None else {kind}({column})"
+        for column, kind in zip(columns, kinds)
+    )
+    namespace = dict(DECODERS)
+    exec(f"def __init__(self, {arguments}):{body or ' pass'}", namespace)
+    return type(
+        name,
+        (Record,),
+        {"__slots__": tuple(columns), "__init__": namespace["__init__"]},
+    )
+
+
+@dataclass(slots=True, frozen=True)
+class SnapshotTable:
+    """Rows to write, ordered by preference: the first row of a name is kept"""
+
+    columns: tuple[str, ...]
+    # VALUE_KINDS of the columns, None for the types json keeps
+    kinds: tuple[str | None, ...]
+    rows: list[tuple]
+    # normalized name of every row, None when the table has no name index
+    names: list[str] | None = None
+
+
+def pack_offsets(blobs: t.Iterable[bytes]) -> tuple[bytes, bytes]:
+    # copied as they come, orjson hands out bytes with kilobytes to spare
+    offsets = [0]
+    data = bytearray()
+    for blob in blobs:
+        data += blob
+        offsets.append(len(data))
+    return struct.pack(f"={len(offsets)}I", *offsets), bytes(data)
+
+
+def build_table(table: SnapshotTable) -> dict[str, bytes]:
+    id_column = table.columns.index("id")
+    row_offsets, row_blob = pack_offsets(
+        orjson.dumps(row, default=str) for row in table.rows
+    )
+    ids = sorted(
+        (uuid.UUID(str(row[id_column])).bytes, index)
+        for index, row in enumerate(table.rows)
+    )
+    sections = dict(
+        row_offsets=row_offsets,
+        rows=row_blob,
+        # the halves of every id as numbers, in the same order, for bisect to
+        # search in C
+        id_highs=struct.pack(
+            f"={len(ids)}Q", *(int.from_bytes(key[:8], "big") for key, _ in ids)
+        ),
+        id_lows=struct.pack(
+            f"={len(ids)}Q", *(int.from_bytes(key[8:], "big") for key, _ in ids)
+        ),
+        id_rows=struct.pack(f"={len(ids)}I", *(index for _, index in ids)),
+    )
+    if table.names is not None:
+        first = {}
+        for index, name in enumerate(table.names):
+            first.setdefault(name.encode(), index)
+        names = sorted(first.items())
+        name_offsets, name_blob = pack_offsets([name for name, _ in names])
+        sections.update(
+            name_offsets=name_offsets,
+            names=name_blob,
+            name_rows=struct.pack(f"={len(names)}I", *(index for _, index in names)),
+        )
+    return sections
+
+
+def write_snapshot(path: str, version: int, tables: dict[str, SnapshotTable]) -> int:
+    """
+    Write `tables` to `path` in one file readers can map. The file is written
+    under a temporary name and renamed, a reader sees the old or the new
+    snapshot, never a part of one. Returns the size written.
+    """
+    directory = {}
+    body = bytearray()
+    for tablename, table in tables.items():
+        entry = dict(
+            columns=list(table.columns),
+            kinds=list(table.kinds),
+            length=len(table.rows),
+        )
+        for section, data in build_table(table).items():
+            body += b"\0" * (-len(body) % ALIGNMENT)
+            entry[section] = (len(body), len(data))
+            body += data
+        directory[tablename] = entry
+    directory = orjson.dumps(directory)
+    # sections are relative to the first aligned byte after the directory
+    start = HEADER.size + len(directory)
+    padding = b"\0" * (-start % ALIGNMENT)
+    partial_path = f"{path}.{os.getpid()}.part"
+    with open(partial_path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, version, len(directory)))
+        file.write(directory)
+        file.write(padding)
+        file.write(body)
+    os.replace(partial_path, path)
+    return start + len(padding) + len(body)
+
+
+@dataclass(slots=True, frozen=True)
+class MappedTable:
+    """One table of a mapped snapshot, rows are decoded when looked up"""
+
+    record_type: type[Record]
+    length: int
+    row_offsets: memoryview
+    rows: memoryview
+    id_highs: memoryview
+    id_lows: memoryview
+    id_rows: memoryview
+    name_offsets: memoryview | None
+    names: memoryview | None
+    name_rows: memoryview | None
+
+    def __len__(self) -> int:
+        return self.length
+
+    def row(self, index: int) -> Record:
+        values = orjson.loads(
+            self.rows[self.row_offsets[index]:self.row_offsets[index + 1]]
+        )
+        return self.record_type(*values)
+
+    def find(self, object_id: t.Any) -> int | None:
+        """Index of the row with id `object_id`, a binary search of the sorted ids"""
+        if isinstance(object_id, uuid.UUID):
+            key = object_id.bytes
+        else:
+            try:
+                key = uuid.UUID(str(object_id)).bytes
+            except ValueError:
+                return None
+        high, low = int.from_bytes(key[:8], "big"), int.from_bytes(key[8:], "big")
+        start = bisect.bisect_left(self.id_highs, high)
+        # ids created in the same millisecond can share the high half
+        end = bisect.bisect_right(self.id_highs, high, start)
+        index = bisect.bisect_left(self.id_lows, low, start, end)
+        if index < end and self.id_lows[index] == low:
+            return self.id_rows[index]
+        return None
+
+    def find_name(self, name: str) -> int | None:
+        if self.name_rows is None:
+            return None
+        key = name.encode()
+        low, high = 0, len(self.name_rows)
+        while low < high:
+            middle = (low + high) // 2
+            found = self.names[
+                self.name_offsets[middle]:self.name_offsets[middle + 1]
+            ].tobytes()
+            if found == key:
+                return self.name_rows[middle]
+            if found < key:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def get(self, object_id: t.Any) -> Record | None:
+        index = self.find(object_id)
+        return None if index is None else self.row(index)
+
+    def get_by_name(self, name: str) -> Record | None:
+        index = self.find_name(name)
+        return None if index is None else self.row(index)
+
+
+@dataclass(slots=True, frozen=True)
+class MappedSnapshot:
+    """
+    A snapshot file mapped read only. The pages are shared by every process
+    mapping the same file, a process only holds the rows it decoded.
+    """
+
+    path: str
+    inode: int
+    version: int
+    tables: dict[str, MappedTable]
+    size: int
+
+    @classmethod
+    def open(cls, path: str) -> "MappedSnapshot":
+        with open(path, "rb") as file:
+            inode = os.fstat(file.fileno()).st_ino
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(buffer)
+        magic, version, directory_length = HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a snapshot")
+        directory_end = HEADER.size + directory_length
+        directory = orjson.loads(view[HEADER.size:directory_end])
+        start = directory_end + (-directory_end % ALIGNMENT)
+
+        def section(entry: dict, name: str, format: str = None) -> memoryview | None:
+            if name not in entry:
+                return None
+            offset, length = entry[name]
+            data = view[start + offset:start + offset + length]
+            return data.cast(format) if format else data
+
+        tables = {
+            tablename: MappedTable(
+                record_type=make_record_type(
+                    f"{tablename.title().replace('_', '')}Record",
+                    entry["columns"],
+                    entry["kinds"],
+                ),
+                length=entry["length"],
+                row_offsets=section(entry, "row_offsets", "I"),
+                rows=section(entry, "rows"),
+                id_highs=section(entry, "id_highs", "Q"),
+                id_lows=section(entry, "id_lows", "Q"),
+                id_rows=section(entry, "id_rows", "I"),
+                name_offsets=section(entry, "name_offsets", "I"),
+                names=section(entry, "names"),
+                name_rows=section(entry, "name_rows", "I"),
+            )
+            for tablename, entry in directory.items()
+        }
+        return cls(
+            path=path, inode=inode, version=version, tables=tables, size=len(buffer)
+        )
@@ -0,0 +1,216 @@
+import typing as t
+import zlib
+from dataclasses import dataclass, field
+
+from esmerald.protocols.middleware import MiddlewareProtocol
+from lilya.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+
+
+@dataclass(slots=True)
+class GzipCompressor:
+    level: int
+    _compressor: t.Any = field(init=False)
+
+    def __post_init__(self) -> None:
+        # wbits above 16 write the gzip header and trailer
+        self._compressor = zlib.compressobj(
+            self.level, zlib.DEFLATED, zlib.MAX_WBITS | 16
+        )
+
+    def compress(self, data: bytes) -> bytes:
+        # a sync flush hands out all of the chunk, the client is not kept waiting
+        return self._compressor.compress(data) + self._compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+@dataclass(slots=True)
+class BrotliCompressor:
+    quality: int
+    _compressor: t.Any = field(init=False)
+
+    def __post_init__(self) -> None:
+        self._compressor = brotli.Compressor(quality=self.quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.process(data) + self._compressor.finish()
+
+
+def get_header(headers: t.Iterable[tuple[bytes, bytes]], name: bytes) -> bytes | None:
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+
+def choose_encoding(accept_encoding: str, encodings: t.Sequence[str]) -> str | None:
+    """The first of `encodings` the client accepts"""
+    accepted = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0
+        accepted[name.strip().lower()] = quality
+    for encoding in encodings:
+        if accepted.get(encoding, accepted.get("*", 0)) > 0:
+            return encoding
+    return None
+
+
+class CompressionMiddleware(MiddlewareProtocol):
+    """
+    Compress responses with brotli, when installed, or gzip.
+
+    Only bodies of `compressible_types` and at least `minimum_size` bytes are
+    compressed; xlsx and images are compressed already. A response sent in
+    several body messages, like a StreamingResponse, is compressed chunk by
+    chunk as it goes, never buffered.
+
+    Routes opt out through `excluded_paths`, path prefixes, or by setting
+    their own Content-Encoding, e.g. `identity`.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 500,
+        gzip_level: int = 4,
+        brotli_quality: int = 4,
+        compressible_types: t.Sequence[str] = COMPRESSIBLE_TYPES,
+        excluded_paths: t.Sequence[str] = (),
+        **kwargs,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.compressible_types = tuple(compressible_types)
+        self.excluded_paths = tuple(excluded_paths)
+        self.encodings = ("br", "gzip") if brotli is not None else ("gzip",)
+
+    def get_compressor(self, encoding: str) -> GzipCompressor | BrotliCompressor:
+        if encoding == "br":
+            return BrotliCompressor(self.brotli_quality)
+        return GzipCompressor(self.gzip_level)
+
+    def is_compressible(self, message: Message) -> bool:
+        headers = message.get("headers", ())
+        if get_header(headers, b"content-encoding") is not None:
+            return False
+        content_length = get_header(headers, b"content-length")
+        if content_length is not None and int(content_length) < self.minimum_size:
+            return False
+        content_type = get_header(headers, b"content-type")
+        if content_type is None:
+            return False
+        content_type = content_type.split(b";")[0].strip().lower().decode("latin-1")
+        return content_type.startswith(self.compressible_types)
+
+    def get_headers(
+        self, message: Message, encoding: str, content_length: int | None
+    ) -> list[tuple[bytes, bytes]]:
+        headers = []
+        vary = b"Accept-Encoding"
+        for name, value in message.get("headers", ()):
+            name = name.lower()
+            if name == b"content-length":
+                continue
+            if name == b"vary":
+                vary = b"%s, %s" % (value, vary)
+                continue
+            # the compressed body is another representation, its tag is weak
+            if name == b"etag" and not value.startswith(b"W/"):
+                value = b"W/" + value
+            headers.append((name, value))
+        headers.append((b"content-encoding", encoding.encode()))
+        headers.append((b"vary", vary))
+        if content_length is not None:
+            headers.append((b"content-length", str(content_length).encode()))
+        return headers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(self.excluded_paths):
+            await self.app(scope, receive, send)
+            return
+        accept_encoding = get_header(scope["headers"], b"accept-encoding")
+        encoding = choose_encoding(
+            (accept_encoding or b"").decode("latin-1"), self.encodings
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        start: Message | None = None
+        compressor: GzipCompressor | BrotliCompressor | None = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, compressor, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                if self.is_compressible(message):
+                    start = message
+                    return
+                passthrough = True
+                await send(message)
+                return
+            if message["type"] != "http.response.body":
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+                compressor = self.get_compressor(encoding)
+                if not more_body:
+                    body = compressor.finish(body)
+                    start["headers"] = self.get_headers(start, encoding, len(body))
+                    await send(start)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                # streamed, the compressed length is not known up front
+                start["headers"] = self.get_headers(start, encoding, None)
+                await send(start)
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": compressor.compress(body)
+                    if more_body
+                    else compressor.finish(body),
+                    "more_body": more_body,
+                }
+            )
+
+        await self.app(scope, receive, send_compressed)
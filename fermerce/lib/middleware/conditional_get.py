@@ -0,0 +1,70 @@
+from esmerald import status
+from esmerald.protocols.middleware import MiddlewareProtocol
+from lilya.types import ASGIApp, Message, Receive, Scope, Send
+
+from fermerce.core.services.conditional import (
+    ConditionalRequest,
+    NotModified,
+    parse_if_none_match,
+    request_conditional,
+)
+
+
+class ConditionalGetMiddleware(MiddlewareProtocol):
+    """
+    Give GET requests an ETag. Services tag the response with check_modified
+    from a version token, before querying or serializing anything; when
+    If-None-Match holds that tag the request ends there with a 304.
+
+    `salt` goes into every tag, change it when the shape of responses changes.
+    """
+
+    def __init__(self, app: ASGIApp, salt: str = "", **kwargs) -> None:
+        self.app = app
+        self.salt = salt
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+        if_none_match = None
+        for name, value in scope["headers"]:
+            if name == b"if-none-match":
+                if_none_match = value.decode("latin-1")
+                break
+        conditional = ConditionalRequest(
+            variant=b"%s:%s?%s"
+            % (self.salt.encode(), scope["path"].encode(), scope["query_string"]),
+            if_none_match=parse_if_none_match(if_none_match),
+        )
+
+        async def send_tagged(message: Message) -> None:
+            if (
+                message["type"] == "http.response.start"
+                and message["status"] == status.HTTP_200_OK
+                and conditional.etag is not None
+            ):
+                message["headers"] = [
+                    *(
+                        (name, value)
+                        for name, value in message.get("headers", ())
+                        if name.lower() != b"etag"
+                    ),
+                    (b"etag", conditional.etag.encode()),
+                ]
+            await send(message)
+
+        token = request_conditional.set(conditional)
+        try:
+            await self.app(scope, receive, send_tagged)
+        except NotModified as e:
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": status.HTTP_304_NOT_MODIFIED,
+                    "headers": [(b"etag", e.etag.encode())],
+                }
+            )
+            await send({"type": "http.response.body", "body": b""})
+        finally:
+            request_conditional.reset(token)
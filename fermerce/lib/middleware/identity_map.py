@@ -0,0 +1,30 @@
+from lilya.types import ASGIApp, Receive, Scope, Send
+from esmerald.protocols.middleware import MiddlewareProtocol
+
+from fermerce.core.services.loader import DataLoader, request_loader
+from fermerce.core.services.routing import primary_scope
+
+
+class IdentityMapMiddleware(MiddlewareProtocol):
+    """
+    Give every http request its own DataLoader, reachable as
+    `request.state.loader`, and its own primary pin: once it wrote, only its
+    own later reads go to the primary.
+    """
+
+    def __init__(self, app: ASGIApp, **kwargs) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        loader = DataLoader()
+        scope.setdefault("state", {})["loader"] = loader
+        token = request_loader.set(loader)
+        try:
+            with primary_scope():
+                await self.app(scope, receive, send)
+        finally:
+            request_loader.reset(token)
+            loader.clear()
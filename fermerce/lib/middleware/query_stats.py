@@ -0,0 +1,58 @@
+import logging
+
+from esmerald.protocols.middleware import MiddlewareProtocol
+from lilya.types import ASGIApp, Message, Receive, Scope, Send
+
+from fermerce.core.services.instrumentation import QueryStats, query_stats
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStatsMiddleware(MiddlewareProtocol):
+    """
+    Count the statements of every http request. With `server_timing` the total
+    is sent as a `Server-Timing` header, and a statement shape run more than
+    `repeated_threshold` times is logged as a likely N+1.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        server_timing: bool = False,
+        repeated_threshold: int = 10,
+        **kwargs,
+    ) -> None:
+        self.app = app
+        self.server_timing = server_timing
+        self.repeated_threshold = repeated_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats = QueryStats(parent=query_stats.get())
+        scope.setdefault("state", {})["query_stats"] = stats
+        token = query_stats.set(stats)
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"server-timing", stats.server_timing().encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(
+                scope, receive, send_with_timing if self.server_timing else send
+            )
+        finally:
+            query_stats.reset(token)
+            for shape, count in stats.repeated(self.repeated_threshold):
+                logger.warning(
+                    "possible N+1 in %s %s: statement ran %d times: %s",
+                    scope["method"],
+                    scope["path"],
+                    count,
+                    shape,
+                )
@@ -1,76 +1,112 @@
 import typing as t
-from esmerald import Request, status
-from esmerald.responses import JSONResponse, Response
-from fastapi.concurrency import iterate_in_threadpool
 
+import orjson
+from esmerald import status
+from esmerald.protocols.middleware import MiddlewareProtocol
+from lilya.types import ASGIApp, Message, Receive, Scope, Send
 
-async def transform(s: t.Union[str, bytearray, bytes], status_code: int):
-    import json
+EXCLUDED_PATHS = ("openapi.json",)
+SERVER_ERROR_MESSAGE = "Internal Server Error, please try again"
 
-    response_data = dict(status=status_code, data=None, error=None)
-    if status_code <= status.HTTP_226_IM_USED:
-        try:
-            data: dict = json.loads(s)
-            if isinstance(data, dict) and len(list(data.keys())) == 1:
-                response_data["data"] = data
-                # response_data["data"] = ",".join(list(data.values()))
-            else:
-                response_data["data"] = data
-        except Exception:
-            response_data["data"] = s
-            return response_data
-        finally:
-            return response_data
 
-    if status_code == status.HTTP_422_UNPROCESSABLE_ENTITY:
-        try:
-            data: dict = json.loads(s)
-            response_data["error"] = {
-                k.get("loc")[-1]: k.get("msg") for k in data["detail"]
-            }
-        except Exception:
-            response_data["error"] = s
-        finally:
-            return response_data
+def get_error(body: bytes, status_code: int) -> t.Any:
     if status_code >= status.HTTP_500_INTERNAL_SERVER_ERROR:
-        response_data["error"] = "Internal Server Error, please try again"
-        return response_data
-    if status_code >= status.HTTP_400_BAD_REQUEST:
-        try:
-            data: dict = json.loads(s)
-            if len(list(data.keys())) == 1:
-                response_data["error"] = ",".join(list(data.values()))
-        except Exception:
-            response_data["error"] = s
-        finally:
-            return response_data
-    return response_data
+        return SERVER_ERROR_MESSAGE
+    try:
+        data = orjson.loads(body)
+        if status_code == status.HTTP_422_UNPROCESSABLE_ENTITY:
+            return {item.get("loc")[-1]: item.get("msg") for item in data["detail"]}
+        if isinstance(data, dict) and len(data) == 1:
+            (error,) = data.values()
+            # raised through get_error_response
+            if isinstance(error, dict) and "message" in error:
+                return error["message"]
+            return error
+        return data
+    except Exception:
+        return body.decode(errors="replace")
 
 
-async def response_data_transformer(request: Request, call_next):
-    response: Response = await call_next(request)
-    try:
-        content_type: str = str(
-            response.headers.get("content-type", None)
-        ).lower()
-        exclude_url: str = str(request.url).split("/")[-1].lower()
+def envelope(body: bytes, status_code: int) -> bytes:
+    if status_code < status.HTTP_300_MULTIPLE_CHOICES:
+        # the body is json already, splice it in rather than decode and encode it again
+        return b'{"status":%d,"data":%s,"error":null}' % (status_code, body)
+    return orjson.dumps(
+        dict(status=status_code, data=None, error=get_error(body, status_code))
+    )
+
+
+def is_enveloped(message: Message) -> bool:
+    status_code = message["status"]
+    if status_code < status.HTTP_200_OK or (
+        status.HTTP_300_MULTIPLE_CHOICES <= status_code < status.HTTP_400_BAD_REQUEST
+    ):
+        return False
+    for name, value in message.get("headers", ()):
+        if name.lower() == b"content-type":
+            return value.split(b";")[0].strip().lower() == b"application/json"
+    return False
+
+
+class ResponseEnvelopeMiddleware(MiddlewareProtocol):
+    """
+    Wrap json responses as `{"status": ..., "data": ..., "error": ...}`.
+
+    A successful body is spliced into the envelope as bytes, never parsed.
+    Errors are parsed to pull out their message. Streamed responses, sent in
+    more than one body message, and any other content type go through as is.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        excluded_paths: t.Sequence[str] = EXCLUDED_PATHS,
+        **kwargs,
+    ) -> None:
+        self.app = app
+        self.excluded_paths = excluded_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         if (
-            content_type.split(";")[0] == "text/html"
-            or exclude_url == "openapi.json"
+            scope["type"] != "http"
+            or scope["method"] == "HEAD"
+            or scope["path"].rsplit("/", 1)[-1].lower() in self.excluded_paths
         ):
-            return response
-        response_body = [chunk async for chunk in response.body_iterator]
-        response.body_iterator = iterate_in_threadpool(iter(response_body))
-        data = await transform(
-            s=response_body[0].decode(),
-            status_code=response.status_code,
-        )
+            await self.app(scope, receive, send)
+            return
+        start: Message | None = None
+        passthrough = False
 
-        return JSONResponse(
-            status_code=response.status_code,
-            content=data,
-            media_type=response.media_type,
-        )
+        async def send_enveloped(message: Message) -> None:
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                if is_enveloped(message):
+                    start = message
+                    return
+                passthrough = True
+                await send(message)
+                return
+            body = message.get("body", b"")
+            if (
+                message["type"] != "http.response.body"
+                or message.get("more_body", False)
+                or not body
+            ):
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+            body = envelope(body, start["status"])
+            start["headers"] = [
+                (name, value)
+                for name, value in start.get("headers", ())
+                if name.lower() != b"content-length"
+            ]
+            start["headers"].append((b"content-length", str(len(body)).encode()))
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
 
-    except Exception:
-        return response
+        await self.app(scope, receive, send_enveloped)
@@ -0,0 +1,26 @@
+from esmerald import BasePermission, Request
+from esmerald.types import APIGateHandler
+from jose import JWTError, jwt
+
+from fermerce.core.settings import config
+
+
+class IsAuthenticated(BasePermission):
+    """
+    Requests carrying an access token signed with the jwt config of the
+    settings, e.g. `Authorization: Bearer <token>`, naming a user.
+    """
+
+    def has_permission(self, request: Request, apiview: APIGateHandler) -> bool:
+        jwt_config = config.jwt_config
+        header = request.headers.get(jwt_config.authorization_header, "")
+        header_type, _, token = header.partition(" ")
+        if header_type not in jwt_config.auth_header_types or not token:
+            return False
+        try:
+            claims = jwt.decode(
+                token, jwt_config.signing_key, algorithms=[jwt_config.algorithm]
+            )
+        except JWTError:
+            return False
+        return bool(claims.get(jwt_config.user_id_claim))
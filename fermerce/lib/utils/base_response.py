@@ -1,3 +1,5 @@
+import datetime
+import uuid
 from enum import Enum
 from typing import Any
 from esmerald import HTTPException, status
@@ -9,6 +11,37 @@ class SortEnum(Enum):
     DESC = "desc"
 
 
+class PaginationEnum(Enum):
+    OFFSET = "offset"
+    CURSOR = "cursor"
+
+
+class ExportFormatEnum(Enum):
+    EXCEL = "excel"
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+class ExportStatusEnum(Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class CountStrategyEnum(Enum):
+    EXACT = "exact"
+    CACHED = "cached"
+    ESTIMATED = "estimated"
+    NONE = "none"
+
+
+class BulkReturnEnum(Enum):
+    IDS = "ids"
+    ROWS = "rows"
+    COUNT = "count"
+
+
 class IHealthCheck(BaseModel):
     name: str
     version: float
@@ -17,6 +50,27 @@ class IHealthCheck(BaseModel):
     redoc_url: str
 
 
+class IDatabaseHealth(BaseModel):
+    worker: int
+    databases: dict[str, dict[str, Any]]
+
+
+class IExportJob(BaseModel):
+    id: uuid.UUID
+    status: ExportStatusEnum
+    export_format: ExportFormatEnum
+    total_rows: int | None = None
+    exported_rows: int = 0
+    size: int | None = None
+    error: str | None = None
+    created_at: datetime.datetime | None = None
+    completed_at: datetime.datetime | None = None
+    expires_at: datetime.datetime | None = None
+
+    class Config:
+        from_attributes = True
+
+
 class IResponseMessage(BaseModel):
     data: Any
     status_code: int = 200
@@ -51,9 +105,10 @@ def get_error_response(
 
 
 class IFilterList(BaseModel):
-    previous: int | None = None
-    next: int | None = None
-    total_count: int = 0
+    previous: int | str | None = None
+    next: int | str | None = None
+    total_count: int | None = 0
+    count_strategy: CountStrategyEnum | None = None
     data: list[Any] = []
 
     class Config:
@@ -0,0 +1,94 @@
+import base64
+import binascii
+import datetime
+import decimal
+import uuid
+from typing import Any
+
+import orjson
+import sqlalchemy
+from esmerald import status
+
+from fermerce.lib.utils.base_response import get_error_response
+
+
+def _default(value: Any) -> Any:
+    # asyncpg returns ids as its own subclass of UUID, orjson only takes UUID itself
+    if isinstance(value, (decimal.Decimal, uuid.UUID)):
+        return str(value)
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    raise TypeError
+
+
+def encode_cursor(values: list[Any], backward: bool = False) -> str:
+    """Pack the sort key of a row into an opaque, url safe cursor token"""
+    payload = orjson.dumps(
+        {"k": values, "b": backward},
+        default=_default,
+        option=orjson.OPT_PASSTHROUGH_SUBCLASS,
+    )
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[list[Any], bool]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = orjson.loads(base64.urlsafe_b64decode(padded.encode()))
+        return list(payload["k"]), bool(payload.get("b", False))
+    except (binascii.Error, orjson.JSONDecodeError, KeyError, TypeError, ValueError):
+        raise get_error_response(
+            detail="invalid pagination cursor",
+            status_code=status.HTTP_400_BAD_REQUEST,
+        )
+
+
+def coerce_cursor_value(value: Any, python_type: type) -> Any:
+    """Convert a json decoded cursor value back to the column python type"""
+    if value is None or isinstance(value, python_type):
+        return value
+    if python_type is datetime.datetime:
+        return datetime.datetime.fromisoformat(value)
+    if python_type is datetime.date:
+        return datetime.date.fromisoformat(value)
+    if python_type is decimal.Decimal:
+        return decimal.Decimal(str(value))
+    if python_type is uuid.UUID:
+        return uuid.UUID(str(value))
+    return python_type(value)
+
+
+def get_keyset_condition(
+    columns: list[sqlalchemy.Column],
+    values: list[Any],
+    greater: bool,
+    nulls_largest: bool,
+) -> sqlalchemy.ColumnElement:
+    """
+    Rows sorting strictly after (`greater`) or before the cursor values. A row
+    comparison would drop rows with a null sort key, so nulls get their own
+    branch, sorting as the largest values when `nulls_largest` e.g. postgres,
+    otherwise as the smallest e.g. sqlite.
+    """
+
+    def beyond(column: sqlalchemy.Column, value: Any) -> sqlalchemy.ColumnElement:
+        if value is None:
+            # past the nulls lie either all the other values or nothing
+            return sqlalchemy.false() if greater == nulls_largest else column.is_not(None)
+        condition = column > value if greater else column < value
+        if column.nullable and greater == nulls_largest:
+            condition = sqlalchemy.or_(condition, column.is_(None))
+        return condition
+
+    def equal(column: sqlalchemy.Column, value: Any) -> sqlalchemy.ColumnElement:
+        return column.is_(None) if value is None else column == value
+
+    return sqlalchemy.or_(
+        *(
+            sqlalchemy.and_(
+                *(equal(column, value) for column, value in zip(columns[:index], values)),
+                beyond(columns[index], values[index]),
+            )
+            for index in range(len(columns))
+        )
+    )
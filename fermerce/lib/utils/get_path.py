@@ -11,3 +11,7 @@ def get_template_dir():
 
 def get_static_file_dir():
     return f"{get_base_dir()}/static"
+
+
+def get_export_dir():
+    return f"{get_base_dir()}/exports"
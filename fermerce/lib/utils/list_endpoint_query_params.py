@@ -3,7 +3,13 @@ from typing import Optional
 from esmerald import Query, Request
 from pydantic import BaseModel
 
-from fermerce.lib.utils.base_response import SortEnum, get_error_response
+from fermerce.lib.utils.base_response import (
+    CountStrategyEnum,
+    ExportFormatEnum,
+    PaginationEnum,
+    SortEnum,
+    get_error_response,
+)
 
 
 class GetSingleParams(BaseModel):
@@ -16,8 +22,14 @@ class QueryTypeWithoutLoadRelated(BaseModel):
     per_page: int = 10
     order_by: str = "-id"
     export_to_excel: bool = False
+    export_format: Optional[ExportFormatEnum] = None
+    export_async: bool = False
     sort_by: SortEnum = SortEnum.DESC
     select: Optional[str] = None
+    pagination: PaginationEnum = PaginationEnum.OFFSET
+    cursor: Optional[str] = None
+    count_strategy: CountStrategyEnum = CountStrategyEnum.EXACT
+    include_total: bool = True
 
 
 class QueryType(QueryTypeWithoutLoadRelated):
@@ -65,6 +77,53 @@ def query_params(
         title="select specific data from database",
         description="Select specific data from this entity, e.g id, name, email. Default to None(meaning select all), it must be a string separated by comma, like `name, id, created_at, updated_at` if the data does not exist in the entitle table it will be returned",
     ),
+    pagination: PaginationEnum = Query(
+        default=PaginationEnum.OFFSET,
+        title="Pagination mode",
+        description=(
+            f"Paginate by page number or by cursor, defaults to {PaginationEnum.OFFSET}. "
+            "Cursor pagination costs the same for every page and ignores `page`"
+        ),
+    ),
+    cursor: Optional[str] = Query(
+        default=None,
+        title="Pagination cursor",
+        description="Opaque cursor taken from the `next` or `previous` value of a cursor paginated result",
+    ),
+    export_to_excel: bool = Query(
+        default=False,
+        title="Export to excel",
+        description=(
+            "Download every row matching the filter as an excel file instead of a "
+            "page of results, defaults to `False`"
+        ),
+    ),
+    export_format: Optional[ExportFormatEnum] = Query(
+        default=None,
+        title="Export format",
+        description="Stream every row matching the filter as `excel`, `csv` or `ndjson` instead of a page of results",
+    ),
+    export_async: bool = Query(
+        default=False,
+        title="Export in the background",
+        description=(
+            "Return an export job to poll instead of waiting for the file, then "
+            "download it from `/exports/{job_id}/download`, defaults to `False`"
+        ),
+    ),
+    count_strategy: CountStrategyEnum = Query(
+        default=CountStrategyEnum.EXACT,
+        title="Total count strategy",
+        description=(
+            "How `total_count` is computed: an exact filtered count, a short lived "
+            f"cached count, a planner estimate or none, defaults to {CountStrategyEnum.EXACT}"
+        ),
+    ),
+    include_total: bool = Query(
+        default=True,
+        title="Include total count",
+        description="Skip counting the total result when `False`, defaults to `True`",
+    ),
 ) -> QueryType:
     return QueryType(
         page=page,
@@ -74,7 +133,14 @@ def query_params(
         load_related=load_related,
         load_extra=load_extra,
         select=select,
-        filter_str=filter_string,
+        filter_string=filter_string,
+        pagination=pagination,
+        cursor=cursor,
+        count_strategy=count_strategy,
+        include_total=include_total,
+        export_to_excel=export_to_excel,
+        export_format=export_format,
+        export_async=export_async,
     )
 
 
@@ -109,6 +175,53 @@ def query_params_without_load_related(
         title="select specific data from database",
         description="Select specific data from this entity, e.g id, name, email. Default to None(meaning select all), it must be a string separated by comma, like `name, id, created_at, updated_at` if the data does not exist in the entitle table it will be returned",
     ),
+    pagination: PaginationEnum = Query(
+        default=PaginationEnum.OFFSET,
+        title="Pagination mode",
+        description=(
+            f"Paginate by page number or by cursor, defaults to {PaginationEnum.OFFSET}. "
+            "Cursor pagination costs the same for every page and ignores `page`"
+        ),
+    ),
+    cursor: Optional[str] = Query(
+        default=None,
+        title="Pagination cursor",
+        description="Opaque cursor taken from the `next` or `previous` value of a cursor paginated result",
+    ),
+    export_to_excel: bool = Query(
+        default=False,
+        title="Export to excel",
+        description=(
+            "Download every row matching the filter as an excel file instead of a "
+            "page of results, defaults to `False`"
+        ),
+    ),
+    export_format: Optional[ExportFormatEnum] = Query(
+        default=None,
+        title="Export format",
+        description="Stream every row matching the filter as `excel`, `csv` or `ndjson` instead of a page of results",
+    ),
+    export_async: bool = Query(
+        default=False,
+        title="Export in the background",
+        description=(
+            "Return an export job to poll instead of waiting for the file, then "
+            "download it from `/exports/{job_id}/download`, defaults to `False`"
+        ),
+    ),
+    count_strategy: CountStrategyEnum = Query(
+        default=CountStrategyEnum.EXACT,
+        title="Total count strategy",
+        description=(
+            "How `total_count` is computed: an exact filtered count, a short lived "
+            f"cached count, a planner estimate or none, defaults to {CountStrategyEnum.EXACT}"
+        ),
+    ),
+    include_total: bool = Query(
+        default=True,
+        title="Include total count",
+        description="Skip counting the total result when `False`, defaults to `True`",
+    ),
 ):
     return QueryTypeWithoutLoadRelated(
         page=page,
@@ -116,7 +229,14 @@ def query_params_without_load_related(
         order_by=order_by,
         sort_by=sort_by,
         select=select,
-        filter_str=filter_str,
+        filter_string=filter_str,
+        pagination=pagination,
+        cursor=cursor,
+        count_strategy=count_strategy,
+        include_total=include_total,
+        export_to_excel=export_to_excel,
+        export_format=export_format,
+        export_async=export_async,
     )
 
 
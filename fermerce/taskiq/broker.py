@@ -2,7 +2,8 @@ import os
 import sys
 import time
 
-from taskiq import InMemoryBroker, AsyncBroker
+from taskiq import InMemoryBroker, AsyncBroker, TaskiqScheduler
+from taskiq.schedule_sources import LabelScheduleSource
 from fermerce.taskiq._repository import consumer_list
 from fermerce.taskiq.config import connection
 from fermerce.core.settings import config
@@ -23,6 +24,9 @@ if env and env == "testing":
 
 taskiq_fastapi.init(broker, "main:app")
 
+# runs the tasks labelled with a `schedule`, e.g. expired export cleanup
+scheduler = TaskiqScheduler(broker, sources=[LabelScheduleSource(broker)])
+
 
 def run():
     while True:
@@ -0,0 +1,29 @@
+from fermerce.core.model.export_job import ExportJob
+from fermerce.core.services import export_jobs
+from fermerce.core.services.base import BaseRepository
+from fermerce.lib.utils.base_response import IExportJob
+from fermerce.lib.utils.list_endpoint_query_params import QueryTypeWithoutLoadRelated
+from fermerce.taskiq.broker import broker
+
+
+@broker.task
+async def run_export_job(job_id: str) -> None:
+    async with ExportJob.database:
+        await export_jobs.run_export(job_id)
+
+
+@broker.task(schedule=[{"cron": "*/15 * * * *"}])
+async def cleanup_export_jobs() -> None:
+    async with ExportJob.database:
+        await export_jobs.cleanup_exports()
+
+
+async def submit_export(
+    repository: BaseRepository,
+    params: QueryTypeWithoutLoadRelated,
+    check: dict = None,
+) -> IExportJob:
+    """Export in the task worker, progress is polled from the returned job"""
+    job = await export_jobs.create_export_job(repository, params, check=check)
+    await run_export_job.kiq(str(job.id))
+    return IExportJob.model_validate(job)
@@ -0,0 +1,54 @@
+import typing as t
+
+
+def make_app(
+    body: bytes,
+    content_type: bytes = b"application/json",
+    status: int = 200,
+    chunks: int = 1,
+    headers: t.Sequence[tuple[bytes, bytes]] = (),
+):
+    """An app sending `body` in `chunks` body messages, with a length when in one"""
+    start_headers = [(b"content-type", content_type), *headers]
+    if chunks == 1:
+        start_headers.append((b"content-length", str(len(body)).encode()))
+    size = -(-len(body) // chunks)
+
+    async def app(scope, receive, send):
+        await send(
+            {"type": "http.response.start", "status": status, "headers": start_headers}
+        )
+        for index in range(chunks):
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": body[index * size:(index + 1) * size],
+                    "more_body": index < chunks - 1,
+                }
+            )
+
+    return app
+
+
+async def call(
+    app, path: str = "/api/v1/items", headers: t.Sequence[tuple[bytes, bytes]] = ()
+) -> tuple[int, dict[bytes, bytes], list[bytes]]:
+    """Status, headers and body messages of a GET of `path`"""
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "query_string": b"",
+        "headers": list(headers),
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request"}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    start, *bodies = messages
+    return start["status"], dict(start["headers"]), [body["body"] for body in bodies]
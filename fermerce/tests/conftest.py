@@ -0,0 +1,29 @@
+import pytest
+
+from fermerce.core.services.base import BaseRepository
+from fermerce.tests.models import TEST_DATABASE_URL, Item, Vendor, database, registry
+
+
+@pytest.fixture
+async def db():
+    try:
+        await registry.create_all()
+    except OSError as error:
+        pytest.skip(f"no test database at {TEST_DATABASE_URL}: {error}")
+    try:
+        async with database:
+            yield database
+    finally:
+        await registry.drop_all()
+
+
+@pytest.fixture
+def item_repository() -> BaseRepository[Item]:
+    return BaseRepository[Item](
+        model=Item, model_name="Item", conflict_columns=("name", "vendor")
+    )
+
+
+@pytest.fixture
+def vendor_repository() -> BaseRepository[Vendor]:
+    return BaseRepository[Vendor](model=Vendor, model_name="Vendor")
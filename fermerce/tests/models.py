@@ -0,0 +1,37 @@
+import os
+
+import edgy
+from edgy import Database, Registry
+from uuid_extensions import uuid7str
+
+# a scratch postgres database, the tests create their tables and drop them
+TEST_DATABASE_URL = os.environ.get(
+    "TEST_DATABASE_URL", "postgresql+asyncpg://postgres@localhost:5432/fermerce_test"
+)
+
+database = Database(TEST_DATABASE_URL)
+registry = Registry(database=database)
+
+
+class Vendor(edgy.Model):
+    id = edgy.UUIDField(primary_key=True, default=uuid7str)
+    business_name = edgy.CharField(max_length=50)
+
+    class Meta:
+        registry = registry
+        tablename = "test_vendor"
+
+
+class Item(edgy.Model):
+    id = edgy.UUIDField(primary_key=True, default=uuid7str)
+    name = edgy.CharField(max_length=50, null=True)
+    quantity = edgy.IntegerField(default=0)
+    in_stock = edgy.BooleanField(default=True)
+    created_at = edgy.DateTimeField(auto_now_add=True)
+    updated_at = edgy.DateTimeField(auto_now=True)
+    vendor = edgy.ForeignKey(Vendor, null=True, related_name="items")
+
+    class Meta:
+        registry = registry
+        tablename = "test_item"
+        unique_together = [("name", "vendor")]
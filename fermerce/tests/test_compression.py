@@ -0,0 +1,91 @@
+import gzip
+
+import orjson
+import pytest
+
+from fermerce.lib.middleware import compression
+from fermerce.lib.middleware.compression import CompressionMiddleware, choose_encoding
+from fermerce.tests.asgi import call, make_app
+
+BODY = orjson.dumps({"data": [{"id": index, "name": f"item {index}"} for index in range(200)]})
+CSV = b"".join(b"%d,item %d,12.50\n" % (index, index) for index in range(20_000))
+ENCODINGS = [b"br", b"gzip"] if compression.brotli is not None else [b"gzip"]
+
+
+def decompress(headers: dict, body: bytes) -> bytes:
+    encoding = headers.get(b"content-encoding")
+    if encoding == b"br":
+        return compression.brotli.decompress(body)
+    if encoding == b"gzip":
+        return gzip.decompress(body)
+    return body
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, encoding",
+    [
+        ("gzip, br", "br"),
+        ("gzip", "gzip"),
+        ("br;q=0, gzip;q=0.5", "gzip"),
+        ("*", "br"),
+        ("identity", None),
+        ("", None),
+    ],
+)
+def test_choose_encoding(accept_encoding, encoding):
+    assert choose_encoding(accept_encoding, ("br", "gzip")) == encoding
+
+
+@pytest.mark.parametrize("encoding", ENCODINGS)
+async def test_body_is_compressed(encoding):
+    app = CompressionMiddleware(make_app(BODY, headers=[(b"vary", b"Origin")]))
+
+    _, headers, bodies = await call(app, headers=[(b"accept-encoding", encoding)])
+
+    assert headers[b"content-encoding"] == encoding
+    assert headers[b"content-length"] == str(len(bodies[0])).encode()
+    assert headers[b"vary"] == b"Origin, Accept-Encoding"
+    assert decompress(headers, bodies[0]) == BODY
+
+
+@pytest.mark.parametrize("encoding", ENCODINGS)
+async def test_stream_is_compressed_chunk_by_chunk(encoding):
+    app = CompressionMiddleware(
+        make_app(CSV, content_type=b"text/csv; charset=utf-8", chunks=8)
+    )
+
+    _, headers, bodies = await call(app, headers=[(b"accept-encoding", encoding)])
+
+    assert b"content-length" not in headers
+    assert len(bodies) == 8
+    # every chunk is flushed as it comes, none held back for the next one
+    assert all(bodies[:-1])
+    assert decompress(headers, b"".join(bodies)) == CSV
+
+
+@pytest.mark.parametrize(
+    "app, path",
+    [
+        (make_app(b'{"id": 1}'), "/api/v1/items"),
+        (make_app(BODY, content_type=b"application/vnd.ms-excel"), "/api/v1/items"),
+        (make_app(BODY, headers=[(b"content-encoding", b"identity")]), "/api/v1/items"),
+        (make_app(BODY), "/media/item.json"),
+    ],
+    ids=["small", "not compressible", "opted out", "excluded path"],
+)
+async def test_left_uncompressed(app, path):
+    app = CompressionMiddleware(app, minimum_size=500, excluded_paths=("/media",))
+
+    _, headers, bodies = await call(app, path, headers=[(b"accept-encoding", b"gzip")])
+
+    assert headers.get(b"content-encoding") in (None, b"identity")
+    assert b"".join(bodies) in (b'{"id": 1}', BODY)
+
+
+async def test_gzip_only_without_brotli(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+    app = CompressionMiddleware(make_app(BODY))
+
+    _, headers, _ = await call(app, headers=[(b"accept-encoding", b"br, gzip")])
+
+    assert headers[b"content-encoding"] == b"gzip"
@@ -0,0 +1,118 @@
+import pytest
+
+from fermerce.core.services.conditional import (
+    ConditionalRequest,
+    NotModified,
+    check_modified,
+    parse_if_none_match,
+    request_conditional,
+)
+from fermerce.lib.middleware.compression import CompressionMiddleware
+from fermerce.lib.middleware.conditional_get import ConditionalGetMiddleware
+from fermerce.lib.utils.base_response import CountStrategyEnum
+
+
+async def check_list(repository, if_none_match: str = None, **kwargs) -> tuple:
+    """The tag and the count of a list request, NotModified when it is current"""
+    conditional = ConditionalRequest(
+        variant=b"/items?", if_none_match=parse_if_none_match(if_none_match)
+    )
+    token = request_conditional.set(conditional)
+    try:
+        count = await repository.check_list_modified(**kwargs)
+    finally:
+        request_conditional.reset(token)
+    return conditional.etag, count
+
+
+async def test_version_of_an_unfiltered_list(db, item_repository):
+    for index in range(2):
+        await item_repository.create({"name": f"item {index}"})
+
+    updated_at, count = await item_repository.get_version()
+
+    assert updated_at is not None
+    assert count == 2
+
+
+async def test_list_is_not_modified_until_a_row_changes(db, item_repository):
+    item = await item_repository.create({"name": "item"})
+    etag, count = await check_list(item_repository)
+
+    with pytest.raises(NotModified):
+        await check_list(item_repository, if_none_match=etag)
+    await item_repository.update(item.id, {"quantity": 3})
+    changed, _ = await check_list(item_repository, if_none_match=etag)
+
+    assert count == 1
+    assert etag.startswith('W/"')
+    assert changed != etag
+
+
+async def test_list_without_an_exact_count_is_not_tagged(db, item_repository):
+    await item_repository.create({"name": "item"})
+
+    etag, count = await check_list(
+        item_repository, count_strategy=CountStrategyEnum.ESTIMATED
+    )
+
+    assert etag is None and count is None
+
+
+async def test_version_count_stands_in_for_the_count(db, item_repository):
+    for index in range(3):
+        await item_repository.create({"name": f"item {index}"})
+    _, count = await check_list(item_repository, check={"in_stock": True})
+
+    result = await item_repository.filter_and_list(
+        check={"in_stock": True}, per_page=2, total_count=count
+    )
+
+    assert result.total_count == 3
+    assert len(result.data) == 2
+
+
+async def request(app, *headers: tuple[bytes, bytes]) -> tuple[int, dict]:
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/items",
+        "query_string": b"",
+        "headers": list(headers),
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request"}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    return messages[0]["status"], dict(messages[0]["headers"])
+
+
+async def test_tag_of_a_compressed_list_revalidates():
+    body = b'{"data": [%s]}' % b",".join([b'"row"'] * 500)
+
+    async def app(scope, receive, send):
+        check_modified("items", 1)
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"application/json")],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    app = CompressionMiddleware(ConditionalGetMiddleware(app), minimum_size=100)
+    gzip = (b"accept-encoding", b"gzip")
+
+    status, compressed = await request(app, gzip)
+    _, plain = await request(app)
+    not_modified, headers = await request(app, gzip, (b"if-none-match", plain[b"etag"]))
+
+    assert status == 200 and compressed[b"content-encoding"] == b"gzip"
+    assert compressed[b"etag"] == plain[b"etag"] == headers[b"etag"]
+    assert not_modified == 304
@@ -0,0 +1,34 @@
+import pytest
+import sqlalchemy
+
+from fermerce.lib.utils.base_response import CountStrategyEnum
+from fermerce.tests.models import Item
+
+
+@pytest.fixture
+async def analyzed_items(db, item_repository):
+    if db.url.dialect != "postgresql":
+        pytest.skip("estimates come from the postgres planner")
+    for index in range(5):
+        await item_repository.create({"name": f"item {index}", "in_stock": index % 2 == 0})
+    await db.execute(sqlalchemy.text(f"ANALYZE {Item.meta.tablename}"))
+
+
+async def test_estimated_count_of_the_whole_table(analyzed_items, item_repository):
+    assert await item_repository.estimate_count(Item.query.all()) == 5
+
+
+async def test_estimated_count_of_a_filtered_query(analyzed_items, item_repository):
+    estimate = await item_repository.estimate_count(Item.query.filter(in_stock=True))
+
+    assert isinstance(estimate, int) and 0 < estimate <= 5
+
+
+async def test_never_analyzed_table_falls_back_to_an_exact_count(db, item_repository):
+    if db.url.dialect != "postgresql":
+        pytest.skip("estimates come from the postgres planner")
+    await item_repository.create({"name": "item"})
+
+    assert await item_repository.get_total_count(
+        Item.query.all(), count_strategy=CountStrategyEnum.ESTIMATED
+    ) == (1, CountStrategyEnum.EXACT)
@@ -0,0 +1,68 @@
+import pytest
+
+from fermerce.lib.utils.base_response import PaginationEnum, SortEnum
+from fermerce.lib.utils.cursor import decode_cursor
+
+
+async def walk(repository, direction: str, **params) -> list[list[str]]:
+    """Every page from the first one, following `next`, or from the last one back"""
+    pages, cursor = [], None
+    while True:
+        result = await repository.filter_and_list(
+            pagination=PaginationEnum.CURSOR, cursor=cursor, per_page=3, **params
+        )
+        pages.append([str(row["id"]) for row in result.data])
+        if direction == "previous" and cursor is None:
+            # go to the end first, then come back through `previous`
+            while result.next:
+                result = await repository.filter_and_list(
+                    pagination=PaginationEnum.CURSOR,
+                    cursor=result.next,
+                    per_page=3,
+                    **params,
+                )
+            pages = [[str(row["id"]) for row in result.data]]
+        cursor = getattr(result, direction)
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.parametrize("sort_by", [SortEnum.ASC, SortEnum.DESC])
+async def test_pages_round_trip(db, item_repository, sort_by):
+    items = [await item_repository.create({"name": f"item {index}"}) for index in range(8)]
+    ids = sorted(str(item.id) for item in items)
+    if sort_by == SortEnum.DESC:
+        ids.reverse()
+
+    forward = await walk(item_repository, "next", order_by="id", sort_by=sort_by)
+    backward = await walk(item_repository, "previous", order_by="id", sort_by=sort_by)
+
+    assert [len(page) for page in forward] == [3, 3, 2]
+    assert [row for page in forward for row in page] == ids
+    assert backward == list(reversed(forward))
+
+
+async def test_cursor_of_postgres_uuids_encodes(db, item_repository):
+    for index in range(4):
+        await item_repository.create({"name": f"item {index}"})
+
+    result = await item_repository.filter_and_list(
+        pagination=PaginationEnum.CURSOR, per_page=2, order_by="id"
+    )
+
+    (last_id,) = decode_cursor(result.next)[0]
+    assert last_id == str(result.data[-1]["id"])
+
+
+@pytest.mark.parametrize("sort_by", [SortEnum.ASC, SortEnum.DESC])
+async def test_rows_with_a_null_sort_key_are_paged(db, item_repository, sort_by):
+    names = ["b", None, "a", None, "c", "a", None]
+    for name in names:
+        await item_repository.create({"name": name})
+
+    forward = await walk(item_repository, "next", order_by="name", sort_by=sort_by)
+    backward = await walk(item_repository, "previous", order_by="name", sort_by=sort_by)
+
+    rows = [row for page in forward for row in page]
+    assert len(rows) == len(set(rows)) == len(names)
+    assert backward == list(reversed(forward))
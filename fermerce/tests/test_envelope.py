@@ -0,0 +1,56 @@
+import orjson
+import pytest
+
+from fermerce.lib.middleware.response_formatter import ResponseEnvelopeMiddleware
+from fermerce.tests.asgi import call, make_app
+
+BODY = orjson.dumps({"total_count": 2, "data": [{"id": 1}, {"id": 2}]})
+
+
+async def test_json_body_is_spliced_into_the_envelope():
+    _, headers, bodies = await call(ResponseEnvelopeMiddleware(make_app(BODY)))
+
+    assert orjson.loads(bodies[0]) == {
+        "status": 200,
+        "data": orjson.loads(BODY),
+        "error": None,
+    }
+    assert headers[b"content-length"] == str(len(bodies[0])).encode()
+
+
+@pytest.mark.parametrize(
+    "body, status, error",
+    [
+        (b'{"detail":{"message":"Item does not exist","status_code":404}}', 404, "Item does not exist"),
+        (b'{"detail":"Not Found"}', 404, "Not Found"),
+        (b'{"detail":[{"loc":["body","name"],"msg":"field required"}]}', 422, {"name": "field required"}),
+        (b"boom", 500, "Internal Server Error, please try again"),
+    ],
+)
+async def test_error_message_is_pulled_out(body, status, error):
+    _, _, bodies = await call(ResponseEnvelopeMiddleware(make_app(body, status=status)))
+
+    assert orjson.loads(bodies[0]) == {"status": status, "data": None, "error": error}
+
+
+@pytest.mark.parametrize(
+    "app, path",
+    [
+        (make_app(BODY, chunks=3), "/api/v1/items"),
+        (make_app(b"id,name\n1,item\n", content_type=b"text/csv"), "/api/v1/items"),
+        (make_app(b"PK\x03\x04" + b"x" * 100, content_type=b"application/vnd.ms-excel", chunks=2), "/api/v1/items"),
+        (make_app(b"", status=304), "/api/v1/items"),
+        (make_app(BODY), "/openapi.json"),
+    ],
+    ids=["json stream", "csv", "excel stream", "not modified", "excluded path"],
+)
+async def test_passed_through_as_is(app, path):
+    expected = []
+
+    async def collect(message):
+        expected.append(message)
+
+    await app({"type": "http"}, None, collect)
+    _, _, bodies = await call(ResponseEnvelopeMiddleware(app), path)
+
+    assert bodies == [message["body"] for message in expected[1:]]
@@ -0,0 +1,67 @@
+import asyncio
+
+import orjson
+import pytest
+import sqlalchemy
+
+from fermerce.lib.utils.base_response import ExportFormatEnum
+from fermerce.tests.models import Item
+
+
+async def call(response, send) -> None:
+    scope = {"type": "http", "method": "GET", "path": "/export", "headers": []}
+
+    async def receive():
+        await asyncio.Event().wait()
+
+    await response(scope, receive, send)
+
+
+async def test_ndjson_export_of_every_column(db, item_repository, vendor_repository):
+    vendor = await vendor_repository.create({"business_name": "farm"})
+    items = [
+        await item_repository.create({"name": f"item {index}", "vendor": vendor})
+        for index in range(3)
+    ]
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    await call(
+        item_repository.export_query(Item.query.all(), export_format=ExportFormatEnum.NDJSON),
+        send,
+    )
+
+    body = b"".join(message.get("body", b"") for message in messages[1:])
+    rows = [orjson.loads(line) for line in body.splitlines()]
+    assert sorted(row["id"] for row in rows) == sorted(str(item.id) for item in items)
+    assert {row["vendor"] for row in rows} == {str(vendor.id)}
+
+
+async def test_abandoned_export_releases_its_connection(db, item_repository):
+    if db.url.dialect != "postgresql":
+        pytest.skip("counts open transactions in pg_stat_activity")
+    for index in range(3):
+        await item_repository.create({"name": f"item {index}"})
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            raise OSError("client went away")
+
+    with pytest.raises(ExceptionGroup) as info:
+        await call(
+            item_repository.export_query(
+                Item.query.all(), export_format=ExportFormatEnum.NDJSON
+            ),
+            send,
+        )
+
+    assert info.value.subgroup(OSError) is not None
+    idle = await db.fetch_val(
+        sqlalchemy.text(
+            "SELECT count(*) FROM pg_stat_activity "
+            "WHERE datname = current_database() AND state = 'idle in transaction'"
+        )
+    )
+    assert idle == 0
@@ -0,0 +1,48 @@
+import pytest
+import sqlalchemy
+
+from fermerce.core.services.conditional import ConditionalRequest, request_conditional
+from fermerce.core.services.instrumentation import instrument_database, query_budget
+
+
+@pytest.fixture
+def instrumented(db):
+    instrument_database(db)()
+    return db
+
+
+async def test_conditional_list_runs_two_queries(instrumented, item_repository):
+    for index in range(3):
+        await item_repository.create({"name": f"item {index}"})
+    token = request_conditional.set(ConditionalRequest(variant=b"/items?"))
+    try:
+        with query_budget(2) as stats:
+            total_count = await item_repository.check_list_modified()
+            await item_repository.filter_and_list(total_count=total_count)
+    finally:
+        request_conditional.reset(token)
+
+    assert stats.count == 2
+
+
+async def test_budget_exceeded(instrumented, item_repository):
+    with pytest.raises(AssertionError, match="query budget of 1 exceeded"):
+        with query_budget(1):
+            await item_repository.filter_and_list()
+
+
+async def test_repeated_statements(instrumented, item_repository):
+    item = await item_repository.create({"name": "item"})
+
+    with pytest.raises(AssertionError, match="repeated more than 2 times"):
+        with query_budget(10, max_repeated=2):
+            for _ in range(3):
+                await item_repository.get(id=item.id)
+
+
+async def test_failed_statement_leaves_no_start_behind(instrumented):
+    async with instrumented.connection() as connection:
+        raw = await connection.get_raw_connection()
+        with pytest.raises(Exception):
+            await connection.execute(sqlalchemy.text("SELECT * FROM missing_table"))
+        assert not raw.info.get("query_start")
@@ -0,0 +1,31 @@
+import uuid
+
+from fermerce.core.services.loader import DataLoader
+from fermerce.tests.models import Item
+
+
+async def test_forms_of_one_id_load_one_row(db, item_repository):
+    item = await item_repository.create({"name": "item"})
+    loader = DataLoader()
+    object_id = uuid.UUID(str(item.id))
+
+    loaded = await loader.load_many(
+        Item, [object_id, str(object_id).upper(), object_id.hex]
+    )
+
+    assert [str(instance.id) for instance in loaded] == [str(object_id)] * 3
+    assert loaded[0] is loaded[1] is loaded[2]
+    assert loader.queries == 1
+    loader.forget(Item, object_id.hex)
+    assert loader.get_cached(Item, object_id) is None
+
+
+async def test_malformed_id_does_not_fail_the_batch(db, item_repository):
+    items = [await item_repository.create({"name": f"item {index}"}) for index in range(2)]
+    loader = DataLoader()
+
+    loaded = await loader.load_many(Item, [items[0].id, "not-an-id", items[1].id])
+
+    assert loaded[1] is None
+    assert [str(loaded[0].id), str(loaded[2].id)] == [str(item.id) for item in items]
+    assert loader.queries == 1
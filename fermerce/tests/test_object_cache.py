@@ -0,0 +1,34 @@
+import uuid
+
+
+async def test_get_single_fills_and_reads_the_cache(db, item_repository):
+    item_repository.cache_ttl = 60
+    item = await item_repository.create({"name": "apple"})
+
+    missed = await item_repository.get_single(item.id)
+    hit = await item_repository.get_single(str(item.id).upper())
+
+    assert missed.data["name"] == hit.data["name"] == "apple"
+    assert hit.data["id"] == str(item.id)
+
+
+async def test_cached_rows_are_copies(db, item_repository):
+    item_repository.cache_ttl = 60
+    item = await item_repository.create({"name": "apple"})
+    await item_repository.get_single(item.id)
+
+    first = await item_repository.get_single(item.id)
+    first.data["name"] = "changed"
+    second = await item_repository.get_single(item.id)
+
+    assert second.data["name"] == "apple"
+
+
+async def test_writes_drop_the_cached_row(db, item_repository):
+    item_repository.cache_ttl = 60
+    item = await item_repository.create({"name": "apple"})
+    await item_repository.get_single(item.id)
+
+    await item_repository.update(item.id, {"name": "pear"})
+
+    assert (await item_repository.get_single(uuid.UUID(str(item.id)))).data["name"] == "pear"
@@ -0,0 +1,119 @@
+import datetime
+import decimal
+import uuid
+
+import pytest
+
+from fermerce.lib.cache.snapshot import (
+    MappedSnapshot,
+    SnapshotTable,
+    get_value_kind,
+    write_snapshot,
+)
+
+COLUMNS = ("id", "name", "price", "created_at", "starts_on", "parent")
+KINDS = tuple(
+    get_value_kind(python_type)
+    for python_type in (uuid.UUID, str, decimal.Decimal, datetime.datetime, datetime.date, uuid.UUID)
+)
+CREATED_AT = datetime.datetime(2026, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc)
+
+
+def make_rows(count: int) -> list[tuple]:
+    # ids of one millisecond share their high half, the low half tells them apart
+    return [
+        (
+            uuid.UUID(int=(7 << 64) + index * 7919),
+            f"Unit {index % 5}",
+            decimal.Decimal(f"{index}.50"),
+            CREATED_AT,
+            datetime.date(2026, 1, 1 + index % 28),
+            None if index % 2 else uuid.UUID(int=index),
+        )
+        for index in range(count)
+    ]
+
+
+@pytest.fixture
+def snapshot(tmp_path) -> tuple[MappedSnapshot, list[tuple]]:
+    rows = make_rows(50)
+    path = str(tmp_path / "reference.snapshot")
+    size = write_snapshot(
+        path,
+        version=3,
+        tables=dict(
+            fm_unit=SnapshotTable(
+                columns=COLUMNS,
+                kinds=KINDS,
+                rows=rows,
+                names=[row[1].lower() for row in rows],
+            ),
+            fm_status=SnapshotTable(columns=("id",), kinds=("uuid",), rows=[]),
+        ),
+    )
+    mapped = MappedSnapshot.open(path)
+    assert mapped.size == size
+    return mapped, rows
+
+
+def test_rows_round_trip(snapshot):
+    mapped, rows = snapshot
+    table = mapped.tables["fm_unit"]
+
+    assert mapped.version == 3
+    assert len(table) == len(rows)
+    for row in rows:
+        assert tuple(table.get(row[0]).as_dict().values()) == row
+
+
+def test_find_by_any_form_of_the_id(snapshot):
+    mapped, rows = snapshot
+    table = mapped.tables["fm_unit"]
+    object_id = rows[17][0]
+
+    assert table.find(object_id) == 17
+    assert table.find(str(object_id).upper()) == 17
+    assert table.find(object_id.hex) == 17
+    assert table.find(uuid.UUID(int=object_id.int + 1)) is None
+    assert table.find("not-an-id") is None
+
+
+def test_find_by_name_keeps_the_first_row(snapshot):
+    mapped, _ = snapshot
+    table = mapped.tables["fm_unit"]
+
+    assert table.get_by_name("unit 3").as_dict()["name"] == "Unit 3"
+    assert table.find_name("unit 3") == 3
+    assert table.find_name("unit 9") is None
+    assert mapped.tables["fm_status"].find_name("unit 3") is None
+
+
+def test_empty_table(snapshot):
+    mapped, _ = snapshot
+
+    assert len(mapped.tables["fm_status"]) == 0
+    assert mapped.tables["fm_status"].get(uuid.uuid4()) is None
+
+
+def test_rewrite_is_a_new_file(snapshot):
+    mapped, rows = snapshot
+    write_snapshot(
+        mapped.path,
+        version=4,
+        tables=dict(fm_unit=SnapshotTable(columns=COLUMNS, kinds=KINDS, rows=rows[:1])),
+    )
+
+    reopened = MappedSnapshot.open(mapped.path)
+
+    assert reopened.inode != mapped.inode
+    assert reopened.version == 4
+    # the old mapping still reads the old file
+    assert len(mapped.tables["fm_unit"]) == len(rows)
+
+
+def test_not_a_snapshot(tmp_path):
+    path = tmp_path / "other"
+    path.write_bytes(b"\0" * 64)
+
+    with pytest.raises(ValueError, match="is not a snapshot"):
+        MappedSnapshot.open(str(path))
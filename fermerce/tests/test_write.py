@@ -0,0 +1,61 @@
+import pytest
+from esmerald.exceptions import HTTPException
+
+
+@pytest.fixture
+async def vendor(db, vendor_repository):
+    return await vendor_repository.create({"business_name": "farm"})
+
+
+async def test_upsert_creates_then_updates(item_repository, vendor):
+    created_item, created = await item_repository.upsert(
+        {"name": "item", "vendor": vendor.id, "quantity": 1}
+    )
+    updated_item, updated = await item_repository.upsert(
+        {"name": "item", "vendor": vendor.id, "quantity": 5}
+    )
+
+    assert created and not updated
+    assert str(updated_item.id) == str(created_item.id)
+    assert updated_item.quantity == 5
+
+
+async def test_get_or_create_keeps_the_existing_row(item_repository, vendor):
+    first, created = await item_repository.get_or_create(
+        {"name": "item", "vendor": vendor.id, "quantity": 1}
+    )
+    second, again = await item_repository.get_or_create(
+        {"name": "item", "vendor": vendor.id, "quantity": 5}
+    )
+
+    assert created and not again
+    assert str(second.id) == str(first.id)
+    assert second.quantity == 1
+    with pytest.raises(HTTPException) as info:
+        await item_repository.get_or_create(
+            {"name": "item", "vendor": vendor.id}, raise_error=True
+        )
+    assert info.value.status_code == 409
+
+
+async def test_delete_by_ids_counts_the_deleted_rows(db, item_repository):
+    items = [
+        await item_repository.create({"name": f"item {index}", "in_stock": index != 0})
+        for index in range(3)
+    ]
+
+    deleted = await item_repository.delete_by_ids(
+        [item.id for item in items], check={"in_stock": True}
+    )
+
+    assert deleted == 2
+    assert [str(item.id) for item in await item_repository.get_all()] == [
+        str(items[0].id)
+    ]
+
+
+async def test_bulk_delete_counts_the_deleted_rows(db, item_repository):
+    items = [await item_repository.create({"name": f"item {index}"}) for index in range(3)]
+
+    assert await item_repository.bulk_delete(items[:2]) == 2
+    assert await item_repository.bulk_delete(items[:2]) == 0
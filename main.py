@@ -5,8 +5,28 @@ import os
 import sys
 from pathlib import Path
 from fermerce.core.settings import config
+from fermerce.core.model.descriptor import build_descriptors
+from fermerce.core.services.instrumentation import instrument_database
+from fermerce.core.services.routing import (
+    start_replica_router,
+    stop_replica_router,
+)
+from fermerce.core.services.invalidation import (
+    invalidation_bus,
+    start_invalidation_listener,
+)
+from fermerce.core.services.reference import load_reference_data, reference_data
+from fermerce.app.market.catalog.refresh import (
+    listing_refresher,
+    start_listing_refresher,
+)
+from fermerce.lib.middleware.compression import CompressionMiddleware
+from fermerce.lib.middleware.conditional_get import ConditionalGetMiddleware
+from fermerce.lib.middleware.identity_map import IdentityMapMiddleware
+from fermerce.lib.middleware.query_stats import QueryStatsMiddleware
 from esmerald import Esmerald, Include
 from edgy import Migrate
+from lilya.middleware import DefineMiddleware
 
 
 def build_path():
@@ -24,8 +44,48 @@ def get_application():
 
     app = Esmerald(
         routes=[Include(namespace="fermerce.core.router.v1")],
-        on_startup=[database.connect],
-        on_shutdown=[database.disconnect],
+        middleware=[
+            DefineMiddleware(
+                CompressionMiddleware,
+                minimum_size=config.compression_minimum_size,
+                gzip_level=config.compression_gzip_level,
+                brotli_quality=config.compression_brotli_quality,
+            ),
+            DefineMiddleware(
+                QueryStatsMiddleware,
+                server_timing=config.debug,
+                repeated_threshold=config.query_repeated_threshold,
+            ),
+            DefineMiddleware(IdentityMapMiddleware),
+            DefineMiddleware(ConditionalGetMiddleware, salt=config.version),
+        ],
+        on_startup=[
+            database.connect,
+            start_replica_router(
+                registry,
+                max_lag=config.db_replica_max_lag,
+                check_interval=config.db_replica_check_interval,
+            ),
+            instrument_database(database, *registry.extra.values()),
+            build_descriptors(registry),
+            start_invalidation_listener(database),
+            load_reference_data(
+                interval=config.reference_data_refresh_interval,
+                snapshot_path=config.reference_data_snapshot_path,
+            ),
+            start_listing_refresher(
+                database,
+                interval=config.product_listing_refresh_interval,
+                batch_size=config.product_listing_refresh_batch_size,
+            ),
+        ],
+        on_shutdown=[
+            stop_replica_router(registry),
+            invalidation_bus.stop,
+            reference_data.stop,
+            listing_refresher.stop,
+            database.disconnect,
+        ],
     )
 
     Migrate(app=app, registry=registry)
@@ -0,0 +1,171 @@
+"""baseline
+
+Revision ID: 1e7b0c4d9a53
+Revises:
+Create Date: 2026-10-18 09:00:00.000000
+
+The catalog, status and auth tables as they stood before migrations were
+kept, the later revisions build on them. Databases created before that
+already have them: stamp them at this revision (`alembic stamp 1e7b0c4d9a53`)
+before upgrading.
+Vendors are still created by tortoise, `fm_vendor` follows its columns.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "1e7b0c4d9a53"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def get_base_columns() -> list[sa.Column]:
+    return [
+        sa.Column("id", sa.UUID(), primary_key=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    ]
+
+
+def get_foreign_key(
+    table: str, column: str, target: str, nullable: bool = True
+) -> sa.Column:
+    return sa.Column(
+        column,
+        sa.UUID(),
+        sa.ForeignKey(
+            f"{target}.id",
+            name=f"fk_{table}_{target}_{column}",
+            ondelete="RESTRICT",
+            onupdate="CASCADE",
+        ),
+        nullable=nullable,
+    )
+
+
+def upgrade():
+    op.create_table(
+        "fm_media",
+        sa.Column("url", sa.String(length=300), nullable=False, unique=True),
+        sa.Column("content_type", sa.String(length=30), nullable=False),
+        sa.Column("alt", sa.String(length=50), nullable=False, unique=True),
+        *get_base_columns(),
+    )
+    op.create_table(
+        "fm_productcategory",
+        sa.Column("name", sa.String(length=50), nullable=True),
+        *get_base_columns(),
+    )
+    op.create_table(
+        "fm_measuringunit",
+        sa.Column("unit", sa.String(length=50), nullable=True),
+        *get_base_columns(),
+    )
+    op.create_table(
+        "fm_vendor",
+        sa.Column("id", sa.UUID(), primary_key=True),
+        sa.Column("email", sa.String(length=50), nullable=True),
+        sa.Column("password", sa.String(length=255), nullable=True),
+        sa.Column("business_name", sa.String(length=30), nullable=False),
+        sa.Column(
+            "logo_id",
+            sa.UUID(),
+            sa.ForeignKey("fm_media.id", ondelete="CASCADE"),
+            nullable=True,
+        ),
+        sa.Column("phone_number", sa.String(length=20), nullable=True),
+        sa.Column("rating", sa.Float(), nullable=True),
+        sa.Column("reset_token", sa.String(length=255), nullable=True),
+        sa.Column("is_suspended", sa.Boolean(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("is_verified", sa.Boolean(), nullable=False),
+        sa.Column("is_archived", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("modified_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_table(
+        "fm_product",
+        sa.Column("name", sa.String(length=50), nullable=False),
+        sa.Column("slug", sa.String(length=150), nullable=False),
+        sa.Column("description", sa.Text(), nullable=False),
+        sa.Column("in_stock", sa.Boolean(), nullable=True),
+        sa.Column("is_suspended", sa.Boolean(), nullable=True),
+        sa.Column("sku", sa.String(length=25), nullable=True, unique=True),
+        get_foreign_key("fm_product", "cover_media", "fm_media"),
+        get_foreign_key("fm_product", "vendor", "fm_vendor"),
+        *get_base_columns(),
+    )
+    op.create_table(
+        "fm_product_media_gallery",
+        get_foreign_key("fm_product_media_gallery", "product", "fm_product"),
+        get_foreign_key("fm_product_media_gallery", "media", "fm_media"),
+        *get_base_columns(),
+        sa.UniqueConstraint("product", "media"),
+    )
+    op.create_table(
+        "fm_product_rel_category",
+        get_foreign_key("fm_product_rel_category", "product", "fm_product"),
+        get_foreign_key(
+            "fm_product_rel_category", "productcategory", "fm_productcategory"
+        ),
+        *get_base_columns(),
+        sa.UniqueConstraint("product", "productcategory"),
+    )
+    op.create_table(
+        "fm_productdetail",
+        sa.Column("title", sa.String(length=50), nullable=False),
+        sa.Column("description", sa.Text(), nullable=False),
+        get_foreign_key("fm_productdetail", "product", "fm_product"),
+        *get_base_columns(),
+    )
+    op.create_table(
+        "fm_productsellingunit",
+        get_foreign_key("fm_productsellingunit", "unit", "fm_measuringunit"),
+        sa.Column("size", sa.Integer(), nullable=True),
+        sa.Column("price", sa.Numeric(precision=12, scale=2), nullable=False),
+        get_foreign_key("fm_productsellingunit", "product", "fm_product"),
+        *get_base_columns(),
+    )
+    op.create_table(
+        "fm_status",
+        sa.Column("name", sa.String(length=50), nullable=True),
+        *get_base_columns(),
+    )
+    op.create_table(
+        "fm_auth",
+        sa.Column("refresh_token", sa.String(length=300), nullable=True),
+        sa.Column("access_token", sa.String(length=300), nullable=True),
+        sa.Column("owner_id", sa.UUID(), nullable=True),
+        sa.Column("ip_address", sa.String(length=20), nullable=False),
+        *get_base_columns(),
+    )
+    op.create_index("ix_fm_auth_ip_address", "fm_auth", ["ip_address"], unique=True)
+    # the users table comes with the account models, `user` gets its foreign
+    # key from that revision
+    op.create_table(
+        "fm_review",
+        sa.Column("comment", sa.String(length=500), nullable=True),
+        sa.Column("rating", sa.Float(), nullable=True),
+        sa.Column("reviewed", sa.Boolean(), nullable=True),
+        sa.Column("user", sa.UUID(), nullable=True),
+        get_foreign_key("fm_review", "product", "fm_product"),
+        *get_base_columns(),
+    )
+
+
+def downgrade():
+    op.drop_index("ix_fm_auth_ip_address", table_name="fm_auth")
+    op.drop_table("fm_auth")
+    op.drop_table("fm_status")
+    op.drop_table("fm_review")
+    op.drop_table("fm_productsellingunit")
+    op.drop_table("fm_productdetail")
+    op.drop_table("fm_product_rel_category")
+    op.drop_table("fm_product_media_gallery")
+    op.drop_table("fm_product")
+    op.drop_table("fm_vendor")
+    op.drop_table("fm_measuringunit")
+    op.drop_table("fm_productcategory")
+    op.drop_table("fm_media")
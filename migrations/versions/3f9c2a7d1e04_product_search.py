@@ -0,0 +1,163 @@
+"""product full text search
+
+Revision ID: 3f9c2a7d1e04
+Revises: 1e7b0c4d9a53
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "3f9c2a7d1e04"
+down_revision = "1e7b0c4d9a53"
+branch_labels = None
+depends_on = None
+
+
+# name and sku rank first, then category names and detail titles, then the
+# descriptions. sku is indexed with the simple config so codes are not stemmed.
+REFRESH_FUNCTION = """
+CREATE OR REPLACE FUNCTION fm_product_search_refresh(product_ids uuid[])
+RETURNS void AS $$
+    INSERT INTO fm_product_search (product, document, updated_at)
+    SELECT
+        p.id,
+        setweight(to_tsvector('simple', coalesce(p.sku, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(p.name, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(c.names, '')), 'B')
+        || setweight(to_tsvector('english', coalesce(d.titles, '')), 'B')
+        || setweight(to_tsvector('english', coalesce(p.description, '')), 'C')
+        || setweight(to_tsvector('english', coalesce(d.descriptions, '')), 'D'),
+        now()
+    FROM fm_product p
+    LEFT JOIN LATERAL (
+        SELECT string_agg(pc.name, ' ') AS names
+        FROM fm_product_rel_category r
+        JOIN fm_productcategory pc ON pc.id = r.productcategory
+        WHERE r.product = p.id
+    ) c ON true
+    LEFT JOIN LATERAL (
+        SELECT
+            string_agg(pd.title, ' ') AS titles,
+            string_agg(pd.description, ' ') AS descriptions
+        FROM fm_productdetail pd
+        WHERE pd.product = p.id
+    ) d ON true
+    WHERE p.id = ANY(product_ids)
+    ON CONFLICT (product) DO UPDATE
+    SET document = EXCLUDED.document, updated_at = EXCLUDED.updated_at;
+$$ LANGUAGE sql;
+"""
+
+# TG_ARGV[0] names the column holding the product id of the changed row
+CHANGED_FUNCTION = """
+CREATE OR REPLACE FUNCTION fm_product_search_changed()
+RETURNS trigger AS $$
+DECLARE
+    product_ids uuid[] := '{}';
+BEGIN
+    IF TG_OP <> 'DELETE' THEN
+        product_ids := product_ids || (to_jsonb(NEW) ->> TG_ARGV[0])::uuid;
+    END IF;
+    IF TG_OP <> 'INSERT' THEN
+        product_ids := product_ids || (to_jsonb(OLD) ->> TG_ARGV[0])::uuid;
+    END IF;
+    PERFORM fm_product_search_refresh(product_ids);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+CATEGORY_CHANGED_FUNCTION = """
+CREATE OR REPLACE FUNCTION fm_product_search_category_changed()
+RETURNS trigger AS $$
+BEGIN
+    PERFORM fm_product_search_refresh(
+        ARRAY(SELECT product FROM fm_product_rel_category WHERE productcategory = NEW.id)
+    );
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+TRIGGERS = (
+    (
+        "fm_product_search_product",
+        "fm_product",
+        "AFTER INSERT OR UPDATE OF name, sku, description",
+        "fm_product_search_changed('id')",
+    ),
+    (
+        "fm_product_search_detail",
+        "fm_productdetail",
+        "AFTER INSERT OR UPDATE OR DELETE",
+        "fm_product_search_changed('product')",
+    ),
+    (
+        "fm_product_search_category_link",
+        "fm_product_rel_category",
+        "AFTER INSERT OR UPDATE OR DELETE",
+        "fm_product_search_changed('product')",
+    ),
+    (
+        "fm_product_search_category",
+        "fm_productcategory",
+        "AFTER UPDATE OF name",
+        "fm_product_search_category_changed()",
+    ),
+)
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_table(
+        "fm_product_search",
+        sa.Column(
+            "product",
+            sa.UUID(),
+            sa.ForeignKey("fm_product.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("document", postgresql.TSVECTOR(), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+    op.create_index(
+        "ix_fm_product_search_document",
+        "fm_product_search",
+        ["document"],
+        postgresql_using="gin",
+    )
+    op.create_index(
+        "ix_fm_product_name_trigram",
+        "fm_product",
+        ["name"],
+        postgresql_using="gin",
+        postgresql_ops={"name": "gin_trgm_ops"},
+    )
+    op.execute(REFRESH_FUNCTION)
+    op.execute(CHANGED_FUNCTION)
+    op.execute(CATEGORY_CHANGED_FUNCTION)
+    for name, table, events, function in TRIGGERS:
+        op.execute(
+            f"CREATE TRIGGER {name} {events} ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION {function}"
+        )
+    op.execute("SELECT fm_product_search_refresh(ARRAY(SELECT id FROM fm_product))")
+
+
+def downgrade():
+    for name, table, _, _ in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name} ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS fm_product_search_category_changed()")
+    op.execute("DROP FUNCTION IF EXISTS fm_product_search_changed()")
+    op.execute("DROP FUNCTION IF EXISTS fm_product_search_refresh(uuid[])")
+    op.drop_index("ix_fm_product_name_trigram", table_name="fm_product")
+    op.drop_table("fm_product_search")
@@ -0,0 +1,222 @@
+"""product listing read model
+
+Revision ID: 8a41d6c0b2f7
+Revises: 3f9c2a7d1e04
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "8a41d6c0b2f7"
+down_revision = "3f9c2a7d1e04"
+branch_labels = None
+depends_on = None
+
+
+# TG_ARGV[0] names the column holding the product id of the changed row
+MARK_FUNCTION = """
+CREATE OR REPLACE FUNCTION fm_productlisting_mark()
+RETURNS trigger AS $$
+DECLARE
+    product_ids uuid[] := '{}';
+BEGIN
+    IF TG_OP <> 'DELETE' THEN
+        product_ids := product_ids || (to_jsonb(NEW) ->> TG_ARGV[0])::uuid;
+    END IF;
+    IF TG_OP <> 'INSERT' THEN
+        product_ids := product_ids || (to_jsonb(OLD) ->> TG_ARGV[0])::uuid;
+    END IF;
+    INSERT INTO fm_productlisting_dirty (product)
+    SELECT DISTINCT product_id FROM unnest(product_ids) AS product_id
+    WHERE product_id IS NOT NULL
+    ON CONFLICT DO NOTHING;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+# TG_ARGV[0] names the product column referencing the changed row
+MARK_REFERENCING_FUNCTION = """
+CREATE OR REPLACE FUNCTION fm_productlisting_mark_referencing()
+RETURNS trigger AS $$
+BEGIN
+    EXECUTE format(
+        'INSERT INTO fm_productlisting_dirty (product) '
+        'SELECT id FROM fm_product WHERE %I = $1 ON CONFLICT DO NOTHING',
+        TG_ARGV[0]
+    ) USING NEW.id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+# drains up to batch_size pending products, oldest change first. SKIP LOCKED
+# lets every worker refresh at the same time without waiting on each other.
+REFRESH_FUNCTION = """
+CREATE OR REPLACE FUNCTION fm_productlisting_refresh(batch_size integer)
+RETURNS TABLE (refreshed bigint, oldest timestamptz) AS $$
+    WITH batch AS (
+        DELETE FROM fm_productlisting_dirty
+        WHERE product IN (
+            SELECT product FROM fm_productlisting_dirty
+            ORDER BY dirtied_at
+            LIMIT batch_size
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING product, dirtied_at
+    ),
+    removed AS (
+        DELETE FROM fm_productlisting l
+        USING batch b
+        WHERE l.id = b.product
+        AND NOT EXISTS (SELECT 1 FROM fm_product p WHERE p.id = b.product)
+    ),
+    upserted AS (
+        INSERT INTO fm_productlisting (
+            id, name, slug, sku, in_stock, is_suspended, vendor, vendor_name,
+            cover_url, min_price, max_price, category_ids, rating_average,
+            rating_count, created_at, updated_at
+        )
+        SELECT
+            p.id, p.name, p.slug, p.sku, coalesce(p.in_stock, false),
+            coalesce(p.is_suspended, false), p.vendor,
+            v.business_name, m.url, u.min_price, u.max_price,
+            coalesce(c.category_ids, '[]'), r.rating_average,
+            r.rating_count, coalesce(p.created_at, now()), now()
+        FROM batch b
+        JOIN fm_product p ON p.id = b.product
+        LEFT JOIN fm_vendor v ON v.id = p.vendor
+        LEFT JOIN fm_media m ON m.id = p.cover_media
+        LEFT JOIN LATERAL (
+            SELECT min(price) AS min_price, max(price) AS max_price
+            FROM fm_productsellingunit
+            WHERE product = p.id
+        ) u ON true
+        LEFT JOIN LATERAL (
+            SELECT json_agg(productcategory ORDER BY productcategory) AS category_ids
+            FROM fm_product_rel_category
+            WHERE product = p.id
+        ) c ON true
+        LEFT JOIN LATERAL (
+            SELECT avg(rating) AS rating_average, count(rating) AS rating_count
+            FROM fm_review
+            WHERE product = p.id
+        ) r ON true
+        ON CONFLICT (id) DO UPDATE SET
+            name = EXCLUDED.name,
+            slug = EXCLUDED.slug,
+            sku = EXCLUDED.sku,
+            in_stock = EXCLUDED.in_stock,
+            is_suspended = EXCLUDED.is_suspended,
+            vendor = EXCLUDED.vendor,
+            vendor_name = EXCLUDED.vendor_name,
+            cover_url = EXCLUDED.cover_url,
+            min_price = EXCLUDED.min_price,
+            max_price = EXCLUDED.max_price,
+            category_ids = EXCLUDED.category_ids,
+            rating_average = EXCLUDED.rating_average,
+            rating_count = EXCLUDED.rating_count,
+            updated_at = EXCLUDED.updated_at
+    )
+    SELECT count(*), min(dirtied_at) FROM batch;
+$$ LANGUAGE sql;
+"""
+
+TRIGGERS = (
+    (
+        "fm_productlisting_product",
+        "fm_product",
+        "AFTER INSERT OR UPDATE OR DELETE",
+        "fm_productlisting_mark('id')",
+    ),
+    (
+        "fm_productlisting_unit",
+        "fm_productsellingunit",
+        "AFTER INSERT OR UPDATE OR DELETE",
+        "fm_productlisting_mark('product')",
+    ),
+    (
+        "fm_productlisting_review",
+        "fm_review",
+        "AFTER INSERT OR UPDATE OR DELETE",
+        "fm_productlisting_mark('product')",
+    ),
+    (
+        "fm_productlisting_category",
+        "fm_product_rel_category",
+        "AFTER INSERT OR UPDATE OR DELETE",
+        "fm_productlisting_mark('product')",
+    ),
+    (
+        "fm_productlisting_cover",
+        "fm_media",
+        "AFTER UPDATE OF url",
+        "fm_productlisting_mark_referencing('cover_media')",
+    ),
+    (
+        "fm_productlisting_vendor",
+        "fm_vendor",
+        "AFTER UPDATE OF business_name",
+        "fm_productlisting_mark_referencing('vendor')",
+    ),
+)
+
+
+def upgrade():
+    op.create_table(
+        "fm_productlisting",
+        sa.Column("id", sa.UUID(), primary_key=True),
+        sa.Column("name", sa.String(length=50), nullable=False),
+        sa.Column("slug", sa.String(length=150), nullable=False),
+        sa.Column("sku", sa.String(length=25), nullable=False),
+        sa.Column("in_stock", sa.Boolean(), nullable=False),
+        sa.Column("is_suspended", sa.Boolean(), nullable=False),
+        sa.Column("vendor", sa.UUID(), nullable=True),
+        sa.Column("vendor_name", sa.String(length=30), nullable=True),
+        sa.Column("cover_url", sa.String(length=300), nullable=True),
+        sa.Column("min_price", sa.Numeric(precision=12, scale=2), nullable=True),
+        sa.Column("max_price", sa.Numeric(precision=12, scale=2), nullable=True),
+        sa.Column("category_ids", sa.JSON(), nullable=False),
+        sa.Column("rating_average", sa.Float(), nullable=True),
+        sa.Column("rating_count", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+    op.create_table(
+        "fm_productlisting_dirty",
+        sa.Column("product", sa.UUID(), primary_key=True),
+        sa.Column(
+            "dirtied_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+    op.create_index(
+        "ix_fm_productlisting_dirty_dirtied_at",
+        "fm_productlisting_dirty",
+        ["dirtied_at"],
+    )
+    op.execute(MARK_FUNCTION)
+    op.execute(MARK_REFERENCING_FUNCTION)
+    op.execute(REFRESH_FUNCTION)
+    for name, table, events, function in TRIGGERS:
+        op.execute(
+            f"CREATE TRIGGER {name} {events} ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION {function}"
+        )
+    # the refresher builds every existing product in the background
+    op.execute("INSERT INTO fm_productlisting_dirty (product) SELECT id FROM fm_product")
+
+
+def downgrade():
+    for name, table, _, _ in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name} ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS fm_productlisting_refresh(integer)")
+    op.execute("DROP FUNCTION IF EXISTS fm_productlisting_mark_referencing()")
+    op.execute("DROP FUNCTION IF EXISTS fm_productlisting_mark()")
+    op.drop_table("fm_productlisting_dirty")
+    op.drop_table("fm_productlisting")
@@ -0,0 +1,43 @@
+"""background export jobs
+
+Revision ID: c5e80b3f9a12
+Revises: 8a41d6c0b2f7
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "c5e80b3f9a12"
+down_revision = "8a41d6c0b2f7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "fm_exportjob",
+        sa.Column("id", sa.UUID(), primary_key=True),
+        sa.Column("source_model", sa.String(length=100), nullable=False),
+        sa.Column("title", sa.String(length=100), nullable=False),
+        sa.Column("export_format", sa.String(length=10), nullable=False),
+        sa.Column("filters", sa.JSON(), nullable=False),
+        sa.Column("status", sa.String(length=10), nullable=False),
+        sa.Column("total_rows", sa.Integer(), nullable=True),
+        sa.Column("exported_rows", sa.Integer(), nullable=False),
+        sa.Column("size", sa.BigInteger(), nullable=True),
+        sa.Column("path", sa.String(length=300), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("ix_fm_exportjob_expires_at", "fm_exportjob", ["expires_at"])
+
+
+def downgrade():
+    op.drop_index("ix_fm_exportjob_expires_at", table_name="fm_exportjob")
+    op.drop_table("fm_exportjob")
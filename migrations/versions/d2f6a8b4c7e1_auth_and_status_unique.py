@@ -0,0 +1,35 @@
+"""unique auth sessions per user and address, unique status names
+
+Revision ID: d2f6a8b4c7e1
+Revises: c5e80b3f9a12
+Create Date: 2026-10-18 18:00:00.000000
+
+Statuses sharing a name must be merged before upgrading, the unique
+constraint cannot be created over them.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "d2f6a8b4c7e1"
+down_revision = "c5e80b3f9a12"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # an address was unique on its own, the users behind one NAT replaced
+    # each other's session
+    op.drop_index("ix_fm_auth_ip_address", table_name="fm_auth")
+    op.create_index("ix_fm_auth_ip_address", "fm_auth", ["ip_address"])
+    op.create_unique_constraint(
+        "fm_auth_owner_id_ip_address_key", "fm_auth", ["owner_id", "ip_address"]
+    )
+    op.create_unique_constraint("fm_status_name_key", "fm_status", ["name"])
+
+
+def downgrade():
+    op.drop_constraint("fm_status_name_key", "fm_status", type_="unique")
+    op.drop_constraint("fm_auth_owner_id_ip_address_key", "fm_auth", type_="unique")
+    op.drop_index("ix_fm_auth_ip_address", table_name="fm_auth")
+    op.create_index("ix_fm_auth_ip_address", "fm_auth", ["ip_address"], unique=True)